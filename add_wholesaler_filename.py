@@ -4,7 +4,8 @@
 """
 
 import sys
-import json
+
+from product_store import read_products, write_products, find_data_file
 
 # UTF-8 출력 설정
 if sys.platform == 'win32':
@@ -12,20 +13,25 @@ if sys.platform == 'win32':
     sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
     sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
 
-# 기존 데이터 읽기
-with open('extracted_products.json', 'r', encoding='utf-8') as f:
-    products = json.load(f)
+def add_wholesaler_filename(products, wholesaler, file_name):
+    """제품 목록에 도매인과 파일명 추가 (wholesaler 가 None 이면 시트명을 도매인으로 사용)"""
+    for product in products:
+        product['wholesaler'] = wholesaler if wholesaler else product.get('sheet', '-')
+        product['file_name'] = file_name
+    return products
+
+if __name__ == '__main__':
+    # 기존 데이터 읽기 (.json/.jsonl/.parquet)
+    data_file = sys.argv[1] if len(sys.argv) > 1 else find_data_file()
+    products = read_products(data_file)
 
-# 도매인과 파일명 추가
-for product in products:
-    product['wholesaler'] = 'OH-오즈'
-    product['file_name'] = '20260115-OH-닝보출항.xls'
+    # 도매인과 파일명 추가
+    add_wholesaler_filename(products, 'OH-오즈', '20260115-OH-닝보출항.xls')
 
-# 저장
-with open('extracted_products.json', 'w', encoding='utf-8') as f:
-    json.dump(products, f, ensure_ascii=False, indent=2)
+    # 저장
+    write_products(data_file, products)
 
-print("✅ 도매인과 파일명이 추가되었습니다!")
-print(f"   도매인: OH-오즈")
-print(f"   파일명: 20260115-OH-닝보출항.xls")
-print(f"   총 {len(products)}개 제품")
+    print("✅ 도매인과 파일명이 추가되었습니다!")
+    print(f"   도매인: OH-오즈")
+    print(f"   파일명: 20260115-OH-닝보출항.xls")
+    print(f"   총 {len(products)}개 제품")
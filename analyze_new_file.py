@@ -5,7 +5,8 @@
 """
 
 import sys
-import pandas as pd
+from workbook_loader import open_workbook
+from structure_profiler import profile_sheet, DEFAULT_KEYWORDS
 
 # UTF-8 출력 설정
 if sys.platform == 'win32':
@@ -14,18 +15,20 @@ if sys.platform == 'win32':
     sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
 
 def analyze_new_file(file_path):
-    """새 파일의 모든 시트 구조 분석"""
+    """새 파일의 모든 시트 구조 분석 - 시트별 구조 프로파일 목록 반환"""
     print("=" * 100)
     print("📊 새로운 패킹리스트 파일 분석")
     print("=" * 100)
     print(f"\n파일: {file_path}\n")
 
-    excel_file = pd.ExcelFile(file_path)
+    workbook = open_workbook(file_path)
 
-    print(f"📑 총 시트 개수: {len(excel_file.sheet_names)}\n")
-    print(f"시트 목록: {excel_file.sheet_names}\n")
+    print(f"📑 총 시트 개수: {len(workbook.sheet_names)}\n")
+    print(f"시트 목록: {workbook.sheet_names}\n")
 
-    for idx, sheet_name in enumerate(excel_file.sheet_names):
+    profiles = []
+
+    for idx, sheet_name in enumerate(workbook.sheet_names):
         print("\n" + "=" * 100)
         print(f"🔍 시트 {idx + 1}: {sheet_name}")
         print("=" * 100)
@@ -34,7 +37,7 @@ def analyze_new_file(file_path):
             print("⏩ 첫 번째 시트는 통관용이므로 건너뜁니다.\n")
             continue
 
-        df = pd.read_excel(file_path, sheet_name=sheet_name, header=None)
+        df = workbook.sheet(sheet_name)
 
         print(f"\n📏 시트 크기: {df.shape[0]} 행 x {df.shape[1]} 열\n")
 
@@ -42,23 +45,22 @@ def analyze_new_file(file_path):
         print("🔍 데이터 미리보기 (처음 30행):\n")
         print(df.head(30).to_string())
 
-        # 키워드 찾기
+        # 키워드 찾기 (한 번에 훑기)
         print("\n\n📌 주요 키워드 위치:\n")
-        keywords = ['품명', '칼라', '색상', '사이즈', 'SIZE', '수량', 'QTY', '120', '130', '140', 'FREE', 'L']
-
-        for keyword in keywords:
-            found_positions = []
-            for row_idx in range(min(20, len(df))):
-                for col_idx in range(len(df.columns)):
-                    cell_value = str(df.iloc[row_idx, col_idx])
-                    if keyword in cell_value:
-                        found_positions.append(f"행{row_idx+1},열{col_idx+1}")
+        profile = profile_sheet(df, sheet_name, keywords=DEFAULT_KEYWORDS, scan_rows=20)
+        profiles.append(profile)
 
-            if found_positions:
-                print(f"  '{keyword}': {', '.join(found_positions[:5])}")
+        for keyword, positions in profile['keywords'].items():
+            if positions:
+                found_positions = [f"행{p['row'] + 1},열{p['col'] + 1}" for p in positions[:5]]
+                print(f"  '{keyword}': {', '.join(found_positions)}")
 
         print(f"\n{'=' * 100}\n")
 
+    workbook.print_report()
+    workbook.close()
+    return profiles
+
 if __name__ == '__main__':
     file_path = r'C:\Users\day\Documents\n8n\Upload Generator\list\20260120- 닝보 FCL.xls'
     analyze_new_file(file_path)
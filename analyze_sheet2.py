@@ -4,7 +4,8 @@
 """
 
 import sys
-import pandas as pd
+from workbook_loader import open_workbook
+from layout_detector import get_layout, describe_layout
 
 # UTF-8 출력 설정
 if sys.platform == 'win32':
@@ -15,14 +16,14 @@ if sys.platform == 'win32':
 file_path = r'C:\Users\day\Documents\n8n\Upload Generator\list\20260120- 닝보 FCL.xls'
 
 # 두 번째 시트 읽기
-excel_file = pd.ExcelFile(file_path)
-sheet_name = excel_file.sheet_names[1]  # 두 번째 시트
+workbook = open_workbook(file_path)
+sheet_name = workbook.sheet_names[1]  # 두 번째 시트
 
 print("=" * 100)
 print(f"🔍 두 번째 시트 상세 분석: {sheet_name}")
 print("=" * 100)
 
-df = pd.read_excel(file_path, sheet_name=sheet_name, header=None)
+df = workbook.sheet(sheet_name)
 
 print(f"\n시트 크기: {df.shape[0]} 행 x {df.shape[1]} 열\n")
 
@@ -32,5 +33,13 @@ for idx in range(min(50, len(df))):
     row_data = df.iloc[idx].tolist()
     print(f"행 {idx+1:3d}: {row_data}")
 
+# 자동 감지된 표 형태 (열 위치를 눈으로 찾지 않아도 됨)
+print("\n📐 레이아웃 자동 감지:")
+for line in describe_layout(get_layout(df, file_path, sheet_name)):
+    print(f"  {line}")
+
 print("\n\n" + "=" * 100)
 print("분석 완료")
+
+workbook.print_report()
+workbook.close()
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+여러 패킹리스트 일괄 추출 (병렬)
+
+폴더 또는 glob 패턴으로 지정한 .xls/.xlsx 파일을 작업 프로세스에서
+동시에 추출하고, add_wholesaler_filename 과 같은 방식으로
+도매인(기본값: 시트명)과 파일명을 붙여 하나의 결과로 합친다.
+
+파일마다 별도 프로세스에서 처리하므로 깨진 파일은 오류로 기록되고,
+제한 시간을 넘긴 파일은 프로세스를 종료해서 전체 작업이 멈추지 않는다.
+표가 없는 시트는 디코딩하지 않고 건너뛰며(workbook_loader 시트 가지치기)
+파일별 요약에 건너뛴 시트 수와 예상 절약 시간을 함께 출력한다.
+
+사용법:
+    python batch_extract.py list list/11
+    python batch_extract.py "list/*.xls" --workers 4 --timeout 60 -o extracted_products.json
+    python batch_extract.py list/new -o extracted_products.jsonl --append   # 기존 결과에 이어 쓰기
+"""
+
+import os
+import sys
+import glob
+import time
+import argparse
+import multiprocessing
+import multiprocessing.connection
+
+from add_wholesaler_filename import add_wholesaler_filename
+from workbook_loader import find_excel_files, open_workbook, describe_pruning
+from extraction_cache import ExtractionCache
+from product_store import write_products
+from summary_store import append_with_summary
+
+# UTF-8 출력 설정
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+DEFAULT_TIMEOUT = 120  # 파일당 제한 시간 (초)
+
+def collect_files(targets):
+    """폴더/파일/glob 패턴 목록을 엑셀 파일 경로 목록으로 변환 (중복 제거, 순서 유지)"""
+    files = []
+    for target in targets:
+        if os.path.isdir(target) or os.path.isfile(target):
+            files.extend(find_excel_files([target]))
+        else:
+            files.extend(find_excel_files(sorted(glob.glob(target, recursive=True))))
+
+    seen = set()
+    unique = []
+    for path in files:
+        key = os.path.abspath(path)
+        if key not in seen:
+            seen.add(key)
+            unique.append(path)
+    return unique
+
+def extract_file(file_path, wholesaler=None, cache=None, workbook=None):
+    """파일 하나 추출 + 도매인/파일명 부여"""
+    from extract_real_packing import extract_workbook
+
+    products = extract_workbook(file_path, workbook=workbook, cache=cache)
+    return add_wholesaler_filename(products, wholesaler, os.path.basename(file_path))
+
+def _worker(index, file_path, wholesaler, use_cache, result_conn):
+    """작업 프로세스 진입점 - 결과 또는 오류를 작업 전용 파이프로 전달"""
+    start = time.perf_counter()
+    cache = ExtractionCache() if use_cache else None
+    workbook = open_workbook(file_path, track_memory=False)
+    try:
+        products = extract_file(file_path, wholesaler, cache, workbook)
+        error = None
+    except Exception as e:
+        products = []
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        hits, misses = (cache.hits, cache.misses) if cache is not None else (0, 0)
+        pruning = workbook.pruning_summary()
+        workbook.close()
+        if cache is not None:
+            cache.close()
+    try:
+        result_conn.send((index, products, error, time.perf_counter() - start, hits, misses, pruning))
+    finally:
+        result_conn.close()
+
+def _failed(file_path, error, seconds):
+    return {'file': file_path, 'products': [], 'error': error, 'seconds': seconds,
+            'cache_hits': 0, 'cache_misses': 0, 'pruning': None}
+
+def run_batch(files, workers=None, timeout=DEFAULT_TIMEOUT, wholesaler=None, use_cache=True):
+    """파일 목록을 병렬 추출하고 파일별 결과 목록을 입력 순서대로 반환
+
+    각 결과: {'file', 'products', 'error', 'seconds', 'cache_hits', 'cache_misses', 'pruning'}
+    (pruning: WorkbookReader.pruning_summary(), 작업이 끝나지 못한 파일은 None)
+
+    작업마다 파이프를 따로 두므로 제한 시간을 넘긴 작업을 종료해도
+    (결과를 보내던 중이라도) 다른 작업의 결과는 영향을 받지 않는다.
+    """
+    workers = max(1, workers or os.cpu_count() or 1)
+    ctx = multiprocessing.get_context()
+
+    pending = list(enumerate(files))
+    running = {}  # index -> (process, 수신 연결, 시작 시각)
+    results = {}
+
+    while pending or running:
+        # 빈 슬롯만큼 새 작업 시작
+        while pending and len(running) < workers:
+            index, file_path = pending.pop(0)
+            receiver, sender = ctx.Pipe(duplex=False)
+            process = ctx.Process(target=_worker, args=(index, file_path, wholesaler, use_cache, sender),
+                                  daemon=True)
+            process.start()
+            # 부모 쪽 송신 끝을 닫아 둬야 작업이 결과 없이 끝나면 EOF 로 알 수 있음
+            sender.close()
+            running[index] = (process, receiver, time.perf_counter())
+
+        # 완료된 결과 수집 (결과를 보냈거나 결과 없이 끝난 작업)
+        ready = multiprocessing.connection.wait([receiver for _, receiver, _ in running.values()], timeout=0.1)
+        for index, (process, receiver, started) in list(running.items()):
+            if receiver not in ready:
+                continue
+            try:
+                result = receiver.recv()
+            except EOFError:
+                result = None
+            receiver.close()
+            process.join()
+            running.pop(index)
+            if result is None:
+                results[index] = _failed(files[index], f"작업 프로세스 비정상 종료 (exit {process.exitcode})",
+                                         time.perf_counter() - started)
+            else:
+                _, products, error, seconds, hits, misses, pruning = result
+                results[index] = {'file': files[index], 'products': products, 'error': error,
+                                  'seconds': seconds, 'cache_hits': hits, 'cache_misses': misses,
+                                  'pruning': pruning}
+
+        # 제한 시간 초과 프로세스 정리 - 파이프를 먼저 닫아서 보내던 결과에 막히지 않게 함
+        now = time.perf_counter()
+        for index, (process, receiver, started) in list(running.items()):
+            if now - started > timeout:
+                process.terminate()
+                receiver.close()
+                process.join()
+                running.pop(index)
+                results[index] = _failed(files[index], f"제한 시간 {timeout}초 초과", now - started)
+
+    return [results[i] for i in range(len(files))]
+
+def merge_results(results):
+    """파일별 결과를 하나의 제품 목록으로 합치기 (입력 순서 유지)"""
+    merged = []
+    for result in results:
+        merged.extend(result['products'])
+    return merged
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='패킹리스트 일괄 추출')
+    parser.add_argument('targets', nargs='+', help='폴더, 파일 또는 glob 패턴')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='동시 작업 프로세스 수 (기본: CPU 수)')
+    parser.add_argument('-t', '--timeout', type=float, default=DEFAULT_TIMEOUT, help='파일당 제한 시간(초)')
+    parser.add_argument('--wholesaler', default=None, help='모든 제품에 지정할 도매인 (기본: 시트명)')
+    parser.add_argument('--no-cache', action='store_true', help='추출 캐시 사용 안 함')
+    parser.add_argument('-o', '--output', default='extracted_products.json',
+                        help='결과 파일 (.json/.jsonl/.parquet)')
+    parser.add_argument('--append', action='store_true', help='기존 결과 파일과 요약에 추가 (.jsonl 은 이어 쓰기만 함)')
+    args = parser.parse_args(argv)
+
+    files = collect_files(args.targets)
+    if not files:
+        print("❌ 엑셀 파일을 찾을 수 없습니다.")
+        return 1
+
+    print("=" * 80)
+    print(f"📦 패킹리스트 일괄 추출: {len(files)}개 파일")
+    print("=" * 80)
+
+    start = time.perf_counter()
+    results = run_batch(files, workers=args.workers, timeout=args.timeout, wholesaler=args.wholesaler,
+                        use_cache=not args.no_cache)
+    elapsed = time.perf_counter() - start
+
+    for result in results:
+        name = os.path.basename(result['file'])
+        if result['error']:
+            print(f"  ❌ {name}: {result['error']}")
+        else:
+            print(f"  ✓ {name}: {len(result['products'])}개 제품 ({result['seconds']:.2f}초)")
+            print(f"      {describe_pruning(result['pruning'])}")
+
+    all_products = merge_results(results)
+    if args.append:
+        append_with_summary(args.output, all_products)  # 요약 집계도 추가분만 갱신
+    else:
+        write_products(args.output, all_products)
+
+    failed = sum(1 for r in results if r['error'])
+    print(f"\n총 {len(all_products)}개 제품, 실패 {failed}개 파일, {elapsed:.2f}초")
+    print(f"💾 데이터가 '{args.output}'에 저장되었습니다.")
+
+    if not args.no_cache:
+        hits = sum(r['cache_hits'] for r in results)
+        misses = sum(r['cache_misses'] for r in results)
+        print(f"🗄️  추출 캐시: 적중 {hits}회, 미적중 {misses}회")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
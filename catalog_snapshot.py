@@ -0,0 +1,357 @@
+# -*- coding: utf-8 -*-
+"""
+제품 카탈로그 로컬 스냅샷 (열 단위 .npy, 메모리 맵)
+
+startAutoMapping 은 매번 제품 DB 전체를 내려받는다(/api/products, 1,000행씩).
+여기서는 database.sqlite products 를 열 파일로 한 번 떠 두고
+카탈로그가 바뀌었을 때만 다시 만든다.
+
+.catalog_snapshot/
+    current                : 지금 쓰는 빌드 디렉터리 이름 (os.replace 로 한 번에 교체)
+    build-<시각>-<pid>-<ns>/ : 빌드 하나 (만든 뒤에는 바꾸지 않음)
+        meta.json              : 버전 스탬프, 행 수, 도매인별 행 범위
+        <열>.data.npy          : 문자열 열 UTF-8 바이트 이어 붙임 (uint8)
+        <열>.offsets.npy       : 행 i = data[offsets[i]:offsets[i+1]] (int64)
+        <열>.null.npy          : NULL 여부
+        stock.npy, rowid.npy   : 정수 열
+        clean_codes.npy        : 접두어([...]) 제거 상품코드 정렬 (고정 길이 바이트)
+        clean_rows.npy         : clean_codes 순서의 행 번호
+
+- 행은 (도매인, rowid) 순서: 도매인 안에서는 DB 순서가 그대로다.
+- 버전 스탬프 = settings.catalogVersion(delta_sync.py) + 제품 수 + 최대 rowid
+  -> 스탬프가 같으면 파일을 메모리 맵으로 열기만 한다 (수 ms).
+- 다시 만들 때는 새 빌드 디렉터리에 다 쓴 뒤 current 만 바꾸므로, 이미 열어 둔
+  스냅샷(작업 프로세스 포함)은 그대로 읽히고 동시에 여러 번 다시 만들어도 서로 덮어쓰지 않는다.
+  current 가 아닌 빌드는 BUILD_GRACE 초가 지난 뒤 다음 빌드 때 지운다.
+- MatchingEngine.from_snapshot 은 항목에 나온 도매인 블록만 만들고,
+  MappingMemory 는 정렬된 상품코드 색인을 이분 탐색한다.
+
+사용법:
+    python catalog_snapshot.py [database.sqlite]   # 스냅샷 확인/갱신 후 현황
+    python catalog_snapshot.py bench [SKU 수]      # 전체 읽기+색인 대비 스냅샷 열기+매칭
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import sqlite3
+import tempfile
+import numpy as np
+
+# UTF-8 출력 설정
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+DB_FILE = 'database.sqlite'
+SNAPSHOT_DIR = '.catalog_snapshot'
+
+# 파일 구조가 바뀌면 올려서 기존 스냅샷을 다시 만들게 함
+SNAPSHOT_FORMAT = 2
+
+CURRENT_FILE = 'current'
+BUILD_PREFIX = 'build-'
+BUILD_GRACE = 600  # 교체된 빌드를 지우기 전 대기 시간 (초) - 그 사이 열던 프로세스가 마저 열 수 있게
+
+TEXT_COLUMNS = ['productCode', 'wholesaler', 'productName', 'option', 'barcode']
+FETCH_ROWS = 50000
+
+def catalog_stamp(db_path=DB_FILE):
+    """(카탈로그 버전, 제품 수, 최대 rowid) - 스냅샷을 다시 만들지 판단"""
+    conn = sqlite3.connect(db_path)
+    try:
+        try:
+            row = conn.execute("SELECT value FROM settings WHERE key = 'catalogVersion'").fetchone()
+        except sqlite3.OperationalError:
+            row = None
+        count, max_rowid = conn.execute('SELECT COUNT(*), MAX(rowid) FROM products').fetchone()
+    finally:
+        conn.close()
+    return [int(row[0]) if row else 0, count, max_rowid or 0]
+
+def _clean_code(code):
+    from mapping_memory import normalize_code
+
+    return normalize_code(code)
+
+def current_build(path=SNAPSHOT_DIR):
+    """current 가 가리키는 빌드 디렉터리 - 없으면 None"""
+    try:
+        with open(os.path.join(path, CURRENT_FILE), 'r', encoding='utf-8') as f:
+            name = f.read().strip()
+    except OSError:
+        return None
+    build = os.path.join(path, name)
+    return build if name.startswith(BUILD_PREFIX) and os.path.isdir(build) else None
+
+def _remove_old_builds(path, keep):
+    """current 가 아니고 BUILD_GRACE 초보다 오래된 빌드(중간에 멈춘 빌드 포함) 삭제
+
+    이전 형식(스냅샷 파일을 path 에 바로 둔 경우)의 파일도 함께 지운다.
+    지우지 못한 빌드(다른 프로세스가 메모리 맵으로 연 Windows 파일 등)는 다음 빌드 때 다시 시도.
+    """
+    cutoff = time.time() - BUILD_GRACE
+    for name in os.listdir(path):
+        entry = os.path.join(path, name)
+        if name.startswith(BUILD_PREFIX):
+            try:
+                old = os.path.getmtime(entry) < cutoff
+            except OSError:
+                continue
+            if name != keep and old:
+                shutil.rmtree(entry, ignore_errors=True)
+        elif name == 'meta.json' or name.endswith('.npy'):
+            try:
+                os.remove(entry)
+            except OSError:
+                pass
+
+def build_snapshot(db_path=DB_FILE, path=SNAPSHOT_DIR):
+    """products 전체를 새 빌드 디렉터리에 쓰고 current 를 교체 - 반환: 빌드 디렉터리"""
+    stamp = catalog_stamp(db_path)
+    data = {c: bytearray() for c in TEXT_COLUMNS}
+    offsets = {c: [0] for c in TEXT_COLUMNS}
+    nulls = {c: [] for c in TEXT_COLUMNS}
+    stocks = []
+    rowids = []
+    wholesalers = []  # [도매인, 시작 행, 끝 행]
+
+    conn = sqlite3.connect(db_path)
+    try:
+        cursor = conn.execute(
+            'SELECT rowid, productCode, wholesaler, productName, option, barcode, stock '
+            'FROM products ORDER BY wholesaler, rowid'
+        )
+        n = 0
+        while True:
+            rows = cursor.fetchmany(FETCH_ROWS)
+            if not rows:
+                break
+            for row in rows:
+                rowids.append(row[0])
+                for c, value in zip(TEXT_COLUMNS, row[1:6]):
+                    if value is not None:
+                        data[c] += str(value).encode('utf-8')
+                    offsets[c].append(len(data[c]))
+                    nulls[c].append(value is None)
+                stocks.append(row[6] or 0)
+                if not wholesalers or wholesalers[-1][0] != row[2]:
+                    if wholesalers:
+                        wholesalers[-1][2] = n
+                    wholesalers.append([row[2], n, None])
+                n += 1
+        if wholesalers:
+            wholesalers[-1][2] = n
+    finally:
+        conn.close()
+
+    os.makedirs(path, exist_ok=True)
+    name = f'{BUILD_PREFIX}{time.strftime("%Y%m%d%H%M%S")}-{os.getpid()}-{time.perf_counter_ns()}'
+    tmp = os.path.join(path, name)
+    os.makedirs(tmp)
+    for c in TEXT_COLUMNS:
+        np.save(os.path.join(tmp, f'{c}.data.npy'), np.frombuffer(bytes(data[c]), dtype=np.uint8))
+        np.save(os.path.join(tmp, f'{c}.offsets.npy'), np.asarray(offsets[c], dtype=np.int64))
+        np.save(os.path.join(tmp, f'{c}.null.npy'), np.asarray(nulls[c], dtype=bool))
+    np.save(os.path.join(tmp, 'stock.npy'), np.asarray(stocks, dtype=np.int64))
+    np.save(os.path.join(tmp, 'rowid.npy'), np.asarray(rowids, dtype=np.int64))
+
+    # 접두어 제거 상품코드 정렬 색인 - 같은 코드는 rowid(DB 순서)가 작은 행이 앞
+    code_data, code_offsets = data['productCode'], offsets['productCode']
+    clean = np.array([_clean_code(code_data[code_offsets[i]:code_offsets[i + 1]].decode('utf-8')).encode('utf-8')
+                      for i in range(n)], dtype=bytes)
+    order = np.lexsort((np.asarray(rowids, dtype=np.int64), clean)) if n else np.zeros(0, dtype=np.int64)
+    np.save(os.path.join(tmp, 'clean_codes.npy'), clean[order] if n else np.zeros(0, dtype='S1'))
+    np.save(os.path.join(tmp, 'clean_rows.npy'), order.astype(np.int64))
+
+    meta = {'format': SNAPSHOT_FORMAT, 'db_path': os.path.abspath(db_path), 'stamp': stamp,
+            'count': n, 'wholesalers': wholesalers, 'created': time.strftime('%Y-%m-%d %H:%M:%S')}
+    with open(os.path.join(tmp, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+    pointer = os.path.join(path, f'{CURRENT_FILE}.tmp-{name}')
+    with open(pointer, 'w', encoding='utf-8') as f:
+        f.write(name)
+    os.replace(pointer, os.path.join(path, CURRENT_FILE))
+
+    _remove_old_builds(path, name)
+    return tmp
+
+class CatalogSnapshot:
+    """메모리 맵으로 연 카탈로그 스냅샷 - 행 번호로 제품 dict 조회 (list 처럼 사용)
+
+    path: 스냅샷 디렉터리(current 빌드를 엶) 또는 빌드 디렉터리. self.path 는 연 빌드 디렉터리.
+    """
+
+    def __init__(self, path=SNAPSHOT_DIR):
+        if not os.path.exists(os.path.join(path, 'meta.json')):
+            build = current_build(path)
+            if build is None:
+                raise FileNotFoundError(f"카탈로그 스냅샷이 없습니다: {path}")
+            path = build
+        with open(os.path.join(path, 'meta.json'), 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        self.path = path
+        self.count = self.meta['count']
+        self.stamp = self.meta['stamp']
+        self.wholesaler_ranges = {name: (start, end) for name, start, end in self.meta['wholesalers']}
+
+        def load(name):
+            return np.load(os.path.join(path, name), mmap_mode='r')
+
+        self._data = {c: load(f'{c}.data.npy') for c in TEXT_COLUMNS}
+        self._offsets = {c: load(f'{c}.offsets.npy') for c in TEXT_COLUMNS}
+        self._nulls = {c: load(f'{c}.null.npy') for c in TEXT_COLUMNS}
+        self._stock = load('stock.npy')
+        self._clean_codes = load('clean_codes.npy')
+        self._clean_rows = load('clean_rows.npy')
+        self._products = {}  # 행 번호 -> dict (같은 행은 같은 dict)
+        self._code_rows = {}  # 도매인 -> {상품코드: 행} (find_code 로 처음 찾을 때 만듦)
+
+    def __len__(self):
+        return self.count
+
+    def text(self, column, row):
+        if self._nulls[column][row]:
+            return None
+        offsets = self._offsets[column]
+        return self._data[column][offsets[row]:offsets[row + 1]].tobytes().decode('utf-8')
+
+    def texts(self, column, start, end):
+        """start~end 행의 문자열 열 (한 번에 읽어서 나눔)"""
+        offsets = self._offsets[column][start:end + 1].tolist()
+        if not offsets:
+            return []
+        raw = self._data[column][offsets[0]:offsets[-1]].tobytes()
+        base = offsets[0]
+        nulls = self._nulls[column][start:end].tolist()
+        return [None if nulls[i] else raw[offsets[i] - base:offsets[i + 1] - base].decode('utf-8')
+                for i in range(end - start)]
+
+    def __getitem__(self, row):
+        product = self._products.get(row)
+        if product is None:
+            if not 0 <= row < self.count:
+                raise IndexError(row)
+            product = {c: self.text(c, row) for c in TEXT_COLUMNS}
+            product['stock'] = int(self._stock[row])
+            self._products[row] = product
+        return product
+
+    def __iter__(self):
+        for row in range(self.count):
+            yield self[row]
+
+    def rows_by_wholesaler(self):
+        return {name: range(start, end) for name, (start, end) in self.wholesaler_ranges.items()}
+
+    def find_clean_code(self, clean_code):
+        """접두어 제거 상품코드가 같은 첫 제품 (DB 순서) - 없으면 None"""
+        key = clean_code.encode('utf-8')
+        if self.count == 0 or len(key) > self._clean_codes.dtype.itemsize:
+            return None
+        i = int(np.searchsorted(self._clean_codes, key, side='left'))
+        if i < self.count and self._clean_codes[i] == key:
+            return self[int(self._clean_rows[i])]
+        return None
+
+    def find_code(self, code, wholesaler):
+        """도매인 안에서 상품코드가 같은 제품 - 없으면 None"""
+        rows = self._code_rows.get(wholesaler)
+        if rows is None:
+            start, end = self.wholesaler_ranges.get(wholesaler, (0, 0))
+            rows = self._code_rows[wholesaler] = {}
+            for row, product_code in enumerate(self.texts('productCode', start, end), start):
+                rows.setdefault(product_code, row)
+        row = rows.get(code)
+        return self[row] if row is not None else None
+
+def load_snapshot(db_path=DB_FILE, path=SNAPSHOT_DIR):
+    """스탬프가 같으면 기존 스냅샷을 열고, 다르면 다시 만든 뒤 연다
+
+    반환: (CatalogSnapshot, 'cached' | 'rebuilt')
+    """
+    stamp = catalog_stamp(db_path)
+    build = current_build(path)
+    if build is not None:
+        try:
+            with open(os.path.join(build, 'meta.json'), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if (meta.get('format') == SNAPSHOT_FORMAT and meta.get('stamp') == stamp
+                    and meta.get('db_path') == os.path.abspath(db_path)):
+                return CatalogSnapshot(build), 'cached'
+        except (OSError, ValueError):
+            pass
+    return CatalogSnapshot(build_snapshot(db_path, path)), 'rebuilt'
+
+def benchmark(n_skus=1000000, n_items=2000):
+    """매 실행 제품 전체 읽기 + 엔진 색인 대비 스냅샷 열기 + 도매인 블록만 색인"""
+    from matching_engine import MatchingEngine, load_products, make_synthetic_catalog, make_synthetic_items
+    from product_loader import _empty_db
+
+    products = make_synthetic_catalog(n_skus)
+    items = make_synthetic_items(products, n_items)
+    # 입고 건 하나는 보통 도매인 하나
+    items = [dict(item, wholesaler=products[0]['wholesaler']) for item in items]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'catalog.sqlite')
+        path = os.path.join(tmp, 'snapshot')
+        _empty_db(db_path)
+        conn = sqlite3.connect(db_path)
+        with conn:
+            conn.executemany('INSERT INTO products VALUES (?, ?, ?, ?, ?, ?)',
+                             [tuple(p.values()) for p in products])
+        conn.close()
+
+        start = time.perf_counter()
+        full_products = load_products(db_path)
+        load_seconds = time.perf_counter() - start
+        engine = MatchingEngine(full_products)
+        full_index_seconds = time.perf_counter() - start - load_seconds
+        full = engine.match_all(items)
+        full_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        load_snapshot(db_path, path)
+        build_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        snapshot, mode = load_snapshot(db_path, path)
+        open_seconds = time.perf_counter() - start
+        engine = MatchingEngine.from_snapshot(snapshot)
+        results = engine.match_all(items)
+        snapshot_seconds = time.perf_counter() - start
+
+        def key(r):
+            return (r['product'] or {}).get('productCode'), r['status'], r['similarity']
+
+        same = [key(r) for r in full] == [key(r) for r in results]
+        size_mb = sum(os.path.getsize(os.path.join(snapshot.path, f))
+                      for f in os.listdir(snapshot.path)) / 1024 / 1024
+
+    print("=" * 80)
+    print(f"📈 카탈로그 스냅샷 벤치마크 (제품 {n_skus:,}개, 항목 {n_items:,}개)")
+    print("=" * 80)
+    print(f"  스냅샷 생성 (버전 변경 시 1회) : {build_seconds:7.2f}초, {size_mb:.1f}MB")
+    print(f"  전체 읽기+색인+매칭            : {full_seconds:7.2f}초 "
+          f"(읽기 {load_seconds:.2f}초, 색인 {full_index_seconds:.2f}초)")
+    print(f"  스냅샷 열기 ({mode})           : {open_seconds * 1000:7.1f}ms")
+    print(f"  스냅샷 열기+블록 색인+매칭     : {snapshot_seconds:7.2f}초 "
+          f"(도매인 {len(engine.blocks)}/{len(snapshot.wholesaler_ranges)}개 색인)")
+    print(f"  결과 일치                      : {'✅' if same else '❌'}")
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench':
+        benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 1000000)
+    else:
+        db_path = sys.argv[1] if len(sys.argv) > 1 else DB_FILE
+        start = time.perf_counter()
+        snapshot, mode = load_snapshot(db_path)
+        elapsed = time.perf_counter() - start
+        version, count, _ = snapshot.stamp
+        print(f"📦 카탈로그 스냅샷 ({mode}, {elapsed * 1000:.1f}ms): 버전 {version}, 제품 {count:,}개, "
+              f"도매인 {len(snapshot.wholesaler_ranges)}개")
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+칼라 / 옵션 유사도 메모 (어휘 ID + 행렬)
+
+패킹리스트 칼라(핑크, 진핑크, 실버 ...)와 DB 옵션 문자열('핑크:140' ...)은
+같은 값이 계속 반복된다. 정규화한 칼라와 옵션에 정수 ID 를 붙이고
+(칼라 ID, 옵션 ID) 칸에 아래 값을 한 번만 계산해 저장한다.
+
+- dist    : 편집 거리 (int16, -1 = 아직 계산 안 함)
+            유사도는 (긴 길이 - 거리) / 긴 길이 * 100 으로 매번 같은 값이 나온다
+- precise : 진/연/딥/라이트... 접두어 정밀 일치 판정 (int8, -1 = 미계산)
+
+새 칼라/옵션이 나오면 행렬을 늘려 그 칸만 계산하고, 디스크(.color_memo.npz)에
+저장해서 다음 매핑 실행은 문자열 계산 없이 행렬 조회만 한다.
+
+사용법:
+    python color_memo.py                # 메모 현황
+    python color_memo.py clear          # 메모 삭제
+    python color_memo.py bench [SKU 수]  # 메모 없이 / 첫 실행 / 재실행 매칭 시간
+"""
+
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+
+from similarity import SimilarityScorer
+
+# UTF-8 출력 설정
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+MEMO_FILE = '.color_memo.npz'
+
+# 판정 규칙이 바뀌면 버전을 올려 저장된 메모를 무효화
+MEMO_VERSION = 1
+
+UNKNOWN = -1
+
+def _grow(matrix, rows, cols):
+    """행렬을 최소 rows x cols 로 (용량은 두 배씩 늘려 복사 횟수를 줄임)"""
+    cap_rows, cap_cols = matrix.shape
+    if rows <= cap_rows and cols <= cap_cols:
+        return matrix
+    new_rows = max(rows, cap_rows * 2 if rows > cap_rows else cap_rows, 16)
+    new_cols = max(cols, cap_cols * 2 if cols > cap_cols else cap_cols, 64)
+    grown = np.full((new_rows, new_cols), UNKNOWN, dtype=matrix.dtype)
+    grown[:cap_rows, :cap_cols] = matrix
+    return grown
+
+class ColorMemo:
+    """정규화 칼라 x 정규화 옵션 편집 거리 / 정밀 일치 메모"""
+
+    def __init__(self, path=MEMO_FILE):
+        self.path = path
+        self.colors = []
+        self.options = []
+        self.color_ids = {}
+        self.option_ids = {}
+        self.dist = np.full((0, 0), UNKNOWN, dtype=np.int16)
+        self.precise = np.full((0, 0), UNKNOWN, dtype=np.int8)
+        self.hits = 0
+        self.computed = 0
+        self.dirty = False
+        self._scorers = {}
+
+    @classmethod
+    def load(cls, path=MEMO_FILE):
+        """저장된 메모 로드 (없거나 버전이 다르면 빈 메모)"""
+        memo = cls(path)
+        if not os.path.exists(path):
+            return memo
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if int(data['version']) != MEMO_VERSION:
+                    return memo
+                memo.colors = data['colors'].tolist()
+                memo.options = data['options'].tolist()
+                memo.dist = data['dist'].copy()
+                memo.precise = data['precise'].copy()
+        except (OSError, KeyError, ValueError):
+            return cls(path)
+        memo.color_ids = {c: i for i, c in enumerate(memo.colors)}
+        memo.option_ids = {o: i for i, o in enumerate(memo.options)}
+        return memo
+
+    def save(self):
+        """변경이 있을 때만 저장 (사용 중인 영역만)"""
+        if not self.dirty:
+            return
+        n_colors, n_options = len(self.colors), len(self.options)
+        np.savez_compressed(
+            self.path,
+            version=np.array(MEMO_VERSION),
+            colors=np.array(self.colors, dtype=str),
+            options=np.array(self.options, dtype=str),
+            dist=self.dist[:n_colors, :n_options],
+            precise=self.precise[:n_colors, :n_options],
+        )
+        self.dirty = False
+
+    def color_id(self, color_norm):
+        cid = self.color_ids.get(color_norm)
+        if cid is None:
+            cid = self.color_ids[color_norm] = len(self.colors)
+            self.colors.append(color_norm)
+            self.dist = _grow(self.dist, len(self.colors), len(self.options))
+            self.precise = _grow(self.precise, len(self.colors), len(self.options))
+            self.dirty = True
+        return cid
+
+    def option_id(self, option_norm):
+        oid = self.option_ids.get(option_norm)
+        if oid is None:
+            oid = self.option_ids[option_norm] = len(self.options)
+            self.options.append(option_norm)
+            self.dist = _grow(self.dist, len(self.colors), len(self.options))
+            self.precise = _grow(self.precise, len(self.colors), len(self.options))
+            self.dirty = True
+        return oid
+
+    def _scorer(self, cid):
+        scorer = self._scorers.get(cid)
+        if scorer is None:
+            scorer = self._scorers[cid] = SimilarityScorer(self.colors[cid], memo=False)
+        return scorer
+
+    def distance(self, cid, oid):
+        """편집 거리 (처음이면 계산해서 저장)"""
+        value = self.dist[cid, oid]
+        if value != UNKNOWN:
+            self.hits += 1
+            return int(value)
+        value = self._scorer(cid).distance(self.options[oid])
+        self.dist[cid, oid] = value
+        self.computed += 1
+        self.dirty = True
+        return value
+
+    def similarity(self, cid, oid):
+        """calculate_similarity 와 같은 0-100 점수"""
+        longest = max(len(self.colors[cid]), len(self.options[oid]))
+        if longest == 0:
+            return 100.0
+        return (longest - self.distance(cid, oid)) / longest * 100
+
+    def is_precise(self, cid, oid):
+        """matching_engine.is_precise_color 판정 (처음이면 계산해서 저장)"""
+        value = self.precise[cid, oid]
+        if value != UNKNOWN:
+            self.hits += 1
+            return bool(value)
+        from matching_engine import is_precise_color
+
+        value = is_precise_color(self.colors[cid], self.options[oid])
+        self.precise[cid, oid] = 1 if value else 0
+        self.computed += 1
+        self.dirty = True
+        return value
+
+    def print_report(self):
+        total = self.hits + self.computed
+        rate = (self.hits / total * 100) if total else 0
+        print(f"🎨 칼라 메모: 칼라 {len(self.colors):,}개 x 옵션 {len(self.options):,}개, "
+              f"조회 {self.hits:,}회 / 새로 계산 {self.computed:,}회 (재사용률 {rate:.0f}%)")
+
+def benchmark(n_skus=100000, n_items=5000):
+    """합성 카탈로그로 메모 없이 / 빈 메모(첫 실행) / 저장된 메모(재실행) 매칭 비교"""
+    from matching_engine import MatchingEngine, make_synthetic_catalog, make_synthetic_items
+
+    products = make_synthetic_catalog(n_skus)
+    items = make_synthetic_items(products, n_items)
+    path = os.path.join(tempfile.mkdtemp(), MEMO_FILE)
+
+    def run(memo):
+        engine = MatchingEngine(products, memo)
+        start = time.perf_counter()
+        results = engine.match_all(items)
+        return time.perf_counter() - start, results
+
+    plain_seconds, plain = run(None)
+    cold = ColorMemo(path)
+    cold_seconds, cold_results = run(cold)
+    cold.save()
+    warm = ColorMemo.load(path)
+    warm_seconds, warm_results = run(warm)
+
+    def same(results):
+        return all(a['product'] is b['product'] and a['status'] == b['status'] and a['similarity'] == b['similarity']
+                   for a, b in zip(plain, results))
+
+    print("=" * 80)
+    print(f"📈 칼라 메모 벤치마크 (SKU {n_skus:,}개, 항목 {n_items:,}개)")
+    print("=" * 80)
+    print(f"  메모 없음        : {plain_seconds:7.3f}초")
+    print(f"  메모 첫 실행     : {cold_seconds:7.3f}초  (새로 계산 {cold.computed:,}칸)")
+    print(f"  메모 재실행      : {warm_seconds:7.3f}초  (새로 계산 {warm.computed:,}칸, 조회 {warm.hits:,}회)")
+    print(f"  메모 파일        : {os.path.getsize(path) / 1024:.1f}KB")
+    print(f"  결과 일치        : {'✅' if same(cold_results) and same(warm_results) else '❌'}")
+
+if __name__ == '__main__':
+    command = sys.argv[1] if len(sys.argv) > 1 else ''
+    if command == 'bench':
+        benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 100000)
+    elif command == 'clear':
+        if os.path.exists(MEMO_FILE):
+            os.remove(MEMO_FILE)
+        print("✅ 칼라 메모를 삭제했습니다.")
+    else:
+        memo = ColorMemo.load()
+        n = len(memo.colors) * len(memo.options)
+        filled = int(np.count_nonzero(memo.dist[:len(memo.colors), :len(memo.options)] != UNKNOWN))
+        size = os.path.getsize(MEMO_FILE) / 1024 if os.path.exists(MEMO_FILE) else 0
+        print(f"🎨 {MEMO_FILE}: 칼라 {len(memo.colors):,}개, 옵션 {len(memo.options):,}개, "
+              f"계산된 칸 {filled:,}/{n:,} ({size:.1f}KB)")
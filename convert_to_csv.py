@@ -1,11 +1,31 @@
 # -*- coding: utf-8 -*-
 """
 JSON 데이터를 CSV(엑셀) 형식으로 변환
+
+제품 목록을 한 번에 읽지 않고 한 개씩 읽어 바로 행으로 쓰므로
+파일 크기와 관계없이 메모리 사용량이 일정하다.
+
+- 입력: product_store 형식 (.json 배열, .jsonl 한 줄에 제품 하나, .parquet)
+- 출력: CSV (UTF-8 BOM) 또는 XLSX (openpyxl write-only)
+- 도매인별로 파일을 나눠 저장할 수 있음
+
+사용법:
+    python convert_to_csv.py                                   # extracted_products.* -> .csv
+    python convert_to_csv.py products.jsonl -o out.xlsx --split-wholesaler
+    python convert_to_csv.py --bench 1000000                   # 합성 100만 행 처리량/최대 메모리
 """
 
+import os
+import re
 import sys
 import json
 import csv
+import time
+import argparse
+import tempfile
+import multiprocessing
+
+from product_store import iter_products, find_data_file
 
 # UTF-8 출력 설정
 if sys.platform == 'win32':
@@ -13,54 +33,203 @@ if sys.platform == 'win32':
     sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
     sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
 
-def json_to_csv():
-    """JSON을 CSV로 변환 (엑셀에서 열 수 있는 형식)"""
+HEADER = ['번호', '도매인', '파일명', '시트', '제품명', '칼라', '사이즈', '수량']
 
-    # JSON 파일 읽기
-    with open('extracted_products.json', 'r', encoding='utf-8') as f:
-        products = json.load(f)
+def iter_rows(products):
+    """제품을 (도매인, 파일명, 시트, 제품명, 칼라, 사이즈, 수량) 행으로 펼치기"""
+    for product in products:
+        wholesaler = product.get('wholesaler', '-')
+        file_name = product.get('file_name', product.get('fileName', '-'))
+        sheet = product['sheet']
+        product_name = product['product_name']
+        color = product['color']
 
-    # CSV 파일로 저장
-    output_file = 'extracted_products.csv'
+        # 각 사이즈별로 행 추가
+        for size, quantity in product['quantities'].items():
+            yield [wholesaler, file_name, sheet, product_name, color, size, quantity]
 
-    with open(output_file, 'w', encoding='utf-8-sig', newline='') as f:
-        writer = csv.writer(f)
+class _CsvSink:
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'w', encoding='utf-8-sig', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(HEADER)
+        self.rows = 0
+
+    def write(self, row):
+        self.rows += 1
+        self.writer.writerow([self.rows] + row)
+
+    def close(self):
+        self.file.close()
+
+class _XlsxSink:
+    """openpyxl write-only 워크북 (행을 임시 파일로 바로 흘려보냄)"""
+
+    def __init__(self, path):
+        from openpyxl import Workbook
+
+        self.path = path
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet('products')
+        self.sheet.append(HEADER)
+        self.rows = 0
+
+    def write(self, row):
+        self.rows += 1
+        self.sheet.append([self.rows] + row)
+
+    def close(self):
+        self.workbook.save(self.path)
+
+def _safe_name(text):
+    return re.sub(r'[\\/:*?"<>|\s]+', '_', str(text)).strip('_') or '-'
+
+def split_path(output, wholesaler):
+    """도매인별 출력 파일명: extracted_products.csv -> extracted_products_OH-오즈.csv"""
+    base, ext = os.path.splitext(output)
+    return f"{base}_{_safe_name(wholesaler)}{ext}"
+
+def export_products(source, output, fmt=None, split_by_wholesaler=False):
+    """제품 파일을 CSV/XLSX 로 스트리밍 변환
+
+    fmt: 'csv' 또는 'xlsx' (없으면 출력 확장자로 판단)
+    split_by_wholesaler: 도매인별로 파일을 나눠 저장
+    반환: {출력 파일: 행 수}
+    """
+    fmt = fmt or ('xlsx' if output.lower().endswith('.xlsx') else 'csv')
+    sink_class = _XlsxSink if fmt == 'xlsx' else _CsvSink
 
-        # 헤더 (도매인, 파일명 추가)
-        writer.writerow(['번호', '도매인', '파일명', '시트', '제품명', '칼라', '사이즈', '수량'])
-
-        # 데이터
-        row_num = 1
-        for product in products:
-            wholesaler = product.get('wholesaler', '-')
-            file_name = product.get('fileName', '-')
-            sheet = product['sheet']
-            product_name = product['product_name']
-            color = product['color']
-
-            # 각 사이즈별로 행 추가
-            for size, quantity in product['quantities'].items():
-                writer.writerow([
-                    row_num,
-                    wholesaler,
-                    file_name,
-                    sheet,
-                    product_name,
-                    color,
-                    size,
-                    quantity
-                ])
-                row_num += 1
+    sinks = {}
+    try:
+        for row in iter_rows(iter_products(source)):
+            key = row[0] if split_by_wholesaler else None
+            sink = sinks.get(key)
+            if sink is None:
+                sink = sinks[key] = sink_class(split_path(output, key) if split_by_wholesaler else output)
+            sink.write(row)
+    finally:
+        for sink in sinks.values():
+            sink.close()
+
+    if not sinks and not split_by_wholesaler:
+        sink_class(output).close()  # 제품이 없어도 헤더만 있는 파일 생성
+        return {output: 0}
+    return {sink.path: sink.rows for sink in sinks.values()}
+
+def json_to_csv(source=None, output='extracted_products.csv', split_by_wholesaler=False):
+    """JSON을 CSV로 변환 (엑셀에서 열 수 있는 형식)"""
+
+    written = export_products(source or find_data_file(), output, split_by_wholesaler=split_by_wholesaler)
 
     print("=" * 80)
     print("📊 CSV 변환 완료")
     print("=" * 80)
-    print(f"\n파일: {output_file}")
-    print(f"인코딩: UTF-8 with BOM (엑셀 호환)")
-    print(f"총 행 수: {row_num - 1}개")
+    for path, rows in written.items():
+        print(f"\n파일: {path}")
+        if path.lower().endswith('.csv'):
+            print(f"인코딩: UTF-8 with BOM (엑셀 호환)")
+        print(f"총 행 수: {rows}개")
     print()
     print("✅ 엑셀에서 바로 열 수 있습니다!")
     print()
 
+def write_synthetic_jsonl(path, n_rows, sizes_per_product=4):
+    """합성 제품 데이터 JSONL (사이즈 행 n_rows 개)"""
+    wholesalers = ['OH-오즈', 'OZ-오즈', '롤라루-OH', 'OZ-롤라루']
+    colors = ['핑크', '실버', '블루', '화이트', '옐로우']
+    sizes = ['120', '130', '140', '150', '160', '170', '180', '190', '200', 'FREE']
+
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(0, n_rows, sizes_per_product):
+            count = min(sizes_per_product, n_rows - i)
+            wholesaler = wholesalers[i % len(wholesalers)]
+            product = {
+                'sheet': wholesaler,
+                'product_name': f'제품{i % 5000}',
+                'color': colors[i % len(colors)],
+                'quantities': {sizes[(i + j) % len(sizes)]: (i + j) % 400 + 1 for j in range(count)},
+                'wholesaler': wholesaler,
+                'file_name': f'2026{i % 12 + 1:02d}15-packing.xls',
+            }
+            f.write(json.dumps(product, ensure_ascii=False) + '\n')
+
+def _jsonl_to_json(source, target):
+    """JSONL 을 JSON 배열 파일로 (스트리밍)"""
+    with open(source, 'r', encoding='utf-8') as src, open(target, 'w', encoding='utf-8') as dst:
+        dst.write('[\n')
+        for idx, line in enumerate(src):
+            dst.write((',\n' if idx else '') + line.rstrip('\n'))
+        dst.write('\n]\n')
+
+def _legacy_export(source, output):
+    """기존 방식 (json.load 후 변환) - 벤치마크 비교용"""
+    with open(source, 'r', encoding='utf-8') as f:
+        products = json.load(f)
+    with open(output, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        for idx, row in enumerate(iter_rows(products), 1):
+            writer.writerow([idx] + row)
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+def _bench_child(task, source, output, result_queue):
+    start = time.perf_counter()
+    if task == 'legacy':
+        _legacy_export(source, output)
+    else:
+        export_products(source, output, split_by_wholesaler=(task == 'split'))
+    result_queue.put((time.perf_counter() - start, _peak_rss_mb()))
+
+def benchmark(n_rows=1000000):
+    """합성 데이터로 처리량(행/초)과 최대 메모리(RSS) 측정 - 작업마다 별도 프로세스"""
+    ctx = multiprocessing.get_context()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jsonl = os.path.join(tmp, 'products.jsonl')
+        json_file = os.path.join(tmp, 'products.json')
+        write_synthetic_jsonl(jsonl, n_rows)
+        _jsonl_to_json(jsonl, json_file)
+
+        cases = [
+            ('기존 (json.load) JSON -> CSV', 'legacy', json_file, 'legacy.csv'),
+            ('스트리밍 JSON -> CSV', 'stream', json_file, 'stream_json.csv'),
+            ('스트리밍 JSONL -> CSV', 'stream', jsonl, 'stream_jsonl.csv'),
+            ('스트리밍 JSONL -> CSV (도매인별)', 'split', jsonl, 'split.csv'),
+            ('스트리밍 JSONL -> XLSX', 'stream', jsonl, 'stream.xlsx'),
+        ]
+
+        print("=" * 80)
+        print(f"📈 CSV/XLSX 변환 벤치마크 ({n_rows:,}행, JSON {os.path.getsize(json_file) / 1024 / 1024:.0f}MB)")
+        print("=" * 80)
+
+        for label, task, source, output in cases:
+            result_queue = ctx.Queue()
+            process = ctx.Process(target=_bench_child,
+                                  args=(task, source, os.path.join(tmp, output), result_queue))
+            process.start()
+            seconds, peak = result_queue.get()
+            process.join()
+            peak_str = f"{peak:7.0f}MB" if peak is not None else '      -'
+            print(f"  {label:34} {seconds:7.2f}초  {n_rows / seconds:10,.0f} 행/초  최대 RSS {peak_str}")
+
 if __name__ == '__main__':
-    json_to_csv()
+    parser = argparse.ArgumentParser(description='추출 데이터 CSV/XLSX 변환')
+    parser.add_argument('source', nargs='?', default=None,
+                        help='.json/.jsonl/.parquet 파일 (기본: 가장 최근 extracted_products.*)')
+    parser.add_argument('-o', '--output', default='extracted_products.csv', help='출력 파일 (.csv 또는 .xlsx)')
+    parser.add_argument('--split-wholesaler', action='store_true', help='도매인별로 파일 나누기')
+    parser.add_argument('--bench', type=int, metavar='ROWS', help='합성 데이터 벤치마크 행 수')
+    args = parser.parse_args()
+
+    if args.bench:
+        benchmark(args.bench)
+    else:
+        json_to_csv(args.source, args.output, args.split_wholesaler)
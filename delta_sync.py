@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+"""
+상품 마스터 변경분(delta) 동기화
+
+상품 파일을 다시 올리면 재고만 바뀌었어도 products 전체를 다시 쓴다.
+여기서는 productCode 마다 행 내용 해시(productHashes)를 두고
+새 파일과 비교해서 바뀐 행만 쓴다.
+
+- 추가: 새 파일에만 있는 상품코드
+- 수정: 해시가 다른 상품코드 (재고/옵션/상품명/바코드/도매인)
+- 삭제: 같은 도매인의 기존 상품 중 새 파일에 없는 상품코드
+
+동기화할 때마다 카탈로그 버전(settings.catalogVersion)을 하나 올리고
+변경 내역을 productChanges 에 남긴다. 클라이언트는 changes_since(버전)으로
+그 뒤의 변경분만 받으면 된다. product_loader.py 로 전체 적재하면
+해당 도매인은 'resync' 로 기록되어 전체를 다시 받게 된다.
+
+사용법:
+    python delta_sync.py <상품 파일> <도매인> [database.sqlite]   # 변경분만 반영
+    python delta_sync.py changes <버전> [database.sqlite]          # 버전 이후 변경분 (JSON)
+    python delta_sync.py bench [SKU 수]                            # 전체 적재 대비 쓰기 행 수 / 시간
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import sqlite3
+import tempfile
+
+from product_loader import DB_FILE, LOAD_PRAGMAS, UPSERT_SQL, iter_product_rows
+
+# UTF-8 출력 설정
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+VERSION_KEY = 'catalogVersion'
+PRODUCT_COLUMNS = ['productCode', 'wholesaler', 'productName', 'option', 'barcode', 'stock']
+
+def row_hash(values):
+    """(productCode, wholesaler, productName, option, barcode, stock) -> 내용 해시 (상품코드 제외)"""
+    text = '\x1f'.join('' if v is None else str(v) for v in values[1:])
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+def ensure_tables(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS productHashes (
+            productCode TEXT PRIMARY KEY,
+            wholesaler TEXT,
+            contentHash TEXT
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_productHashes_wholesaler ON productHashes(wholesaler)')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS productChanges (
+            version INTEGER,
+            productCode TEXT,
+            wholesaler TEXT,
+            change TEXT
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_productChanges_version ON productChanges(version)')
+    conn.execute('CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT)')
+
+def catalog_version(conn):
+    row = conn.execute('SELECT value FROM settings WHERE key = ?', (VERSION_KEY,)).fetchone()
+    return int(row[0]) if row else 0
+
+def _bump_version(conn):
+    version = catalog_version(conn) + 1
+    conn.execute('INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)', (VERSION_KEY, str(version)))
+    return version
+
+def ensure_hashes(conn):
+    """해시가 없는 상품 행은 현재 내용으로 해시를 만들고, 없어진 상품의 해시는 지움
+
+    전체 적재(product_loader)로 상품코드가 다른 도매인으로 넘어가면 예전 도매인으로 남은 해시도
+    지우고 새로 만든다 (예전 도매인 동기화에서 삭제 대상으로 보이지 않도록).
+    """
+    conn.execute('BEGIN')
+    try:
+        conn.execute('''
+            DELETE FROM productHashes WHERE NOT EXISTS (
+                SELECT 1 FROM products p
+                WHERE p.productCode = productHashes.productCode AND p.wholesaler IS productHashes.wholesaler
+            )
+        ''')
+        rows = conn.execute('''
+            SELECT p.productCode, p.wholesaler, p.productName, p.option, p.barcode, p.stock
+            FROM products p LEFT JOIN productHashes h ON h.productCode = p.productCode
+            WHERE h.productCode IS NULL
+        ''').fetchall()
+        conn.executemany('INSERT INTO productHashes VALUES (?, ?, ?)',
+                         [(row[0], row[1], row_hash(row)) for row in rows])
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return len(rows)
+
+def record_full_resync(conn, wholesaler):
+    """전체 적재 후 호출 - 도매인 해시를 지우고(다음 동기화 때 다시 계산) 'resync' 변경 기록"""
+    ensure_tables(conn)
+    conn.execute('BEGIN')
+    try:
+        conn.execute('DELETE FROM productHashes WHERE wholesaler = ?', (wholesaler,))
+        version = _bump_version(conn)
+        conn.execute('INSERT INTO productChanges VALUES (?, NULL, ?, ?)', (version, wholesaler, 'resync'))
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return version
+
+def _existing_codes(conn, codes):
+    """다른 도매인 등으로 이미 있는 상품코드 (500개씩 조회)"""
+    found = set()
+    for i in range(0, len(codes), 500):
+        part = codes[i:i + 500]
+        found.update(row[0] for row in conn.execute(
+            f"SELECT productCode FROM productHashes WHERE productCode IN ({', '.join('?' * len(part))})", part
+        ))
+    return found
+
+def sync_products_file(path, wholesaler, db_path=DB_FILE):
+    """상품 파일과 비교해서 추가/수정/삭제된 행만 products 에 반영
+
+    기존 도매인의 (상품코드 -> 해시)만 메모리에 올리고 새 파일을 한 줄씩 비교한다.
+    반환: {'version', 'incoming', 'inserted', 'updated', 'deleted', 'unchanged', 'seconds', 'write_seconds'}
+    """
+    start = time.perf_counter()
+    conn = sqlite3.connect(db_path, isolation_level=None, timeout=30)
+    try:
+        for pragma in LOAD_PRAGMAS:
+            conn.execute(pragma)
+        ensure_tables(conn)
+        ensure_hashes(conn)
+        # 도매인은 해시 쪽이 아니라 products 기준 (다른 도매인으로 넘어간 상품코드는 삭제 대상이 아님)
+        existing = dict(conn.execute('''
+            SELECT p.productCode, h.contentHash
+            FROM products p JOIN productHashes h ON h.productCode = p.productCode
+            WHERE p.wholesaler = ?
+        ''', (wholesaler,)))
+
+        incoming = 0
+        seen = set()
+        changed = {}  # 상품코드 -> (행 값..., 해시) - 같은 상품코드는 마지막 행 (기존 upsert 순서와 동일)
+        for _, values in iter_product_rows(path, wholesaler):
+            incoming += 1
+            code = values[0]
+            content_hash = row_hash(values)
+            seen.add(code)
+            if existing.get(code) != content_hash:
+                changed[code] = values + (content_hash,)
+            else:
+                changed.pop(code, None)
+
+        deleted = [code for code in existing if code not in seen]
+        new_codes = [code for code in changed if code not in existing]
+        moved = _existing_codes(conn, new_codes)
+        inserted = [code for code in new_codes if code not in moved]
+        updated_count = len(changed) - len(inserted)
+
+        write_start = time.perf_counter()
+        if changed or deleted:
+            conn.execute('BEGIN')
+            try:
+                version = _bump_version(conn)
+                insert_set = set(inserted)
+                conn.executemany('INSERT INTO productChanges VALUES (?, ?, ?, ?)',
+                                 [(version, code, row[1], 'insert' if code in insert_set else 'update')
+                                  for code, row in changed.items()])
+                conn.executemany('INSERT INTO productChanges VALUES (?, ?, ?, ?)',
+                                 [(version, code, wholesaler, 'delete') for code in deleted])
+                conn.executemany(UPSERT_SQL, [row[:6] for row in changed.values()])
+                conn.executemany('INSERT OR REPLACE INTO productHashes VALUES (?, ?, ?)',
+                                 [(code, row[1], row[6]) for code, row in changed.items()])
+                conn.executemany('DELETE FROM products WHERE productCode = ?', [(code,) for code in deleted])
+                conn.executemany('DELETE FROM productHashes WHERE productCode = ?', [(code,) for code in deleted])
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        else:
+            version = catalog_version(conn)
+        write_seconds = time.perf_counter() - write_start
+    finally:
+        conn.close()
+
+    return {'version': version, 'incoming': incoming, 'inserted': len(inserted), 'updated': updated_count,
+            'deleted': len(deleted), 'unchanged': len(seen) - len(changed), 'seconds': time.perf_counter() - start,
+            'write_seconds': write_seconds}
+
+def changes_since(conn, since):
+    """since 버전 이후 변경분
+
+    반환: {'version': 현재 버전, 'resync': [전체를 다시 받아야 하는 도매인],
+           'upserts': [바뀐 상품 행], 'deletes': [삭제된 상품코드]}
+    """
+    ensure_tables(conn)
+    latest = {}
+    resync = set()
+    for code, wholesaler, change in conn.execute(
+        'SELECT productCode, wholesaler, change FROM productChanges WHERE version > ? ORDER BY version, rowid',
+        (since,)
+    ):
+        if change == 'resync':
+            resync.add(wholesaler)
+        else:
+            latest[code] = (wholesaler, change)
+
+    upsert_codes = [code for code, (wholesaler, change) in latest.items()
+                    if change != 'delete' and wholesaler not in resync]
+    upserts = []
+    for i in range(0, len(upsert_codes), 500):
+        part = upsert_codes[i:i + 500]
+        rows = conn.execute(
+            f"SELECT {', '.join(PRODUCT_COLUMNS)} FROM products WHERE productCode IN ({', '.join('?' * len(part))})",
+            part
+        ).fetchall()
+        upserts.extend(dict(zip(PRODUCT_COLUMNS, row)) for row in rows)
+
+    return {
+        'version': catalog_version(conn),
+        'resync': sorted(resync),
+        'upserts': upserts,
+        'deletes': [code for code, (_, change) in latest.items() if change == 'delete'],
+    }
+
+def _modified_export(source_rows, path, seed=1):
+    """합성 상품 행에서 재고 1% 변경, 0.1% 삭제, 0.1% 추가한 CSV"""
+    import csv
+    import random
+
+    rng = random.Random(seed)
+    n = len(source_rows)
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['상품코드', '상품명', '옵션', '바코드', '가용재고'])
+        for code, _, name, option, barcode, stock in source_rows:
+            roll = rng.random()
+            if roll < 0.001:
+                continue
+            if roll < 0.011:
+                stock += 1
+            writer.writerow([code, name, option, barcode, stock])
+        for i in range(n // 1000):
+            writer.writerow([f'NEW{i:08d}', f'신상품{i}', '핑크:140', '', 10])
+
+def benchmark(n_skus=1000000):
+    """전체 재적재 대비 변경분 동기화의 쓰기 행 수 / 시간"""
+    from product_loader import write_synthetic_export, load_products_file, _empty_db
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base_csv = os.path.join(tmp, 'base.csv')
+        new_csv = os.path.join(tmp, 'new.csv')
+        write_synthetic_export(base_csv, n_skus)
+        _modified_export([values for _, values in iter_product_rows(base_csv, 'OH')], new_csv)
+
+        full_db = os.path.join(tmp, 'full.sqlite')
+        delta_db = os.path.join(tmp, 'delta.sqlite')
+        for db_path in (full_db, delta_db):
+            _empty_db(db_path)
+        load_products_file(base_csv, 'OH', full_db, tokenize=False)
+        sync_products_file(base_csv, 'OH', delta_db)
+
+        start = time.perf_counter()
+        conn = sqlite3.connect(full_db)
+        conn.execute("DELETE FROM products WHERE wholesaler = 'OH'")
+        conn.commit()
+        conn.close()
+        full = load_products_file(new_csv, 'OH', full_db, tokenize=False)
+        full_seconds = time.perf_counter() - start
+        full_write_seconds = full['load_seconds'] + full['index_seconds']
+
+        delta = sync_products_file(new_csv, 'OH', delta_db)
+        written = delta['inserted'] + delta['updated'] + delta['deleted']
+
+        dump = 'SELECT * FROM products ORDER BY productCode'
+        same = sqlite3.connect(full_db).execute(dump).fetchall() == sqlite3.connect(delta_db).execute(dump).fetchall()
+
+        print("=" * 80)
+        print(f"📈 상품 마스터 동기화 벤치마크 (기존 {n_skus:,}개 -> 새 파일 {delta['incoming']:,}개)")
+        print("=" * 80)
+        print("  (전체 시간에는 두 방식 모두 새 파일 읽기가 들어 있음)")
+        print(f"  전체 재적재   : 전체 {full_seconds:6.2f}초, 파일 읽기+쓰기 {full_write_seconds:6.2f}초  "
+              f"쓰기 {full['loaded'] + n_skus:,}행 (삭제 {n_skus:,} + 적재 {full['loaded']:,})")
+        print(f"  변경분 동기화 : 전체 {delta['seconds']:6.2f}초, 쓰기 트랜잭션 {delta['write_seconds']:6.2f}초  "
+              f"쓰기 {written:,}행 (추가 {delta['inserted']:,}, 수정 {delta['updated']:,}, 삭제 {delta['deleted']:,})")
+        print(f"  결과 일치     : {'✅' if same else '❌'}   카탈로그 버전 {delta['version']}")
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if args and args[0] == 'bench':
+        benchmark(int(args[1]) if len(args) > 1 else 1000000)
+    elif args and args[0] == 'changes':
+        if len(args) < 2:
+            print("사용법: python delta_sync.py changes <버전> [database.sqlite]")
+            sys.exit(1)
+        conn = sqlite3.connect(args[2] if len(args) > 2 else DB_FILE)
+        print(json.dumps(changes_since(conn, int(args[1])), ensure_ascii=False, indent=2))
+        conn.close()
+    elif len(args) >= 2:
+        stats = sync_products_file(args[0], args[1], args[2] if len(args) > 2 else DB_FILE)
+        print(f"✅ {args[0]} ({args[1]}): 추가 {stats['inserted']:,}, 수정 {stats['updated']:,}, "
+              f"삭제 {stats['deleted']:,}, 변경 없음 {stats['unchanged']:,} "
+              f"({stats['seconds']:.2f}초, 카탈로그 버전 {stats['version']})")
+    else:
+        print("사용법: python delta_sync.py <상품 파일> <도매인> [database.sqlite]")
+        print("        python delta_sync.py changes <버전> [database.sqlite]")
+        print("        python delta_sync.py bench [SKU 수]")
+        sys.exit(1)
@@ -4,126 +4,174 @@
 
 이미지 분석 결과:
 - 오른쪽 표 구조: 제품사진 | 품명 | 칼라 | 합계 | 120 | 130 | 140 | ... | L | FREE
-- 열 11: 품명
-- 열 12: 칼라
-- 열 14~27: 사이즈별 수량 (120, 130, 140, 150, 160, 170, 180, 190, 200, 210, 220, L, FREE)
+- 20260115-OH 파일 기준 열 11: 품명, 열 12: 칼라, 열 14~27: 사이즈별 수량
+
+품명/칼라/사이즈 열 위치는 layout_detector 가 시트마다 자동으로 찾는다
+(열이 밀린 파일, 왼쪽 표/왼쪽 그리드 표도 처리).
 """
 
 import sys
 import pandas as pd
 import json
 
+from vectorized_extract import extract_layout
+from layout_detector import get_layout, describe_layout
+from workbook_loader import open_workbook
+from extraction_cache import ExtractionCache, extract_cached
+
 # UTF-8 출력 설정 (Windows 호환)
 if sys.platform == 'win32':
     import codecs
     sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
     sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
 
-def extract_packing_list(file_path):
-    """패킹리스트에서 품명, 칼라, 사이즈별 수량 추출"""
+def extract_rows_loop(df, sheet_name, product_col, color_col, sizes, size_cols, start_row=2, end_row=None):
+    """셀 단위 루프 추출 (기존 방식, 벤치마크/검증용)"""
+    products = []
+    for row_idx in range(start_row, len(df) if end_row is None else min(end_row, len(df))):
+        # 품명 추출
+        product_name = None
+        color = None
+
+        try:
+            prod_val = df.iloc[row_idx, product_col]
+            if pd.notna(prod_val):
+                product_name = str(prod_val).strip()
+
+            color_val = df.iloc[row_idx, color_col]
+            if pd.notna(color_val):
+                color = str(color_val).strip()
+        except:
+            continue
+
+        # 제품명이 유효한지 확인 (NaN, 빈 문자열 제외)
+        if not product_name or product_name in ['nan', 'NaN', '']:
+            continue
+
+        # 사이즈별 수량 추출
+        quantities = {}
+        for size, col_idx in zip(sizes, size_cols):
+            try:
+                qty_val = df.iloc[row_idx, col_idx]
+                if pd.notna(qty_val) and qty_val != '':
+                    try:
+                        qty = float(qty_val)
+                        # 0보다 큰 수량만 추가
+                        if qty > 0:
+                            quantities[size] = int(qty)
+                    except (ValueError, TypeError):
+                        pass
+            except IndexError:
+                pass
+
+        # 수량이 있는 제품만 추가
+        if quantities:
+            products.append({
+                'sheet': sheet_name,
+                'product_name': product_name,
+                'color': color if color else '-',
+                'quantities': quantities
+            })
+
+    return products
+
+# 추출 로직이 바뀌면 버전을 올려 이전 캐시를 무효화
+EXTRACTOR_VERSION = 4
+EXTRACTOR = f'extract_packing_list:{EXTRACTOR_VERSION}'
+
+def extract_sheet(df, sheet_name, engine='vectorized', layout=None, file_path=None):
+    """시트 하나에서 제품 목록 추출 (출력 없음)
+
+    layout: layout_detector 감지 결과 (없으면 감지, file_path 가 있으면 (파일, 시트) 단위 메모)
+    engine='loop' 은 오른쪽 표에만 적용되는 기존 셀 루프 (그 외 형태는 벡터 추출)
+    """
+    if layout is None:
+        layout = get_layout(df, file_path, sheet_name)
+
+    if engine == 'loop' and layout['table_type'] == 'right':
+        products = []
+        for block in layout['blocks']:
+            products.extend(extract_rows_loop(df, sheet_name, block['product_col'], block['color_col'],
+                                              block['sizes'], block['size_cols'],
+                                              block['data_start_row'], block['data_end_row']))
+        return products
+    return extract_layout(df, layout, sheet_name)
+
+def extract_workbook(file_path, engine='vectorized', workbook=None, cache=None):
+    """워크북 전체에서 제품 목록 추출 (출력/파일 저장 없음, 첫 번째 통관용 시트 제외)
+
+    cache: ExtractionCache (주어지면 같은 내용의 파일은 다시 디코딩하지 않음)
+    """
+    own_workbook = workbook is None
+    if own_workbook:
+        workbook = open_workbook(file_path, track_memory=False)
+
+    def extract_one(wb, sheet_name):
+        return extract_sheet(wb.sheet(sheet_name), sheet_name, engine, file_path=file_path)
+
+    try:
+        if cache is not None:
+            sheet_results = extract_cached(cache, workbook, EXTRACTOR, extract_one)
+        else:
+            sheet_results = [(idx, name, extract_one(workbook, name), False) for idx, name in workbook.table_sheets()]
+
+        all_products = []
+        for _, _, products, _ in sheet_results:
+            all_products.extend(products)
+        return all_products
+    finally:
+        if own_workbook:
+            workbook.close()
+
+def extract_packing_list(file_path, engine='vectorized', workbook=None, use_cache=True):
+    """패킹리스트에서 품명, 칼라, 사이즈별 수량 추출
+
+    engine: 'vectorized' (사이즈 블록 일괄 추출, 기본값) 또는 'loop' (기존 셀 루프)
+    workbook: 이미 열린 WorkbookReader (없으면 새로 열고 끝나면 닫음)
+    use_cache: 추출 캐시 사용 (같은 내용의 파일은 엑셀을 다시 디코딩하지 않음)
+    """
     print("=" * 80)
     print("📦 패킹리스트 데이터 추출")
     print("=" * 80)
     print(f"\n파일: {file_path}\n")
 
-    excel_file = pd.ExcelFile(file_path)
-    all_products = []
+    own_workbook = workbook is None
+    if own_workbook:
+        workbook = open_workbook(file_path)
+    cache = ExtractionCache() if use_cache else None
 
-    # 두 번째 시트부터 처리 (첫 번째는 통관용)
-    for sheet_idx, sheet_name in enumerate(excel_file.sheet_names[1:], start=2):
-        print(f"\n{'=' * 80}")
-        print(f"🔍 시트 {sheet_idx}: {sheet_name}")
-        print(f"{'=' * 80}\n")
+    def extract_one(wb, sheet_name):
+        df = wb.sheet(sheet_name)
 
-        df = pd.read_excel(file_path, sheet_name=sheet_name, header=None)
+        layout = get_layout(df, file_path, sheet_name)
+        print(f"🔍 시트 '{sheet_name}' 레이아웃 분석")
+        for line in describe_layout(layout):
+            print(f"  {line}")
+        print()
 
-        # 오른쪽 표의 품명, 칼라, 사이즈 컬럼 찾기
-        product_col = 11  # 품명 열
-        color_col = 12    # 칼라 열
+        return extract_sheet(df, sheet_name, engine, layout=layout)
 
-        # 사이즈 행 찾기 (2행: 120, 130, 140, ... L, FREE)
-        size_row = 1
-        sizes = []
-        size_cols = []
+    # 두 번째 시트부터 처리 (첫 번째는 통관용)
+    if cache is not None:
+        sheet_results = extract_cached(cache, workbook, EXTRACTOR, extract_one)
+    else:
+        sheet_results = [(idx, name, extract_one(workbook, name), False) for idx, name in workbook.table_sheets()]
 
-        for col_idx in range(14, min(28, len(df.columns))):
-            try:
-                cell_value = df.iloc[size_row, col_idx]
-                if pd.notna(cell_value):
-                    size_str = str(cell_value).strip()
-                    # 숫자 사이즈 또는 L, FREE 등
-                    try:
-                        size_num = int(float(size_str))
-                        if 100 <= size_num <= 250:
-                            sizes.append(str(size_num))
-                            size_cols.append(col_idx)
-                            print(f"  ✓ 사이즈 발견: 열 {col_idx + 1} = {size_num}")
-                    except ValueError:
-                        if size_str in ['L', 'FREE', 'XL', 'M', 'S']:
-                            sizes.append(size_str)
-                            size_cols.append(col_idx)
-                            print(f"  ✓ 사이즈 발견: 열 {col_idx + 1} = {size_str}")
-            except:
-                pass
+    all_products = []
+    for sheet_idx, sheet_name, sheet_products, from_cache in sheet_results:
+        print(f"\n{'=' * 80}")
+        print(f"🔍 시트 {sheet_idx + 1}: {sheet_name}{' (캐시)' if from_cache else ''}")
+        print(f"{'=' * 80}\n")
 
-        print(f"\n  총 {len(sizes)}개 사이즈: {sizes}\n")
+        all_products.extend(sheet_products)
 
-        # 데이터 행 추출 (3행부터)
-        extracted_count = 0
-        for row_idx in range(2, len(df)):
-            # 품명 추출
-            product_name = None
-            color = None
+        # 처음 5개만 출력
+        for product_data in sheet_products[:5]:
+            print(f"  ✓ {product_data['product_name']} ({product_data['color']})")
+            for size, qty in product_data['quantities'].items():
+                print(f"      {size}: {qty}개")
 
-            try:
-                prod_val = df.iloc[row_idx, product_col]
-                if pd.notna(prod_val):
-                    product_name = str(prod_val).strip()
-
-                color_val = df.iloc[row_idx, color_col]
-                if pd.notna(color_val):
-                    color = str(color_val).strip()
-            except:
-                continue
-
-            # 제품명이 유효한지 확인 (NaN, 빈 문자열 제외)
-            if not product_name or product_name in ['nan', 'NaN', '']:
-                continue
-
-            # 사이즈별 수량 추출
-            quantities = {}
-            for size, col_idx in zip(sizes, size_cols):
-                try:
-                    qty_val = df.iloc[row_idx, col_idx]
-                    if pd.notna(qty_val) and qty_val != '':
-                        try:
-                            qty = float(qty_val)
-                            # 0보다 큰 수량만 추가
-                            if qty > 0:
-                                quantities[size] = int(qty)
-                        except (ValueError, TypeError):
-                            pass
-                except IndexError:
-                    pass
-
-            # 수량이 있는 제품만 추가
-            if quantities:
-                product_data = {
-                    'sheet': sheet_name,
-                    'product_name': product_name,
-                    'color': color if color else '-',
-                    'quantities': quantities
-                }
-                all_products.append(product_data)
-                extracted_count += 1
-
-                # 처음 5개만 출력
-                if extracted_count <= 5:
-                    print(f"  ✓ {product_name} ({color if color else '-'})")
-                    for size, qty in quantities.items():
-                        print(f"      {size}: {qty}개")
-
-        print(f"\n  추출 완료: {extracted_count}개 제품\n")
+        print(f"\n  추출 완료: {len(sheet_products)}개 제품\n")
 
     # 전체 결과 출력
     print("\n" + "=" * 80)
@@ -146,6 +194,13 @@ def extract_packing_list(file_path):
 
     print(f"💾 데이터가 '{output_file}'에 저장되었습니다.")
 
+    workbook.print_report()
+    if own_workbook:
+        workbook.close()
+    if cache is not None:
+        cache.print_report()
+        cache.close()
+
     return all_products
 
 if __name__ == '__main__':
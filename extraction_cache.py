@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+추출 결과 디스크 캐시 - 같은 패킹리스트를 다시 분석할 때 엑셀 디코딩 생략
+
+키: (파일 내용 SHA-256, 시트명, 추출기 이름:버전)
+저장소: SQLite 파일 1개 (.extract_cache.sqlite)
+용량 제한: 전체 크기가 max_bytes 를 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+
+파일명이 바뀌어도 내용이 같으면 캐시가 적중하고,
+추출 로직이 바뀌면 추출기 버전을 올려서 이전 결과를 무효화한다.
+
+사용법:
+    python extraction_cache.py          # 캐시 현황
+    python extraction_cache.py clear    # 캐시 비우기
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import sqlite3
+
+# UTF-8 출력 설정
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+CACHE_FILE = '.extract_cache.sqlite'
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # 256MB
+
+# 워크북의 처리 대상 시트 목록을 저장하는 예약 시트명
+SHEET_LIST_KEY = '__sheets__'
+# 시트별 표 유무 판정(workbook_loader 시트 가지치기)을 저장하는 예약 시트명
+PRUNE_KEY = '__prune__'
+
+def file_content_hash(file_path, chunk_size=1024 * 1024):
+    """파일 내용 SHA-256 (1MB 단위로 읽음)"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ExtractionCache:
+    """크기 제한 LRU 추출 결과 캐시"""
+
+    def __init__(self, path=CACHE_FILE, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._hashes = {}  # (절대경로, mtime, 크기) -> 내용 해시
+
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS entries (
+                contentHash TEXT,
+                sheet TEXT,
+                extractor TEXT,
+                payload TEXT,
+                size INTEGER,
+                lastAccess REAL,
+                PRIMARY KEY (contentHash, sheet, extractor)
+            )
+        ''')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_entries_access ON entries(lastAccess)')
+        self.conn.commit()
+
+    def file_hash(self, file_path):
+        """파일 내용 해시 (같은 실행 안에서 mtime/크기가 그대로면 다시 읽지 않음)"""
+        stat = os.stat(file_path)
+        key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+        if key not in self._hashes:
+            self._hashes[key] = file_content_hash(file_path)
+        return self._hashes[key]
+
+    def get(self, content_hash, sheet, extractor, count=True):
+        """캐시 조회 - 없으면 None
+
+        count: 적중/미적중 횟수에 반영 (예약 시트명 조회는 False - 시트 결과만 셈)
+        """
+        row = self.conn.execute(
+            'SELECT payload FROM entries WHERE contentHash = ? AND sheet = ? AND extractor = ?',
+            (content_hash, sheet, extractor)
+        ).fetchone()
+
+        if row is None:
+            if count:
+                self.misses += 1
+            return None
+
+        if count:
+            self.hits += 1
+        self.conn.execute(
+            'UPDATE entries SET lastAccess = ? WHERE contentHash = ? AND sheet = ? AND extractor = ?',
+            (time.time(), content_hash, sheet, extractor)
+        )
+        self.conn.commit()
+        return json.loads(row[0])
+
+    def put(self, content_hash, sheet, extractor, value):
+        """캐시 저장 후 용량 초과분 LRU 삭제"""
+        payload = json.dumps(value, ensure_ascii=False)
+        self.conn.execute(
+            'INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)',
+            (content_hash, sheet, extractor, payload, len(payload.encode('utf-8')), time.time())
+        )
+        self._evict()
+        self.conn.commit()
+
+    def _evict(self):
+        total = self.total_bytes()
+        if total <= self.max_bytes:
+            return
+
+        rows = self.conn.execute(
+            'SELECT contentHash, sheet, extractor, size FROM entries ORDER BY lastAccess'
+        ).fetchall()
+        for content_hash, sheet, extractor, size in rows:
+            if total <= self.max_bytes:
+                break
+            self.conn.execute(
+                'DELETE FROM entries WHERE contentHash = ? AND sheet = ? AND extractor = ?',
+                (content_hash, sheet, extractor)
+            )
+            total -= size
+
+    def total_bytes(self):
+        return self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+
+    def entry_count(self):
+        return self.conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    def clear(self):
+        self.conn.execute('DELETE FROM entries')
+        self.conn.commit()
+        self.conn.execute('VACUUM')
+
+    def print_report(self):
+        """시트 결과 적중/미적중 횟수 출력"""
+        total = self.hits + self.misses
+        rate = (self.hits / total * 100) if total else 0
+        print(f"\n🗄️  추출 캐시: 적중 {self.hits}회, 미적중 {self.misses}회 (적중률 {rate:.0f}%)")
+
+    def close(self):
+        self.conn.close()
+
+def extract_cached(cache, workbook, extractor, extract_sheet_func, skip_first=True):
+    """워크북 단위 캐시 추출
+
+    workbook: WorkbookReader (파일은 캐시 미적중 시에만 실제로 열린다)
+    extract_sheet_func(workbook, sheet_name): 시트 하나의 제품 목록
+    skip_first: 첫 번째(통관용) 시트 제외
+
+    표가 없는 시트는 앞쪽 몇 행만 보고 건너뛴다 (WorkbookReader.probe, 판정도 캐시에 저장).
+    처리 대상 시트 목록, 판정, 시트별 결과가 모두 캐시에 있으면 워크북을 열지 않는다.
+    반환: [(시트 번호, 시트명, 제품 목록, 캐시 적중 여부), ...] (건너뛴 시트 제외, 시트 번호는 워크북 안 0부터)
+    """
+    from workbook_loader import PRUNER
+
+    content_hash = cache.file_hash(workbook.file_path)
+
+    sheet_names = cache.get(content_hash, SHEET_LIST_KEY, extractor, count=False)
+    if sheet_names is None:
+        sheet_names = workbook.sheet_names[1:] if skip_first else list(workbook.sheet_names)
+        cache.put(content_hash, SHEET_LIST_KEY, extractor, sheet_names)
+
+    verdicts = cache.get(content_hash, PRUNE_KEY, PRUNER, count=False)
+    if verdicts is None or {v['sheet'] for v in verdicts} != set(sheet_names):
+        verdicts = workbook.probe_sheets(sheet_names)
+        cache.put(content_hash, PRUNE_KEY, PRUNER, verdicts)
+    else:
+        workbook.restore_probes(verdicts)
+    tables = {v['sheet'] for v in verdicts if v['table']}
+
+    first = 1 if skip_first else 0
+    results = []
+    for idx, sheet_name in enumerate(sheet_names, first):
+        if sheet_name not in tables:
+            continue
+        products = cache.get(content_hash, sheet_name, extractor)
+        hit = products is not None
+        if not hit:
+            products = extract_sheet_func(workbook, sheet_name)
+            cache.put(content_hash, sheet_name, extractor, products)
+        results.append((idx, sheet_name, products, hit))
+
+    return results
+
+def cached_workbook(cache, content_hash, extractor):
+    """워크북 전체 결과가 캐시에 있으면 [(시트명, 제품 목록)] (표 없는 시트 제외), 하나라도 없으면 None
+
+    extract_cached 가 저장한 것과 같은 항목(시트 목록, 가지치기 판정, 시트별 결과)을 읽는다.
+    """
+    from workbook_loader import PRUNER
+
+    sheet_names = cache.get(content_hash, SHEET_LIST_KEY, extractor, count=False)
+    if sheet_names is None:
+        return None
+    verdicts = cache.get(content_hash, PRUNE_KEY, PRUNER, count=False)
+    if verdicts is None or {v['sheet'] for v in verdicts} != set(sheet_names):
+        return None
+    tables = {v['sheet'] for v in verdicts if v['table']}
+
+    results = []
+    for sheet_name in sheet_names:
+        if sheet_name in tables:
+            products = cache.get(content_hash, sheet_name, extractor)
+            if products is None:
+                return None
+            results.append((sheet_name, products))
+    return results
+
+def store_workbook(cache, content_hash, extractor, sheet_names, verdicts, results):
+    """워크북 하나를 다른 곳에서 추출한 결과를 extract_cached 와 같은 형태로 저장
+
+    results: [(시트명, 제품 목록)] (표가 있는 시트 전부)
+    """
+    from workbook_loader import PRUNER
+
+    cache.put(content_hash, SHEET_LIST_KEY, extractor, sheet_names)
+    cache.put(content_hash, PRUNE_KEY, PRUNER, verdicts)
+    for sheet_name, products in results:
+        cache.put(content_hash, sheet_name, extractor, products)
+
+if __name__ == '__main__':
+    cache = ExtractionCache()
+    if len(sys.argv) > 1 and sys.argv[1] == 'clear':
+        cache.clear()
+        print("✅ 추출 캐시를 비웠습니다.")
+    else:
+        print(f"🗄️  {cache.path}: {cache.entry_count()}개 항목, "
+              f"{cache.total_bytes() / 1024 / 1024:.2f}MB / {cache.max_bytes / 1024 / 1024:.0f}MB")
+    cache.close()
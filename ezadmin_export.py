@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+"""
+이지어드민 업로드 파일 생성 (도매인별 XLSX / CSV, 스트리밍 + 병렬)
+
+app.js generateEzAdminFile 과 같은 규칙:
+- 매칭 성공(status == 'success', target 있음) 항목만
+- 도매인(source.wholesaler, 없으면 '미지정')별로 파일 하나
+- 열: 상품코드([...] 접두어 제거), 수량(사이즈별 수량 합, parseInt), 메모(yymmdd_파일명)
+- 파일명: [도매인]_yymmddhhmmss.xlsx, 시트 EzAdmin_Upload, 열 너비 15/10/40
+  (도매인에 파일명에 못 쓰는 글자(/ \\ : * ? " < > | 등)가 있으면 '_' 로 바꾸고
+  원래 이름의 해시를 붙여 구분 - safe_name)
+
+다른 점:
+- 행은 (상품코드, 수량, 메모) 튜플로만 모으고 openpyxl write-only / csv 로 바로 흘려 쓴다.
+- 도매인 파일은 작업 프로세스에서 동시에 쓴다. 한 도매인 파일을 못 써도 나머지는 쓰고
+  실패는 도매인별 'error' 로 돌려준다.
+- 접두어 제거는 상품코드마다 한 번만 한다.
+- 파일은 ezadmin_exports/ 에 [도매인]_타임스탬프 이름으로 남는다. 재다운로드는
+  다시 만들지 않고 그 파일을 읽는다 (export_path / read_export,
+  server.js 정적 경로 /ezadmin_exports/... 로도 받을 수 있음).
+  app.js reDownloadFile 은 접두어를 지우지 않았는데, 같은 파일을 읽으므로 그 차이도 없다.
+
+사용법:
+    python ezadmin_export.py export [추출 데이터] [database.sqlite] [--csv]   # 매핑 후 도매인별 파일 생성
+    python ezadmin_export.py get <도매인> <yymmddhhmmss> [--csv]               # 생성된 파일 경로
+    python ezadmin_export.py bench [항목 수] [도매인 수]                       # 순차 대비 병렬 쓰기
+"""
+
+import os
+import re
+import sys
+import csv
+import time
+import tempfile
+import multiprocessing
+from datetime import datetime
+
+from mapping_memory import normalize_code, item_file_name
+
+# UTF-8 출력 설정
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+EXPORT_DIR = 'ezadmin_exports'
+HEADER = ['상품코드', '수량', '메모']
+COLUMN_WIDTHS = {'A': 15, 'B': 10, 'C': 40}
+SHEET_NAME = 'EzAdmin_Upload'
+UNASSIGNED = '미지정'
+
+_JS_INT = re.compile(r'\s*([+-]?\d+)')
+_UNSAFE_CHARS = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
+
+def js_int(value):
+    """parseInt(value) || 0"""
+    if type(value) is int:
+        return value
+    if isinstance(value, float):
+        return int(value) if value == value and abs(value) != float('inf') else 0
+    match = _JS_INT.match(str(value))
+    return int(match.group(1)) if match else 0
+
+def total_quantity(quantities):
+    """사이즈별 수량 합 - 추출 결과는 보통 정수라 내장 sum 한 번, 아니면 parseInt 규칙으로"""
+    values = quantities.values()
+    try:
+        total = sum(values)
+    except TypeError:
+        total = None
+    if type(total) is int:
+        return total
+    return sum(js_int(v) for v in values)
+
+def timestamps(now=None):
+    """(yymmdd, yymmddhhmmss)"""
+    now = now or datetime.now()
+    full = now.strftime('%y%m%d%H%M%S')
+    return full[:6], full
+
+def safe_name(wholesaler):
+    """도매인 -> 파일명에 쓸 수 있는 이름
+
+    경로 구분자/예약 문자와 끝의 점·공백을 '_' 로 바꾸고, 바뀌었으면 원래 이름의 해시를 붙여
+    'A/B' 와 'A_B' 가 같은 파일을 덮어쓰지 않게 한다. 바꿀 것이 없으면 그대로.
+    """
+    safe = _UNSAFE_CHARS.sub('_', wholesaler)
+    stripped = safe.rstrip('. ')
+    safe = stripped + '_' * (len(safe) - len(stripped))
+    if safe in ('', '.', '..'):
+        safe = '_' * max(1, len(safe))
+    if safe == wholesaler:
+        return wholesaler
+    import hashlib
+
+    return f"{safe}~{hashlib.sha1(wholesaler.encode('utf-8')).hexdigest()[:8]}"
+
+def export_name(wholesaler, timestamp, fmt='xlsx'):
+    return f'[{safe_name(wholesaler)}]_{timestamp}.{fmt}'
+
+def export_path(wholesaler, timestamp, fmt='xlsx', directory=EXPORT_DIR):
+    return os.path.join(directory, export_name(wholesaler, timestamp, fmt))
+
+def read_export(wholesaler, timestamp, fmt='xlsx', directory=EXPORT_DIR):
+    """재다운로드 - 생성해 둔 파일 내용 (없으면 FileNotFoundError)"""
+    with open(export_path(wholesaler, timestamp, fmt, directory), 'rb') as f:
+        return f.read()
+
+def group_rows(results, yymmdd):
+    """매핑 결과 -> {도매인: [(상품코드, 수량, 메모)]} (도매인은 처음 나온 순서)"""
+    groups = {}
+    clean_codes = {}
+    for result in results:
+        target = result.get('target')
+        if result.get('status') != 'success' or not target:
+            continue
+        source = result['source']
+        wholesaler = source.get('wholesaler') or UNASSIGNED
+        code = target['productCode']
+        clean = clean_codes.get(code)
+        if clean is None:
+            clean = clean_codes[code] = normalize_code(code)
+        rows = groups.get(wholesaler)
+        if rows is None:
+            rows = groups[wholesaler] = []
+        rows.append((clean, total_quantity(source.get('quantities') or {}), f'{yymmdd}_{item_file_name(source)}'))
+    return groups
+
+def _write_xlsx(path, rows):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(SHEET_NAME)
+    for column, width in COLUMN_WIDTHS.items():
+        sheet.column_dimensions[column].width = width
+    sheet.append(HEADER)
+    for row in rows:
+        sheet.append(row)
+    workbook.save(path)
+
+def _write_csv(path, rows):
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        writer.writerows(rows)
+
+def _write_file(task):
+    """작업 프로세스 진입점: (경로, 형식, 행) -> (경로, 행 수, 수량 합, 오류 또는 None)"""
+    path, fmt, rows = task
+    # 다 쓴 뒤 이름을 바꿔서 재다운로드가 쓰다 만 파일을 읽지 않게 함
+    tmp = path + '.part'
+    try:
+        (_write_xlsx if fmt == 'xlsx' else _write_csv)(tmp, rows)
+        os.replace(tmp, path)
+    except Exception as e:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return path, 0, 0, f"{type(e).__name__}: {e}"
+    return path, len(rows), sum(row[1] for row in rows), None
+
+def write_exports(results, fmt='xlsx', directory=EXPORT_DIR, now=None, workers=None):
+    """도매인별 업로드 파일 생성
+
+    반환: {'timestamp', 'files': [{'wholesaler', 'path', 'rows', 'quantity', 'error'}]} (도매인 순서 유지)
+    (wholesaler 는 원래 도매인 이름, 쓰지 못한 파일은 error 에 사유가 있고 rows/quantity 는 0)
+    """
+    yymmdd, timestamp = timestamps(now)
+    groups = group_rows(results, yymmdd)
+    os.makedirs(directory, exist_ok=True)
+    tasks = [(export_path(w, timestamp, fmt, directory), fmt, rows) for w, rows in groups.items()]
+
+    workers = max(1, min(len(tasks), workers or os.cpu_count() or 1))
+    if workers == 1:
+        written = [_write_file(task) for task in tasks]
+    else:
+        ctx = multiprocessing.get_context()
+        with ctx.Pool(workers) as pool:
+            written = pool.map(_write_file, tasks)
+
+    files = [{'wholesaler': w, 'path': path, 'rows': rows, 'quantity': quantity, 'error': error}
+             for w, (path, rows, quantity, error) in zip(groups, written)]
+    return {'timestamp': timestamp, 'files': files}
+
+def _synthetic_results(n_items, n_wholesalers, seed=0):
+    import random
+
+    rng = random.Random(seed)
+    results = []
+    for _ in range(n_items):
+        wholesaler = f'도매{rng.randrange(n_wholesalers):02d}'
+        status = 'success' if rng.random() < 0.9 else 'warning'
+        results.append({
+            'source': {'wholesaler': wholesaler, 'fileName': f'{wholesaler}_입고.xlsx',
+                       'quantities': {str(120 + 10 * s): rng.randrange(1, 300) for s in range(rng.randrange(1, 6))}},
+            'target': {'productCode': f'[{wholesaler}]P{rng.randrange(n_items):08d}'},
+            'status': status,
+        })
+    return results
+
+def _legacy_exports(results, directory, now):
+    """비교용: app.js 처럼 도매인마다 dict 행 목록을 만들고 순서대로 한 파일씩 쓰기"""
+    from openpyxl import Workbook
+
+    yymmdd, timestamp = timestamps(now)
+    groups = {}
+    for m in results:
+        if m['status'] == 'success' and m['target']:
+            groups.setdefault(m['source'].get('wholesaler') or UNASSIGNED, []).append(m)
+    for wholesaler, items in groups.items():
+        data = [{'상품코드': normalize_code(m['target']['productCode']),
+                 '수량': sum(js_int(q) for q in m['source']['quantities'].values()),
+                 '메모': f"{yymmdd}_{item_file_name(m['source'])}"} for m in items]
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.title = SHEET_NAME
+        sheet.append(HEADER)
+        for row in data:
+            sheet.append([row[h] for h in HEADER])
+        workbook.save(export_path(wholesaler, timestamp, 'xlsx', directory))
+
+def benchmark(n_items=200000, n_wholesalers=8):
+    """app.js 방식(행 dict, 일반 워크북, 순차) 대비 스트리밍/병렬 쓰기 + 재다운로드(파일 읽기)"""
+    from openpyxl import load_workbook
+
+    results = _synthetic_results(n_items, n_wholesalers)
+    now = datetime(2026, 1, 15, 9, 30, 0)
+    print("=" * 80)
+    print(f"📈 이지어드민 파일 생성 벤치마크 (항목 {n_items:,}개, 도매인 {n_wholesalers}개, CPU {os.cpu_count()}개)")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_dir = os.path.join(tmp, 'legacy')
+        os.makedirs(legacy_dir)
+        start = time.perf_counter()
+        _legacy_exports(results, legacy_dir, now)
+        print(f"  기존 방식 (순차)        : {time.perf_counter() - start:6.2f}초")
+
+        exported = {}
+        for label, fmt, workers in (('스트리밍 XLSX 순차', 'xlsx', 1), ('스트리밍 XLSX 병렬', 'xlsx', None),
+                                    ('스트리밍 CSV 병렬', 'csv', None)):
+            directory = os.path.join(tmp, f'{fmt}_{workers}')
+            start = time.perf_counter()
+            exported[fmt] = write_exports(results, fmt, directory, now, workers)
+            print(f"  {label:<22}: {time.perf_counter() - start:6.2f}초  ({len(exported[fmt]['files'])}개 파일)")
+
+        files = exported['xlsx']['files']
+        timestamp = exported['xlsx']['timestamp']
+        start = time.perf_counter()
+        data = read_export(files[0]['wholesaler'], timestamp, 'xlsx', os.path.dirname(files[0]['path']))
+        print(f"  재다운로드 (파일 읽기)  : {(time.perf_counter() - start) * 1000:6.2f}ms  ({len(data):,}바이트)")
+
+        def cells(path):
+            return [tuple(row) for row in load_workbook(path, read_only=True).active.iter_rows(values_only=True)]
+
+        same = all(cells(export_path(f['wholesaler'], timestamp, 'xlsx', legacy_dir)) == cells(f['path'])
+                   for f in files)
+        print(f"  결과 일치               : {'✅' if same else '❌'}")
+
+def export_extracted(data_file=None, db_path=None, fmt='xlsx'):
+    """추출 데이터를 매핑(기억/제외/자동)한 뒤 도매인별 업로드 파일 생성"""
+    from mapping_memory import resolve_extracted, DB_FILE
+
+    results = resolve_extracted(data_file, db_path or DB_FILE)
+    start = time.perf_counter()
+    exported = write_exports(results, fmt)
+    elapsed = time.perf_counter() - start
+    if not exported['files']:
+        print("⚠️ 매칭 성공한 항목이 없습니다.")
+        return exported
+    print(f"📤 이지어드민 파일 {len(exported['files'])}개 생성 ({elapsed:.2f}초)")
+    for f in exported['files']:
+        if f['error']:
+            print(f"   ❌ {f['wholesaler']}: {f['error']}")
+        else:
+            print(f"   {f['path']}: {f['rows']:,}행, 수량 {f['quantity']:,}")
+    return exported
+
+if __name__ == '__main__':
+    command = sys.argv[1] if len(sys.argv) > 1 else 'export'
+    fmt = 'csv' if '--csv' in sys.argv else 'xlsx'
+    args = [a for a in sys.argv[2:] if a != '--csv']
+    if command == 'bench':
+        benchmark(int(args[0]) if args else 200000, int(args[1]) if len(args) > 1 else 8)
+    elif command == 'get' and len(args) >= 2:
+        path = export_path(args[0], args[1], fmt)
+        print(path if os.path.exists(path) else f"❌ 파일이 없습니다: {path}")
+    else:
+        export_extracted(args[0] if args else None, args[1] if len(args) > 1 else None, fmt)
@@ -0,0 +1,498 @@
+# -*- coding: utf-8 -*-
+"""
+입고 파이프라인 - 파일 읽기부터 이지어드민 파일까지 한 프로세스에서 겹쳐 실행
+
+기존 흐름은 완전히 순차적이다: 파일 읽기 -> 워크북 디코딩 -> 추출 -> JSON 저장,
+다음 스크립트(add_wholesaler_filename, 매핑, convert_to_csv ...)가 그 JSON 을 다시 읽는다.
+여기서는 단계 사이를 길이 제한 큐(asyncio.Queue)로 잇는다:
+
+    읽기 -> 판정 -> 디코딩 -> 레이아웃 감지 -> 추출 -> 매핑 -> 내보내기
+
+- 읽기        : 파일 내용 + 내용 해시 (스레드, 디스크 I/O). 추출 캐시에 워크북 전체가 있으면
+                판정/디코딩/감지/추출을 건너뛰고 바로 매핑으로
+- 판정        : 시트 목록 + 표 있는 시트 판정 (작업 프로세스, workbook_loader 시트 가지치기)
+                -> 표 있는 시트마다 항목 하나
+- 디코딩      : 시트 하나를 DataFrame 으로 (작업 프로세스, 시트마다 작업 하나)
+- 레이아웃 감지 : layout_detector (스레드 - 앞쪽 창만 읽으므로 DataFrame 을 프로세스로 보내지 않음)
+- 추출        : vectorized_extract (작업 프로세스 - DataFrame 은 디코딩 결과 1번, 추출 입력 1번만 오감)
+- 매핑        : 기억/제외에 없는 항목 자동 매칭 (전용 스레드 1개 - 엔진 색인과 SQLite 연결 유지)
+- 내보내기    : 모든 시트가 끝나면 파일/시트 순서대로 합쳐 기억/제외 적용
+                (MappingMemory.resolve_all) 후 도매인별 업로드 파일과 추출 데이터 파일 저장
+
+큐가 차면 앞 단계가 기다리므로(역압) 디코딩된 시트가 메모리에 쌓이지 않고
+(시트 단위 - 시트가 많은 파일도 한 번에 모든 시트를 디코딩하지 않음),
+한 단계가 디스크를 기다리는 동안 다른 단계는 계속 일한다.
+중간 결과는 JSON 으로 쓰고 다시 읽지 않는다.
+결과는 순차 흐름(batch_extract -> JSON -> resolve_extracted -> ezadmin_export)과 같다.
+
+사용법:
+    python ingest_pipeline.py list list/11 [--workers N] [--db database.sqlite] [-o extracted_products.json]
+                              [--csv] [--no-cache] [--wholesaler 도매인] [--queue 8]
+    python ingest_pipeline.py bench [파일 수] [SKU 수]   # 순차 흐름 대비
+"""
+
+import os
+import sys
+import time
+import asyncio
+import hashlib
+import argparse
+import tempfile
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from workbook_loader import open_workbook
+from layout_detector import detect_layout
+from vectorized_extract import extract_layout
+from extract_real_packing import EXTRACTOR
+from extraction_cache import cached_workbook, store_workbook
+from add_wholesaler_filename import add_wholesaler_filename
+from ezadmin_export import EXPORT_DIR, write_exports
+from matching_engine import DB_FILE
+
+# UTF-8 출력 설정
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+DEFAULT_QUEUE_SIZE = 8  # 단계 사이 큐 길이 (차면 앞 단계가 기다림)
+READ_CONCURRENCY = 2
+
+_DONE = object()
+
+def _read_file(path):
+    """파일 내용 + SHA-256 (extraction_cache.file_content_hash 와 같은 값)"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return data, hashlib.sha256(data).hexdigest()
+
+_worker_book = None  # 작업 프로세스마다 마지막으로 연 (내용 해시, WorkbookReader)
+
+def _workbook(path, data, content_hash):
+    """작업 프로세스: 같은 파일의 판정/시트 작업이 이어서 오면 열어 둔 워크북을 다시 사용"""
+    global _worker_book
+    if _worker_book is None or _worker_book[0] != content_hash:
+        if _worker_book is not None:
+            _worker_book[1].close()
+        _worker_book = (content_hash, open_workbook(path, track_memory=False, data=data))
+    return _worker_book[1]
+
+def _probe(path, data, content_hash):
+    """작업 프로세스: 파일 내용 -> (처리 대상 시트명, 가지치기 판정)"""
+    workbook = _workbook(path, data, content_hash)
+    sheet_names = workbook.sheet_names[1:]
+    return sheet_names, workbook.probe_sheets(sheet_names)
+
+def _decode(path, data, content_hash, sheet_name):
+    """작업 프로세스: 파일 내용 -> 시트 하나의 DataFrame (보내고 나면 작업 프로세스에는 남기지 않음)"""
+    workbook = _workbook(path, data, content_hash)
+    df = workbook.sheet(sheet_name)
+    workbook.release(sheet_name)
+    return df
+
+class _Stage:
+    """입력 큐 하나를 비우는 작업자 묶음 - 처리 시간 / 입력 대기 / 출력 대기(역압) 기록"""
+
+    def __init__(self, name, handler, concurrency=1, queue_size=DEFAULT_QUEUE_SIZE):
+        self.name = name
+        self.handler = handler  # async (항목) -> 다음 단계로 보낼 항목 목록
+        self.concurrency = concurrency
+        self.inbox = asyncio.Queue(queue_size)
+        self.outbox = None
+        self.items = 0
+        self.busy = 0.0
+        self.starved = 0.0
+        self.blocked = 0.0
+
+    async def _work(self):
+        while True:
+            start = time.perf_counter()
+            item = await self.inbox.get()
+            self.starved += time.perf_counter() - start
+            if item is _DONE:
+                # 같은 단계의 다른 작업자도 끝내도록 되돌려 놓음
+                await self.inbox.put(_DONE)
+                return
+            start = time.perf_counter()
+            outputs = await self.handler(item)
+            self.busy += time.perf_counter() - start
+            self.items += 1
+            for output in outputs:
+                start = time.perf_counter()
+                await self.outbox.put(output)
+                self.blocked += time.perf_counter() - start
+
+    async def run(self):
+        await asyncio.gather(*(self._work() for _ in range(self.concurrency)))
+        if self.outbox is not None:
+            await self.outbox.put(_DONE)
+
+    def report(self):
+        return {'stage': self.name, 'items': self.items, 'busy_seconds': self.busy,
+                'starved_seconds': self.starved, 'blocked_seconds': self.blocked}
+
+async def _ingest(files, service, engine, wholesaler, workers, queue_size, extraction_cache, mapping_cache_path,
+                  db_path, output, fmt, export_dir, now):
+    loop = asyncio.get_running_loop()
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context())
+    mapper = ThreadPoolExecutor(max_workers=1)  # 매핑은 항상 같은 스레드 (엔진 색인 / SQLite 연결)
+    mapping_cache = None
+    if mapping_cache_path is not None:
+        from mapping_cache import MappingCache
+        mapping_cache = await loop.run_in_executor(mapper, functools.partial(MappingCache, mapping_cache_path,
+                                                                             db_path))
+
+    errors = {}     # 파일 위치 -> 오류
+    workbooks = {}  # 파일 위치 -> 추출 캐시 저장용 (해시, 시트 목록, 판정, 남은 시트 수, 결과)
+    mapped = {}     # (파일 위치, 시트 순서) -> (항목 목록, auto_match 결과)
+    cached_files = 0
+
+    def store_if_done(index):
+        """파일의 표 시트가 모두 추출되면 extract_cached 와 같은 형태로 추출 캐시에 저장"""
+        record = workbooks[index]
+        if record['remaining'] == 0 and extraction_cache is not None and index not in errors:
+            store_workbook(extraction_cache, record['hash'], EXTRACTOR, record['sheet_names'], record['verdicts'],
+                           [record['results'][order] for order in sorted(record['results'])])
+
+    def finish_sheet(index, order, sheet_name, products):
+        record = workbooks[index]
+        record['results'][order] = (sheet_name, products)
+        record['remaining'] -= 1
+        store_if_done(index)
+
+    async def read(item):
+        nonlocal cached_files
+        index, path = item
+        try:
+            data, content_hash = await loop.run_in_executor(None, _read_file, path)
+        except OSError as e:
+            errors[index] = f"{type(e).__name__}: {e}"
+            return []
+        if extraction_cache is not None:
+            cached = cached_workbook(extraction_cache, content_hash, EXTRACTOR)
+            if cached is not None:
+                # 워크북 전체가 캐시에 있으면 디코딩/감지/추출 없이 바로 매핑으로
+                cached_files += 1
+                for order, (sheet_name, products) in enumerate(cached):
+                    start = time.perf_counter()
+                    await stages[-1].inbox.put({'file': index, 'order': order, 'sheet': sheet_name,
+                                                'products': products})
+                    stages[0].blocked += time.perf_counter() - start
+                return []
+        return [{'file': index, 'path': path, 'data': data, 'hash': content_hash}]
+
+    async def probe(item):
+        index = item['file']
+        try:
+            sheet_names, verdicts = await loop.run_in_executor(pool, _probe, item['path'], item['data'],
+                                                               item['hash'])
+        except Exception as e:
+            errors[index] = f"{type(e).__name__}: {e}"
+            return []
+        tables = [(order, v['sheet']) for order, v in enumerate(verdicts) if v['table']]
+        workbooks[index] = {'hash': item['hash'], 'sheet_names': sheet_names, 'verdicts': verdicts,
+                            'remaining': len(tables), 'results': {}}
+        store_if_done(index)  # 표 있는 시트가 없어도 판정은 저장
+        return [{'file': index, 'order': order, 'sheet': sheet_name, 'path': item['path'], 'data': item['data'],
+                 'hash': item['hash']} for order, sheet_name in tables]
+
+    async def decode(item):
+        if item['file'] in errors:
+            return []  # 같은 파일의 다른 시트가 이미 실패함
+        try:
+            df = await loop.run_in_executor(pool, _decode, item['path'], item['data'], item['hash'], item['sheet'])
+        except Exception as e:
+            errors[item['file']] = f"{type(e).__name__}: {e}"
+            return []
+        return [{'file': item['file'], 'order': item['order'], 'sheet': item['sheet'], 'df': df}]
+
+    async def layout(item):
+        try:
+            # 표 형태 감지는 앞쪽 창만 읽으므로 DataFrame 을 작업 프로세스로 보내지 않고 스레드에서
+            item['layout'] = await loop.run_in_executor(None, detect_layout, item['df'])
+        except Exception as e:
+            errors[item['file']] = f"{type(e).__name__}: {e}"
+            return []
+        return [item]
+
+    async def extract(item):
+        try:
+            products = await loop.run_in_executor(pool, extract_layout, item.pop('df'), item['layout'], item['sheet'])
+        except Exception as e:
+            errors[item['file']] = f"{type(e).__name__}: {e}"
+            return []
+        finish_sheet(item['file'], item['order'], item['sheet'], products)
+        return [{'file': item['file'], 'order': item['order'], 'sheet': item['sheet'], 'products': products}]
+
+    async def match(item):
+        index = item['file']
+        items = add_wholesaler_filename(item['products'], wholesaler, os.path.basename(files[index]))
+        try:
+            matched = await loop.run_in_executor(mapper, functools.partial(service.auto_match, items, engine,
+                                                                           mapping_cache))
+        except Exception as e:
+            errors[index] = f"{type(e).__name__}: {e}"
+            return []
+        mapped[(index, item['order'])] = (items, matched)
+        return []
+
+    stages = [
+        _Stage('읽기', read, READ_CONCURRENCY, queue_size),
+        _Stage('판정', probe, workers, queue_size),
+        _Stage('디코딩', decode, workers, queue_size),
+        _Stage('레이아웃', layout, workers, queue_size),
+        _Stage('추출', extract, workers, queue_size),
+        _Stage('매핑', match, 1, queue_size),
+    ]
+    for stage, following in zip(stages, stages[1:]):
+        stage.outbox = following.inbox
+
+    async def feed():
+        for item in enumerate(files):
+            await stages[0].inbox.put(item)
+        await stages[0].inbox.put(_DONE)
+
+    start = time.perf_counter()
+    try:
+        try:
+            await asyncio.gather(feed(), *(stage.run() for stage in stages))
+        finally:
+            pool.shutdown()
+
+        # 내보내기: 파일/시트 순서대로 합쳐서 기억/제외 적용 (auto_match 는 이미 끝남)
+        export_start = time.perf_counter()
+        products = []
+        matched = {}
+        for key in sorted(k for k in mapped if k[0] not in errors):
+            items, auto = mapped[key]
+            matched.update((len(products) + i, best) for i, best in auto.items())
+            products.extend(items)
+        results = await loop.run_in_executor(mapper, functools.partial(service.resolve_all, products,
+                                                                       matched=matched))
+        writes = [loop.run_in_executor(None, functools.partial(write_exports, results, fmt, export_dir, now,
+                                                               workers))]
+        if output:
+            from product_store import write_products
+            writes.append(loop.run_in_executor(None, write_products, output, products))
+        exported = (await asyncio.gather(*writes))[0]
+    finally:
+        if mapping_cache is not None:
+            await loop.run_in_executor(mapper, mapping_cache.close)
+        mapper.shutdown()
+    end = time.perf_counter()
+
+    reports = [stage.report() for stage in stages]
+    reports.append({'stage': '내보내기', 'items': len(results), 'busy_seconds': end - export_start,
+                    'starved_seconds': 0.0, 'blocked_seconds': 0.0})
+    return {
+        'products': products,
+        'results': results,
+        'exported': exported,
+        'errors': {files[i]: error for i, error in sorted(errors.items())},
+        'stages': reports,
+        'cached_files': cached_files,
+        'mapping_cache': mapping_cache,
+        'seconds': end - start,
+    }
+
+def ingest(files, service, engine=None, wholesaler=None, workers=None, queue_size=DEFAULT_QUEUE_SIZE,
+           extraction_cache=None, mapping_cache_path=None, db_path=DB_FILE, output=None, fmt='xlsx',
+           export_dir=EXPORT_DIR, now=None):
+    """패킹리스트 파일 목록을 읽기 -> 디코딩 -> 감지 -> 추출 -> 매핑 -> 내보내기 파이프라인으로 처리
+
+    service: MappingMemory (기억/제외 목록 + 제품), engine: MatchingEngine (없으면 service 제품으로)
+    wholesaler: 모든 제품에 지정할 도매인 (None 이면 시트명, add_wholesaler_filename 과 같음)
+    extraction_cache: ExtractionCache - 주면 같은 내용의 파일은 디코딩하지 않음 (이벤트 루프 스레드에서만 사용)
+    mapping_cache_path: 주면 MappingCache 를 매핑 스레드에서 열어 사용
+    output: 추출 데이터 파일 (.json/.jsonl/.parquet, 없으면 저장 안 함)
+    반환: {'products', 'results', 'exported', 'errors', 'stages', 'cached_files', 'mapping_cache', 'seconds'}
+    """
+    workers = max(1, workers or os.cpu_count() or 1)
+    engine = engine or service.make_engine()
+    return asyncio.run(_ingest(list(files), service, engine, wholesaler, workers, queue_size, extraction_cache,
+                               mapping_cache_path, db_path, output, fmt, export_dir, now))
+
+def print_stages(reports):
+    """단계별 처리 건수 / 작업 시간 / 입력 대기 / 출력 대기(역압)"""
+    print(f"  {'단계':<8}{'처리':>8}{'작업':>10}{'입력 대기':>10}{'출력 대기':>10}")
+    for r in reports:
+        print(f"  {r['stage']:<8}{r['items']:>8,}{r['busy_seconds']:>9.2f}초{r['starved_seconds']:>9.2f}초"
+              f"{r['blocked_seconds']:>9.2f}초")
+
+def write_bench_file(path, products, n_sheets=3, rows=200, seed=0):
+    """통관용 시트 + 도매인 시트 n_sheets 개 (오른쪽 표, 제품 DB 에서 뽑은 품명/칼라/사이즈)"""
+    import random
+    from openpyxl import Workbook
+
+    rng = random.Random(seed)
+    sizes = ['120', '130', '140', '150', '160', '170', '180', '190', '200', 'S', 'M', 'L', 'FREE']
+    by_wholesaler = {}
+    for p in products:
+        by_wholesaler.setdefault(p['wholesaler'], []).append(p)
+    wholesalers = sorted(by_wholesaler)
+
+    workbook = Workbook(write_only=True)
+    customs = workbook.create_sheet('통관용')
+    customs.append(['INVOICE', 'DESCRIPTION', 'QTY'])
+    for name in rng.sample(wholesalers, n_sheets):
+        sheet = workbook.create_sheet(name)
+        sheet.append(['패킹NO.'] + [None] * 10 + ['품명', '칼라', '합계', '사이즈별수량'])
+        sheet.append([None] * 14 + sizes)
+        for _ in range(rows):
+            p = rng.choice(by_wholesaler[name])
+            color, _, size = p['option'].replace('(', ':').rstrip(')').partition(':')
+            quantity = rng.randrange(1, 300)
+            row = [None] * 11 + [p['productName'], color, quantity] + [None] * len(sizes)
+            row[14 + sizes.index(size)] = quantity
+            sheet.append(row)
+    workbook.save(path)
+
+def _serial(files, db_path, snapshot, tmp, now):
+    """비교용 순차 흐름: 파일별 추출 -> JSON 저장 -> 다시 읽어 매핑 -> 업로드 파일"""
+    from extract_real_packing import extract_workbook
+    from product_store import write_products, read_products
+    from mapping_memory import MappingMemory
+    from matching_engine import MatchingEngine
+
+    products = []
+    for path in files:
+        products.extend(add_wholesaler_filename(extract_workbook(path), None, os.path.basename(path)))
+    data_file = os.path.join(tmp, 'extracted_products.json')
+    write_products(data_file, products)
+
+    items = read_products(data_file)
+    service = MappingMemory.from_sqlite(db_path, snapshot=snapshot)
+    results = service.resolve_all(items, MatchingEngine.from_snapshot(snapshot))
+    exported = write_exports(results, 'csv', os.path.join(tmp, 'serial'), now, 1)
+    return items, results, exported
+
+def benchmark(n_files=24, n_skus=100000):
+    """합성 패킹리스트 n_files 개 - 순차 흐름 대비 파이프라인 (추출 캐시 없음)"""
+    import sqlite3
+    from datetime import datetime
+    from matching_engine import make_synthetic_catalog, MatchingEngine
+    from mapping_memory import MappingMemory
+    from catalog_snapshot import load_snapshot
+    from product_loader import _empty_db
+
+    products = make_synthetic_catalog(n_skus)
+    now = datetime(2026, 1, 15, 9, 30, 0)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'catalog.sqlite')
+        _empty_db(db_path)
+        conn = sqlite3.connect(db_path)
+        with conn:
+            conn.execute('CREATE TABLE mappingMemory (mappingKey TEXT PRIMARY KEY, productCode TEXT, '
+                         'fileName TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)')
+            conn.execute('CREATE TABLE ignoredItems (ignoreKey TEXT PRIMARY KEY, timestamp DATETIME)')
+            conn.executemany('INSERT INTO products VALUES (?, ?, ?, ?, ?, ?)', [tuple(p.values()) for p in products])
+        conn.close()
+        snapshot, _ = load_snapshot(db_path, os.path.join(tmp, 'snapshot'))
+
+        files = []
+        for i in range(n_files):
+            path = os.path.join(tmp, f'packing_{i:03d}.xlsx')
+            write_bench_file(path, products, seed=i)
+            files.append(path)
+
+        start = time.perf_counter()
+        serial_items, serial_results, serial_exported = _serial(files, db_path, snapshot, tmp, now)
+        serial_seconds = time.perf_counter() - start
+
+        service = MappingMemory.from_sqlite(db_path, snapshot=snapshot)
+        run = ingest(files, service, MatchingEngine.from_snapshot(snapshot), fmt='csv',
+                     export_dir=os.path.join(tmp, 'pipeline'), now=now)
+
+        def summary(results):
+            return [((r['target'] or {}).get('productCode'), r['status'], r['similarity'], r['remembered'])
+                    for r in results]
+
+        def contents(exported):
+            return [open(f['path'], 'rb').read() for f in exported['files']]
+
+        same = (run['products'] == serial_items and summary(run['results']) == summary(serial_results)
+                and contents(run['exported']) == contents(serial_exported))
+
+    print("=" * 80)
+    print(f"📈 입고 파이프라인 벤치마크 (파일 {n_files}개 x 시트 3개, 제품 {n_skus:,}개, CPU {os.cpu_count()}개)")
+    print("=" * 80)
+    print(f"  순차 흐름 (추출 -> JSON -> 매핑 -> 내보내기): {serial_seconds:6.2f}초")
+    print(f"  파이프라인                                 : {run['seconds']:6.2f}초  "
+          f"({serial_seconds / run['seconds']:.2f}배, 제품 {len(run['products']):,}개)")
+    print_stages(run['stages'])
+    print(f"  결과 일치: {'✅' if same else '❌'}")
+    if os.cpu_count() == 1:
+        print("  (CPU 1개 환경: 작업 프로세스가 겹쳐 돌 수 없어 파일 I/O 겹침만 이득)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='패킹리스트 입고 파이프라인 (추출 + 매핑 + 이지어드민 파일)')
+    parser.add_argument('targets', nargs='+', help='폴더, 파일 또는 glob 패턴')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='작업 프로세스 수 (기본: CPU 수)')
+    parser.add_argument('--db', default=DB_FILE, help='제품 DB (database.sqlite)')
+    parser.add_argument('-o', '--output', default='extracted_products.json',
+                        help='추출 데이터 파일 (.json/.jsonl/.parquet)')
+    parser.add_argument('--csv', action='store_true', help='업로드 파일을 CSV 로')
+    parser.add_argument('--no-cache', action='store_true', help='추출/매핑 캐시 사용 안 함')
+    parser.add_argument('--wholesaler', default=None, help='모든 제품에 지정할 도매인 (기본: 시트명)')
+    parser.add_argument('--queue', type=int, default=DEFAULT_QUEUE_SIZE, help='단계 사이 큐 길이')
+    args = parser.parse_args(argv)
+
+    from batch_extract import collect_files
+    from extraction_cache import ExtractionCache
+    from mapping_cache import CACHE_FILE
+    from mapping_memory import MappingMemory
+    from matching_engine import MatchingEngine
+    from catalog_snapshot import load_snapshot
+    from color_memo import ColorMemo
+    from memory_writer import MappingMemoryWriter, SqliteMemorySink
+
+    files = collect_files(args.targets)
+    if not files:
+        print("❌ 엑셀 파일을 찾을 수 없습니다.")
+        return 1
+
+    print("=" * 80)
+    print(f"📦 입고 파이프라인: {len(files)}개 파일")
+    print("=" * 80)
+
+    writer = MappingMemoryWriter(SqliteMemorySink(args.db))
+    snapshot, _ = load_snapshot(args.db)
+    service = MappingMemory.from_sqlite(args.db, writer, snapshot)
+    memo = ColorMemo.load()
+    engine = MatchingEngine.from_snapshot(snapshot, memo)
+    cache = None if args.no_cache else ExtractionCache()
+
+    run = ingest(files, service, engine, args.wholesaler, args.workers, args.queue, cache,
+                 None if args.no_cache else CACHE_FILE, args.db, args.output, 'csv' if args.csv else 'xlsx')
+    memo.save()
+    writer.close()
+
+    for path, error in run['errors'].items():
+        print(f"  ❌ {os.path.basename(path)}: {error}")
+    counts = {}
+    for r in run['results']:
+        status = 'remembered' if r['remembered'] else r['status']
+        counts[status] = counts.get(status, 0) + 1
+    print(f"\n총 {len(run['products'])}개 제품, 실패 {len(run['errors'])}개 파일, {run['seconds']:.2f}초")
+    print(f"🔗 매핑: {counts}, 새 기억 {len(service.new_memories)}개")
+    print_stages(run['stages'])
+    print(f"💾 데이터가 '{args.output}'에 저장되었습니다.")
+    for f in run['exported']['files']:
+        if f['error']:
+            print(f"❌ {f['wholesaler']}: {f['error']}")
+        else:
+            print(f"📤 {f['path']}: {f['rows']:,}행, 수량 {f['quantity']:,}")
+    if cache is not None:
+        print(f"🗄️  추출 캐시: 워크북 {run['cached_files']}개 적중")
+        cache.close()
+        run['mapping_cache'].print_report()
+    return 0
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench':
+        numbers = [int(a) for a in sys.argv[2:]]
+        benchmark(numbers[0] if numbers else 24, numbers[1] if len(numbers) > 1 else 100000)
+        sys.exit(0)
+    sys.exit(main())
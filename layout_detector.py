@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+패킹리스트 시트 레이아웃 자동 감지
+
+고정 열 번호(품명 11, 칼라 12, 사이즈 14~27, 사이즈 헤더 2행) 대신
+시트 상단의 제한된 영역을 한 번에 문자열 배열로 바꿔 벡터 연산으로 훑고,
+app.js ExcelAnalyzer.detectTableType 과 같은 기준으로 표 형태를 분류한다.
+
+- right     : 오른쪽 표 (8열 이후 '품명') - 품명 | 칼라 | 합계 | 사이즈별 수량 ...
+- left-grid : 왼쪽 표 + 사이즈가 가로로 펼쳐진 형태 (18" 20" ... 또는 S M L)
+- left      : 왼쪽 표 + 사이즈/수량 열이 따로 있는 형태 (행 하나 = 사이즈 하나)
+- unknown   : '품명' 헤더 없음
+
+감지 결과는 (파일, 시트) 단위로 메모해서 같은 시트를 다시 훑지 않는다.
+
+사용법:
+    python layout_detector.py <엑셀 파일> ...   # 시트별 감지 결과 출력
+"""
+
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+from vectorized_extract import size_label
+
+# UTF-8 출력 설정
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+# 감지 영역 (app.js 와 같이 상단 50행)
+WINDOW_ROWS = 50
+WINDOW_COLS = 100
+
+# 오른쪽 표로 판단하는 품명 열 시작 위치 (app.js: idx >= 7)
+RIGHT_TABLE_MIN_COL = 7
+
+COMMON_SIZES = ['XS', 'S', 'M', 'L', 'XL', 'XXL', 'XXXL', 'FREE']
+COLOR_KEYWORDS = ['칼라', '색상', '컬러']
+
+# (절대경로, mtime, 크기, 시트명) -> 레이아웃
+_layout_memo = {}
+
+def _contains(text, keyword):
+    return np.char.find(text, keyword) >= 0
+
+def window_text(df, max_rows=WINDOW_ROWS, max_cols=WINDOW_COLS):
+    """감지 영역을 한 번에 문자열 배열로 변환 (빈 셀은 '')"""
+    values = df.iloc[:max_rows, :max_cols].to_numpy(dtype=object)
+    if values.size == 0:
+        return np.zeros(values.shape, dtype=str)
+    present = pd.notna(values)
+    text = np.where(present, values.astype(str), '')
+    return np.char.strip(text.astype(str))
+
+def size_like_mask(text):
+    """사이즈 헤더로 보이는 셀: 인치(") 포함, 표준 사이즈, 0보다 큰 숫자"""
+    if text.size == 0:
+        return np.zeros(text.shape, dtype=bool)
+    numbers = pd.to_numeric(pd.Series(text.ravel()), errors='coerce').to_numpy().reshape(text.shape)
+    with np.errstate(invalid='ignore'):
+        positive = numbers > 0
+    return _contains(text, '"') | np.isin(np.char.upper(text), COMMON_SIZES) | positive
+
+def classify(text):
+    """app.js detectTableType 과 같은 기준으로 표 형태 분류"""
+    if text.size == 0:
+        return 'unknown'
+
+    name_mask = _contains(text, '품명')
+    if name_mask[:, RIGHT_TABLE_MIN_COL:].any():
+        return 'right'
+
+    left_hits = np.argwhere(name_mask[:, :RIGHT_TABLE_MIN_COL])
+    if len(left_hits) == 0:
+        return 'unknown'
+
+    # 왼쪽 표: 품명 오른쪽 14칸에 인치/표준 사이즈/숫자 2개 이상이 있으면 그리드
+    numbers = pd.to_numeric(pd.Series(text.ravel()), errors='coerce').to_numpy().reshape(text.shape)
+    for row, col in left_hits:
+        right_side = text[row, col + 1:col + 15]
+        right_numbers = numbers[row, col + 1:col + 15]
+        has_inches = _contains(right_side, '"').any()
+        has_standard = np.isin(np.char.upper(right_side), COMMON_SIZES).any()
+        has_many_numbers = np.count_nonzero(~np.isnan(right_numbers)) > 1
+        if has_inches or has_standard or has_many_numbers:
+            return 'left-grid'
+    return 'left'
+
+def _first_col(row_text, keywords, after):
+    """after 보다 오른쪽에서 키워드가 처음 나오는 열 (없으면 None)"""
+    mask = np.zeros(len(row_text), dtype=bool)
+    for keyword in keywords:
+        mask |= _contains(row_text, keyword)
+    mask[:after + 1] = False
+    hits = np.flatnonzero(mask)
+    return int(hits[0]) if len(hits) else None
+
+def _last_col(row_text, keyword, exclude=None):
+    mask = _contains(row_text, keyword)
+    if exclude:
+        mask &= ~_contains(row_text, exclude)
+    hits = np.flatnonzero(mask)
+    return int(hits[-1]) if len(hits) else None
+
+def _size_header(df, text, header_row, after_col, rows):
+    """헤더 행(과 다음 행) 중 사이즈 라벨이 가장 많은 행에서 사이즈 열 찾기"""
+    best_row, best_cols = None, []
+    for row in rows:
+        if row >= text.shape[0]:
+            continue
+        mask = size_like_mask(text[row])
+        mask[:after_col + 1] = False
+        cols = np.flatnonzero(mask).tolist()
+        if len(cols) > len(best_cols):
+            best_row, best_cols = row, cols
+
+    if best_row is None:
+        return None, [], []
+    labels = [size_label(df.iat[best_row, col]) for col in best_cols]
+    return best_row, best_cols, labels
+
+def _right_blocks(df, text):
+    """오른쪽 표 블록 (한 시트에 표가 여러 개 쌓인 경우 모두)"""
+    hits = np.argwhere(_contains(text[:, RIGHT_TABLE_MIN_COL:], '품명'))
+    first_row, first_col = hits[0]
+    product_col = int(first_col) + RIGHT_TABLE_MIN_COL
+
+    # 같은 품명 열에서 반복되는 헤더 행 (3행 이내 연속 헤더는 하나로)
+    column = df.iloc[:, product_col].to_numpy(dtype=object)
+    column_text = np.where(pd.notna(column), column.astype(str), '').astype(str)
+    header_rows = []
+    for row in np.flatnonzero(_contains(column_text, '품명')):
+        if not header_rows or row > header_rows[-1] + 3:
+            header_rows.append(int(row))
+
+    blocks = []
+    for idx, header_row in enumerate(header_rows):
+        header_text = window_text(df.iloc[header_row:header_row + 2], max_rows=2)
+        color_col = _first_col(header_text[0], COLOR_KEYWORDS, product_col)
+        after = color_col if color_col is not None else product_col
+        size_row, size_cols, sizes = _size_header(df, header_text, 0, after, [0, 1])
+        if not size_cols:
+            continue
+        blocks.append({
+            'header_row': header_row,
+            'product_col': product_col,
+            'color_col': color_col,
+            'size_row': header_row + size_row,
+            'size_cols': size_cols,
+            'sizes': sizes,
+            'data_start_row': header_row + size_row + 1,
+            'data_end_row': header_rows[idx + 1] if idx + 1 < len(header_rows) else None,
+        })
+    return blocks
+
+def _left_header(text):
+    """왼쪽 표 헤더 행 / 품명 열 (앞 5열 안의 '품명')"""
+    hits = np.argwhere(_contains(text[:20, :5], '품명'))
+    if len(hits) == 0:
+        return None, None
+    return int(hits[0][0]), int(hits[0][1])
+
+def _left_blocks(df, text):
+    header_row, product_col = _left_header(text)
+    if header_row is None:
+        return []
+    row_text = text[header_row]
+    color_col = _first_col(row_text, COLOR_KEYWORDS, product_col)
+    size_col = _first_col(row_text, ['사이즈'], product_col)
+
+    # 수량 열: '총수량' 우선, 없으면 '포장수량'이 아닌 '수량' (뒤에서부터)
+    qty_col = _last_col(row_text, '총수량')
+    if qty_col is None:
+        qty_col = _last_col(row_text, '수량', exclude='포장')
+
+    if size_col is None or qty_col is None:
+        return []
+    return [{
+        'header_row': header_row,
+        'product_col': product_col,
+        'color_col': color_col,
+        'size_col': size_col,
+        'qty_col': qty_col,
+        'data_start_row': header_row + 1,
+        'data_end_row': None,
+    }]
+
+def _left_grid_blocks(df, text):
+    hits = np.argwhere(_contains(text[:20, :6], '품명'))
+    if len(hits) == 0:
+        return []
+    header_row, product_col = int(hits[0][0]), int(hits[0][1])
+    color_col = _first_col(text[header_row], COLOR_KEYWORDS, product_col)
+    after = max(product_col, color_col if color_col is not None else -1)
+    size_row, size_cols, sizes = _size_header(df, text, header_row, after, [header_row])
+    if not size_cols:
+        return []
+    return [{
+        'header_row': header_row,
+        'product_col': product_col,
+        'color_col': color_col,
+        'size_row': size_row,
+        'size_cols': size_cols,
+        'sizes': sizes,
+        'data_start_row': header_row + 1,
+        'data_end_row': None,
+    }]
+
+def detect_layout(df, max_rows=WINDOW_ROWS, max_cols=WINDOW_COLS):
+    """시트 레이아웃 감지
+
+    반환: {'table_type': 'right'|'left-grid'|'left'|'unknown', 'blocks': [...]}
+    블록: header_row, product_col, color_col, data_start_row, data_end_row 와
+          size_cols/sizes (right, left-grid) 또는 size_col/qty_col (left)
+    """
+    text = window_text(df, max_rows, max_cols)
+    table_type = classify(text)
+
+    if table_type == 'right':
+        blocks = _right_blocks(df, text)
+    elif table_type == 'left-grid':
+        blocks = _left_grid_blocks(df, text)
+    elif table_type == 'left':
+        blocks = _left_blocks(df, text)
+    else:
+        blocks = []
+
+    return {'table_type': table_type, 'blocks': blocks}
+
+def get_layout(df, file_path=None, sheet_name=None):
+    """(파일, 시트) 단위로 메모된 레이아웃 감지"""
+    if file_path is None:
+        return detect_layout(df)
+
+    stat = os.stat(file_path)
+    key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size, sheet_name)
+    if key not in _layout_memo:
+        _layout_memo[key] = detect_layout(df)
+    return _layout_memo[key]
+
+def describe_layout(layout):
+    """레이아웃을 사람이 읽을 수 있는 문자열 목록으로"""
+    lines = [f"표 형태: {layout['table_type']}"]
+    for block in layout['blocks']:
+        color = block['color_col'] + 1 if block['color_col'] is not None else '-'
+        line = (f"  헤더 {block['header_row'] + 1}행, 품명 열 {block['product_col'] + 1}, 칼라 열 {color}, "
+                f"데이터 {block['data_start_row'] + 1}행부터")
+        if 'size_cols' in block:
+            line += f", 사이즈 {block['sizes']} (열 {block['size_cols'][0] + 1}~{block['size_cols'][-1] + 1})"
+        else:
+            line += f", 사이즈 열 {block['size_col'] + 1}, 수량 열 {block['qty_col'] + 1}"
+        lines.append(line)
+    return lines
+
+if __name__ == '__main__':
+    from workbook_loader import open_workbook
+
+    for file_path in sys.argv[1:]:
+        print("=" * 80)
+        print(f"📐 {file_path}")
+        print("=" * 80)
+        with open_workbook(file_path, track_memory=False) as workbook:
+            for idx, sheet_name, df in workbook.sheets():
+                print(f"\n시트 {idx + 1}: {sheet_name}")
+                for line in describe_layout(get_layout(df, file_path, sheet_name)):
+                    print(f"  {line}")
+        print()
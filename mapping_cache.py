@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""
+자동 매칭 결과 캐시 - 같은 분석 데이터를 다시 매핑할 때 바뀐 키만 다시 계산
+
+수동 수정이나 제외 후 자동 매핑을 다시 돌리면 모든 줄을 처음부터 점수 계산한다.
+매칭 결과는 mappingKey('도매인|상품명|칼라|첫 사이즈')와 그 도매인의 제품에만
+달려 있으므로 (mappingKey, 카탈로그 버전, 점수 계산 버전)으로 저장해 둔다.
+
+- 같은 카탈로그 버전                  : 그대로 적중
+- 카탈로그 버전이 올랐을 때           : productChanges(delta_sync.py)에서 그 사이 바뀐
+                                         도매인 / 상품코드를 보고, 관련 없는 키는 적중
+                                         (버전만 갱신), 관련 있는 키는 다시 계산
+- 점수 계산 버전(matching_engine.SCORER)이 다르면 미적중
+- 버전을 올리지 않은 제품 변경(제품 수 / 최대 rowid 변화)은 전체 무효화
+
+매핑 기억/제외 목록은 매번 먼저 조회하므로(mapping_memory.py)
+캐시는 그 뒤에 남은 자동 매칭 대상에만 쓰인다.
+
+저장소: SQLite 파일 1개 (.mapping_cache.sqlite)
+
+사용법:
+    python mapping_cache.py            # 캐시 현황
+    python mapping_cache.py clear      # 캐시 비우기
+    python mapping_cache.py bench [SKU 수] [항목 수]   # 첫 실행 / 재실행 / 한 도매인 변경 후 재실행
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import tempfile
+
+from matching_engine import DB_FILE, SCORER
+from catalog_snapshot import catalog_stamp
+
+# UTF-8 출력 설정
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+CACHE_FILE = '.mapping_cache.sqlite'
+
+class MappingCache:
+    """(mappingKey, 카탈로그 버전, 점수 계산 버전) 자동 매칭 결과 캐시"""
+
+    def __init__(self, path=CACHE_FILE, db_path=DB_FILE, scorer=SCORER):
+        self.path = path
+        self.db_path = db_path
+        self.scorer = scorer
+        self.hits = 0
+        self.misses = 0       # 처음 보는 키 / 점수 계산 버전 다름
+        self.invalidated = 0  # 카탈로그 변경으로 다시 계산
+        self._changes = {}    # 저장 당시 버전 -> (바뀐 도매인, 바뀐 상품코드) | None
+
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS results (
+                mappingKey TEXT PRIMARY KEY,
+                wholesaler TEXT,
+                catalogVersion INTEGER,
+                scorer TEXT,
+                productCode TEXT,
+                status TEXT,
+                similarity REAL
+            )
+        ''')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+        self.conn.commit()
+
+        self.stamp = catalog_stamp(db_path)
+        self.version = self.stamp[0]
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'stamp'").fetchone()
+        previous = json.loads(row[0]) if row else None
+        if previous is not None and previous[0] == self.version and previous != self.stamp:
+            # 카탈로그 버전 없이 제품이 바뀜 -> 어느 도매인인지 알 수 없으므로 전부 무효화
+            self.conn.execute('DELETE FROM results')
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('stamp', ?)", (json.dumps(self.stamp),))
+        self.conn.commit()
+
+    def _changed_since(self, version):
+        """version 이후 바뀐 (도매인 집합, 상품코드 집합) - 알 수 없으면 None"""
+        if version not in self._changes:
+            if version > self.version:
+                self._changes[version] = None
+            else:
+                conn = sqlite3.connect(self.db_path)
+                try:
+                    rows = conn.execute('SELECT wholesaler, productCode FROM productChanges WHERE version > ?',
+                                        (version,)).fetchall()
+                    self._changes[version] = ({w for w, _ in rows}, {c for _, c in rows if c is not None})
+                except sqlite3.OperationalError:
+                    self._changes[version] = None
+                finally:
+                    conn.close()
+        return self._changes[version]
+
+    def get_many(self, keys):
+        """[(mappingKey, 도매인)] -> {mappingKey: (productCode | None, 상태, 유사도)} (유효한 것만)"""
+        found = {}
+        refreshed = []
+        for i in range(0, len(keys), 500):
+            part = [key for key, _ in keys[i:i + 500]]
+            found.update((row[0], row[1:]) for row in self.conn.execute(
+                f"SELECT mappingKey, wholesaler, catalogVersion, scorer, productCode, status, similarity "
+                f"FROM results WHERE mappingKey IN ({', '.join('?' * len(part))})", part
+            ))
+
+        results = {}
+        decided = {}  # mappingKey -> 'hit' | 'miss' | 'invalidated' (같은 키가 여러 줄이어도 한 번만 판정)
+        for key, wholesaler in keys:
+            verdict = decided.get(key)
+            if verdict is None:
+                row = found.get(key)
+                if row is None or row[2] != self.scorer or row[0] != wholesaler:
+                    verdict = 'miss'
+                else:
+                    _, version, _, code, status, similarity = row
+                    verdict = 'hit'
+                    if version != self.version:
+                        changed = self._changed_since(version)
+                        if changed is None or wholesaler in changed[0] or code in changed[1]:
+                            verdict = 'invalidated'
+                        else:
+                            refreshed.append(key)
+                    if verdict == 'hit':
+                        results[key] = (code, status, similarity)
+                decided[key] = verdict
+            if verdict == 'hit':
+                self.hits += 1
+            elif verdict == 'miss':
+                self.misses += 1
+            else:
+                self.invalidated += 1
+
+        if refreshed:
+            self.conn.executemany('UPDATE results SET catalogVersion = ? WHERE mappingKey = ?',
+                                  [(self.version, key) for key in refreshed])
+            self.conn.commit()
+        return results
+
+    def put_many(self, rows):
+        """[(mappingKey, 도매인, productCode | None, 상태, 유사도)] 를 현재 버전으로 저장"""
+        self.conn.executemany(
+            'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)',
+            [(key, wholesaler, self.version, self.scorer, code, status, similarity)
+             for key, wholesaler, code, status, similarity in rows]
+        )
+        self.conn.commit()
+
+    def hit_rate(self):
+        total = self.hits + self.misses + self.invalidated
+        return self.hits / total * 100 if total else 0
+
+    def entry_count(self):
+        return self.conn.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def clear(self):
+        self.conn.execute('DELETE FROM results')
+        self.conn.commit()
+        self.conn.execute('VACUUM')
+
+    def print_report(self):
+        print(f"♻️  매핑 캐시: 적중 {self.hits:,}, 새 키 {self.misses:,}, 카탈로그 변경 {self.invalidated:,} "
+              f"(적중률 {self.hit_rate():.0f}%, 카탈로그 버전 {self.version})")
+
+    def close(self):
+        self.conn.close()
+
+def benchmark(n_skus=100000, n_items=5000):
+    """첫 실행 / 그대로 재실행 / 한 도매인 상품 파일 변경 후 재실행"""
+    import csv
+    from matching_engine import make_synthetic_catalog, make_synthetic_items
+    from mapping_memory import MappingMemory
+    from catalog_snapshot import load_snapshot
+    from product_loader import _empty_db
+    from delta_sync import sync_products_file
+
+    products = make_synthetic_catalog(n_skus)
+    items = make_synthetic_items(products, n_items)
+    changed_wholesaler = products[0]['wholesaler']
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'catalog.sqlite')
+        _empty_db(db_path)
+        conn = sqlite3.connect(db_path)
+        with conn:
+            conn.execute('CREATE TABLE mappingMemory (mappingKey TEXT PRIMARY KEY, productCode TEXT, '
+                         'fileName TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)')
+            conn.execute('CREATE TABLE ignoredItems (ignoreKey TEXT PRIMARY KEY, timestamp DATETIME)')
+            conn.executemany('INSERT INTO products VALUES (?, ?, ?, ?, ?, ?)',
+                             [tuple(p.values()) for p in products])
+        conn.close()
+
+        def run(label, cache):
+            snapshot, _ = load_snapshot(db_path, os.path.join(tmp, 'snapshot'))
+            service = MappingMemory.from_sqlite(db_path, snapshot=snapshot)
+            start = time.perf_counter()
+            results = service.resolve_all(items, cache=cache)
+            elapsed = time.perf_counter() - start
+            rows.append((label, elapsed, cache))
+            return [((r['target'] or {}).get('productCode'), r['status'], r['similarity']) for r in results]
+
+        rows = []
+        cache_path = os.path.join(tmp, 'mapping_cache.sqlite')
+        first = run('첫 실행', MappingCache(cache_path, db_path))
+        again = run('재실행 (변경 없음)', MappingCache(cache_path, db_path))
+
+        # 한 도매인 상품 파일에서 재고 하나 바꿔 변경분 동기화 -> 카탈로그 버전 +1
+        export = os.path.join(tmp, 'export.csv')
+        with open(export, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['상품코드', '상품명', '옵션', '바코드', '가용재고'])
+            for i, p in enumerate(p for p in products if p['wholesaler'] == changed_wholesaler):
+                writer.writerow([p['productCode'], p['productName'], p['option'], p['barcode'],
+                                 p['stock'] + (1 if i == 0 else 0)])
+        sync_products_file(export, changed_wholesaler, db_path)
+        changed = run('도매인 1개 변경 후 재실행', MappingCache(cache_path, db_path))
+        uncached = run('캐시 없이 재실행', None)
+
+    print("=" * 80)
+    print(f"📈 매핑 캐시 벤치마크 (제품 {n_skus:,}개, 항목 {n_items:,}개)")
+    print("=" * 80)
+    for label, elapsed, cache in rows:
+        rate = f"적중률 {cache.hit_rate():5.1f}% (적중 {cache.hits:,}, 새 키 {cache.misses:,}, " \
+               f"변경 {cache.invalidated:,})" if cache is not None else ''
+        print(f"  {label:<22}: {elapsed:6.2f}초  {rate}")
+    same = first == again == changed == uncached
+    print(f"  결과 일치             : {'✅' if same else '❌'}")
+
+if __name__ == '__main__':
+    command = sys.argv[1] if len(sys.argv) > 1 else 'status'
+    if command == 'bench':
+        numbers = [int(a) for a in sys.argv[2:]]
+        benchmark(numbers[0] if numbers else 100000, numbers[1] if len(numbers) > 1 else 5000)
+    else:
+        cache = MappingCache()
+        if command == 'clear':
+            cache.clear()
+            print("✅ 매핑 캐시를 비웠습니다.")
+        else:
+            print(f"♻️  {cache.path}: {cache.entry_count():,}개 키, 카탈로그 버전 {cache.version}")
+        cache.close()
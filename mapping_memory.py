@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+"""
+매핑 기억 / 제외 목록 조회 서비스
+
+app.js startAutoMapping 은 패킹리스트 한 줄마다
+- ignoredList.some(...)          : 제외 목록 전체 순회
+- memoryList.find(...)           : 매핑 기억 전체 순회
+- dbProducts.find(normalizeCode) : 제품 DB 전체 순회 + 매번 접두어 제거
+를 한다. 여기서는 database.sqlite 의 mappingMemory / ignoredItems / products 를
+한 번 읽어 색인을 만든다.
+
+- 제외 목록     : set(ignoreKey)
+- 매핑 기억     : {mappingKey: productCode} (같은 키는 첫 행 - memoryList.find 와 동일)
+- 제품 코드     : {접두어([...]) 제거한 코드: 제품} (같은 코드는 DB 순서상 첫 제품)
+                  카탈로그 스냅샷(catalog_snapshot.py)이면 스냅샷의 정렬 색인을 그대로 사용
+
+mappingKey = '도매인|상품명|칼라|첫 사이즈' (app.js 와 동일)
+
+resolve_all 은 한 번의 호출로 입고 건 전체 키를 조회하고,
+기억에 없는 항목만 매칭 엔진(matching_engine.py)으로 넘긴다.
+매핑 캐시(mapping_cache.py)를 주면 그중 바뀌지 않은 키는 저장된 결과를 쓴다.
+새 기억은 writer(memory_writer.MappingMemoryWriter)가 있으면 모아서 일괄 저장한다.
+
+사용법:
+    python mapping_memory.py resolve [추출 데이터] [database.sqlite]   # 기억/제외/자동 매칭
+    python mapping_memory.py bench [기억 수] [제품 수]                   # 전체 순회 대비 조회 시간
+"""
+
+import re
+import sys
+import time
+import random
+import sqlite3
+
+from matching_engine import DB_FILE, MatchingEngine, source_fields, load_products, make_synthetic_catalog, \
+    make_synthetic_items
+
+# UTF-8 출력 설정
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+_CODE_PREFIX = re.compile(r'^\[.*?\]')
+
+def normalize_code(code):
+    """'[A]P0001' -> 'P0001' (app.js normalizeCode)"""
+    return _CODE_PREFIX.sub('', str(code or ''), count=1)
+
+def mapping_key(item):
+    """'도매인|상품명|칼라|첫 사이즈'"""
+    wholesaler, name, color, first_size = source_fields(item)
+    return f'{wholesaler}|{name}|{color}|{first_size}'
+
+def item_file_name(item):
+    return item.get('fileName', item.get('file_name', ''))
+
+class MappingMemory:
+    """매핑 기억 / 제외 목록 / 제품 코드 색인"""
+
+    def __init__(self, memory_rows, ignore_keys, products, writer=None):
+        """memory_rows: (mappingKey, productCode) 목록, ignore_keys: ignoreKey 목록, products: 제품 DB (DB 순서)
+        writer: 새 기억을 저장할 MappingMemoryWriter (없으면 메모리에만 기억)
+        """
+        start = time.perf_counter()
+        self.products = products
+        self.writer = writer
+        self.memory = {}
+        for key, code in memory_rows:
+            self.memory.setdefault(key, code)
+        self.ignored = set(ignore_keys)
+        if hasattr(products, 'find_clean_code'):
+            self.by_clean_code = None
+            self._find_product = products.find_clean_code
+        else:
+            self.by_clean_code = {}
+            for product in products:
+                self.by_clean_code.setdefault(normalize_code(product['productCode']), product)
+            self._find_product = self.by_clean_code.get
+
+        self._by_code = None
+        self.new_memories = []  # 이번 실행에서 새로 기억한 (mappingKey, productCode, fileName)
+        self.index_seconds = time.perf_counter() - start
+        self.load_seconds = self.index_seconds
+        self.lookups = 0
+        self.lookup_seconds = 0.0
+
+    @classmethod
+    def from_sqlite(cls, db_path=DB_FILE, writer=None, snapshot=None):
+        """snapshot: 카탈로그 스냅샷 - 주면 제품 DB 를 읽지 않고 스냅샷을 사용"""
+        start = time.perf_counter()
+        conn = sqlite3.connect(db_path)
+        try:
+            memory_rows = conn.execute('SELECT mappingKey, productCode FROM mappingMemory').fetchall()
+            ignore_keys = [row[0] for row in conn.execute('SELECT ignoreKey FROM ignoredItems')]
+        finally:
+            conn.close()
+        products = snapshot if snapshot is not None else load_products(db_path)
+        service = cls(memory_rows, ignore_keys, products, writer)
+        service.load_seconds = time.perf_counter() - start
+        return service
+
+    def lookup(self, key):
+        """키 하나 조회 -> ('ignored', None) | ('remembered', 제품) | (None, None)"""
+        if key in self.ignored:
+            return 'ignored', None
+        code = self.memory.get(key)
+        if code is not None:
+            product = self._find_product(normalize_code(code))
+            if product is not None:
+                return 'remembered', product
+        return None, None
+
+    def lookup_all(self, keys):
+        """키 목록을 한 번에 조회 (조회 시간 누적)"""
+        start = time.perf_counter()
+        results = [self.lookup(key) for key in keys]
+        self.lookup_seconds += time.perf_counter() - start
+        self.lookups += len(keys)
+        return results
+
+    def remember(self, key, product_code, file_name=''):
+        """매핑 기억 추가 (접두어 제거 코드로 저장)"""
+        clean = normalize_code(product_code)
+        self.memory[key] = clean
+        self.new_memories.append((key, clean, file_name))
+        if self.writer is not None:
+            self.writer.put(key, clean, file_name)
+
+    def _product_by_code(self, code, wholesaler):
+        """도매인 안에서 상품코드로 제품 찾기 (캐시된 매칭 결과 복원용)"""
+        if hasattr(self.products, 'find_code'):
+            return self.products.find_code(code, wholesaler)
+        if self._by_code is None:
+            self._by_code = {}
+            for product in self.products:
+                self._by_code.setdefault((product['wholesaler'], product['productCode']), product)
+        return self._by_code.get((wholesaler, code))
+
+    def forget(self, key):
+        self.memory.pop(key, None)
+
+    def ignore(self, key):
+        self.ignored.add(key)
+
+    def make_engine(self):
+        """제품 DB(또는 카탈로그 스냅샷)로 자동 매칭 엔진 생성"""
+        if hasattr(self.products, 'rows_by_wholesaler'):
+            return MatchingEngine.from_snapshot(self.products)
+        return MatchingEngine(self.products)
+
+    def auto_match(self, items, engine=None, cache=None, keys=None, found=None):
+        """기억/제외에 없는 항목만 자동 매칭 (캐시 -> 엔진)
+
+        반환: {항목 위치: {'product', 'status', 'similarity'}}
+        """
+        keys = keys if keys is not None else [mapping_key(item) for item in items]
+        found = found if found is not None else self.lookup_all(keys)
+
+        pending = [i for i, (status, _) in enumerate(found) if status is None]
+        matched = {}
+        if pending and cache is not None:
+            wholesalers = {i: source_fields(items[i])[0].strip() for i in pending}
+            cached = cache.get_many([(keys[i], wholesalers[i]) for i in pending])
+            for i in pending:
+                hit = cached.get(keys[i])
+                if hit is None:
+                    continue
+                code, status, similarity = hit
+                product = self._product_by_code(code, wholesalers[i]) if code is not None else None
+                if code is None or product is not None:
+                    matched[i] = {'product': product, 'status': status, 'similarity': similarity}
+            pending = [i for i in pending if i not in matched]
+        if pending:
+            engine = engine or self.make_engine()
+            scored = engine.match_all([items[i] for i in pending])
+            matched.update(zip(pending, scored))
+            if cache is not None:
+                cache.put_many([(keys[i], wholesalers[i], (best['product'] or {}).get('productCode'),
+                                 best['status'], best['similarity']) for i, best in zip(pending, scored)])
+        return matched
+
+    def resolve_all(self, items, engine=None, cache=None, matched=None):
+        """입고 건 전체 매핑 - 제외 / 기억 / 자동 매칭 (app.js startAutoMapping 과 같은 결과)
+
+        cache: MappingCache (mapping_cache.py) - 주면 바뀌지 않은 키는 저장된 자동 매칭 결과 사용
+        matched: 미리 계산한 auto_match 결과 (항목 위치 기준) - 주면 자동 매칭을 다시 하지 않음
+        반환: [{'source', 'target', 'status', 'similarity', 'mapping_key', 'remembered'}]
+        """
+        keys = [mapping_key(item) for item in items]
+        found = self.lookup_all(keys)
+        if matched is None:
+            matched = self.auto_match(items, engine, cache, keys, found)
+        results = []
+        for i, (item, key, (status, product)) in enumerate(zip(items, keys, found)):
+            if status == 'ignored':
+                result = {'source': item, 'target': None, 'status': 'ignored', 'similarity': 0, 'remembered': False}
+            elif status == 'remembered':
+                result = {'source': item, 'target': product, 'status': 'success', 'similarity': 100, 'remembered': True}
+            else:
+                best = matched[i]
+                result = {'source': item, 'target': best['product'], 'status': best['status'],
+                          'similarity': best['similarity'], 'remembered': False}
+                # 자동 매칭 성공은 기억에 추가 (같은 입고 건의 다음 줄부터 바로 적용되지는 않음 - app.js 와 동일)
+                if best['status'] == 'success' and best['product'] is not None:
+                    self.remember(key, best['product']['productCode'], item_file_name(item))
+            result['mapping_key'] = key
+            results.append(result)
+        return results
+
+    def print_report(self):
+        per_lookup = self.lookup_seconds / self.lookups * 1e6 if self.lookups else 0
+        print(f"🧠 매핑 기억 {len(self.memory):,}개 / 제외 {len(self.ignored):,}개 / 제품 {len(self.products):,}개")
+        print(f"   로드 {self.load_seconds * 1000:.1f}ms (색인 {self.index_seconds * 1000:.1f}ms), "
+              f"조회 {self.lookups:,}회 평균 {per_lookup:.2f}µs")
+
+def _linear_lookup(key, memory_list, ignored_list, products):
+    """app.js 의 전체 순회 조회 (벤치마크 비교용)"""
+    if any(ig['ignoreKey'] == key for ig in ignored_list):
+        return 'ignored', None
+    remembered = next((m for m in memory_list if m['mappingKey'] == key), None)
+    if remembered:
+        target = normalize_code(remembered['productCode'])
+        product = next((p for p in products if normalize_code(p['productCode']) == target), None)
+        if product:
+            return 'remembered', product
+    return None, None
+
+def benchmark(n_memory=20000, n_skus=100000, n_items=2000, seed=0):
+    """합성 데이터로 전체 순회 대비 색인 조회 시간 측정"""
+    rng = random.Random(seed)
+    products = make_synthetic_catalog(n_skus)
+    for product in products:
+        if rng.random() < 0.3:
+            product['productCode'] = f"[{product['wholesaler']}]{product['productCode']}"
+    items = make_synthetic_items(products, max(n_memory, n_items), seed=seed + 1)
+
+    memory_rows = [(mapping_key(item), normalize_code(products[rng.randrange(n_skus)]['productCode']))
+                   for item in items[:n_memory]]
+    ignore_keys = [key for key, _ in memory_rows[::10]]
+    # 입고 건: 절반은 기억/제외에 있는 키, 절반은 새 항목
+    batch = rng.sample(items[:n_memory], n_items // 2) + make_synthetic_items(products, n_items // 2, seed=seed + 2)
+
+    service = MappingMemory(memory_rows, ignore_keys, products)
+    keys = [mapping_key(item) for item in batch]
+    indexed = service.lookup_all(keys)
+
+    memory_list = [{'mappingKey': k, 'productCode': c} for k, c in memory_rows]
+    ignored_list = [{'ignoreKey': k} for k in ignore_keys]
+    sample = max(5, min(len(keys), 200000000 // (n_skus + n_memory) // 100))
+    start = time.perf_counter()
+    linear = [_linear_lookup(key, memory_list, ignored_list, products) for key in keys[:sample]]
+    linear_per_lookup = (time.perf_counter() - start) / sample
+
+    same = all(a[0] == b[0] and a[1] is b[1] for a, b in zip(linear, indexed))
+    per_lookup = service.lookup_seconds / service.lookups
+
+    print("=" * 80)
+    print(f"📈 매핑 기억 조회 벤치마크 (기억 {n_memory:,}개, 제품 {n_skus:,}개, 입고 {len(keys):,}건)")
+    print("=" * 80)
+    print(f"  색인 생성      : {service.index_seconds * 1000:9.1f}ms")
+    print(f"  전체 순회 조회 : 건당 {linear_per_lookup * 1e6:12,.1f}µs  (표본 {sample}건)")
+    print(f"  색인 조회      : 건당 {per_lookup * 1e6:12,.2f}µs  ({linear_per_lookup / per_lookup:,.0f}배)")
+    print(f"  결과 일치      : {'✅' if same else '❌'}")
+
+def resolve_extracted(data_file=None, db_path=DB_FILE):
+    """추출 데이터 전체를 기억/제외/자동 매칭으로 처리하고 상태별 건수 출력"""
+    from product_store import read_products, find_data_file
+    from color_memo import ColorMemo
+    from catalog_snapshot import load_snapshot
+    from memory_writer import MappingMemoryWriter, SqliteMemorySink
+    from mapping_cache import MappingCache
+
+    items = read_products(data_file or find_data_file())
+    writer = MappingMemoryWriter(SqliteMemorySink(db_path))
+    snapshot, _ = load_snapshot(db_path)
+    service = MappingMemory.from_sqlite(db_path, writer, snapshot)
+    memo = ColorMemo.load()
+    engine = MatchingEngine.from_snapshot(snapshot, memo)
+    cache = MappingCache(db_path=db_path)
+
+    start = time.perf_counter()
+    results = service.resolve_all(items, engine, cache)
+    elapsed = time.perf_counter() - start
+    memo.save()
+    writer.close()
+
+    counts = {}
+    for r in results:
+        status = 'remembered' if r['remembered'] else r['status']
+        counts[status] = counts.get(status, 0) + 1
+    print(f"🔗 {len(items)}개 항목 매핑 ({elapsed:.2f}초): {counts}, 새 기억 {len(service.new_memories)}개")
+    service.print_report()
+    writer.print_report()
+    cache.print_report()
+    cache.close()
+    return results
+
+if __name__ == '__main__':
+    command = sys.argv[1] if len(sys.argv) > 1 else 'resolve'
+    args = sys.argv[2:]
+    if command == 'bench':
+        benchmark(int(args[0]) if args else 20000, int(args[1]) if len(args) > 1 else 100000)
+    else:
+        resolve_extracted(args[0] if args else None, args[1] if len(args) > 1 else DB_FILE)
@@ -0,0 +1,463 @@
+# -*- coding: utf-8 -*-
+"""
+패킹리스트 항목 -> 제품 DB 자동 매칭 엔진
+
+app.js MappingManager.findBestMatch 와 같은 판정(success / warning / danger)을
+Python 으로 옮기고, 제품 DB 를 한 번만 정규화해서 블록 색인을 만든다.
+
+- 블록: 도매인(정확히 일치) 안에서
+  · 정규화한 전체 상품명 / 순수 상품명('-' 뒤 마지막 부분) 일치
+  · 순수 상품명이 검색어에 포함 (검색어의 부분 문자열로 조회)
+  · 검색어가 순수 상품명에 포함 (순수 상품명 2-gram 색인으로 후보 조회)
+- 점수 계산은 블록 후보에만, DB 원래 순서대로 수행하므로
+  전체 순회(findBestMatch)와 결과가 같다.
+- DB 옵션은 한 번만 사이즈 토큰으로 나눠 두고(option_tokenizer.py)
+  사이즈 일치는 정규식 대신 집합 조회로 확인한다.
+- color_memo 를 주면 칼라/옵션 유사도와 정밀 일치 판정을 저장된 행렬에서 꺼낸다
+  (color_memo.py, 매칭 실행 후 .color_memo.npz 에 저장).
+- from_snapshot 은 카탈로그 스냅샷(catalog_snapshot.py)을 그대로 쓰고
+  항목에 나온 도매인 블록만 처음 조회할 때 만든다.
+
+사용법:
+    python matching_engine.py match [추출 데이터] [database.sqlite]   # 추출 결과 매칭 (스냅샷, 칼라 메모 사용)
+    python matching_engine.py bench [SKU 수 ...]                       # 합성 카탈로그 벤치마크
+"""
+
+import re
+import sys
+import time
+import random
+import sqlite3
+from functools import lru_cache
+
+from similarity import calculate_similarity, SimilarityScorer
+from option_tokenizer import tokenize, can_use_tokens, load_size_tokens
+
+# UTF-8 출력 설정
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+DB_FILE = 'database.sqlite'
+
+# 판정 규칙/점수 계산이 바뀌면 올려서 저장된 매핑 결과(mapping_cache.py)를 무효화
+SCORER_VERSION = 1
+SCORER = f'find_best_match:{SCORER_VERSION}'
+
+# 진핑크 / 핑크 구분에 쓰는 색상 접두어 (app.js 와 동일)
+COLOR_PREFIXES = ['진', '연', '딥', '라이트', '다크', '핫', '배색', '형광']
+
+_WHITESPACE = re.compile(r'\s')
+
+def normalize(text):
+    """공백 제거 + 옐러우 -> 옐로우 + 소문자"""
+    return _WHITESPACE.sub('', str(text or '')).replace('옐러우', '옐로우').lower()
+
+def pure_name(full_name):
+    """'젤리-루비하트' -> '루비하트' (하이픈 기준 마지막 요소)"""
+    return full_name.split('-')[-1].strip() if '-' in full_name else full_name
+
+def source_fields(item):
+    """매핑 항목(app.js 형식 또는 extracted_products 형식)에서 (도매인, 상품명, 칼라, 첫 사이즈)"""
+    name = item.get('productName', item.get('product_name', ''))
+    quantities = item.get('quantities') or {}
+    first_size = next(iter(quantities), '')
+    return item.get('wholesaler', '-'), name, item.get('color', ''), first_size
+
+@lru_cache(maxsize=1024)
+def size_pattern(size_norm):
+    """사이즈가 구분자(괄호, 콜론, 쉼표, 공백, /) 사이에 독립적으로 있는지 확인하는 정규식"""
+    try:
+        return re.compile(r'(^|[:\(\s,\/])' + size_norm + r'([:\)\s,\/]|$)', re.IGNORECASE)
+    except re.error:
+        return re.compile(r'(^|[:\(\s,\/])' + re.escape(size_norm) + r'([:\)\s,\/]|$)', re.IGNORECASE)
+
+def is_size_match(size_norm, option_norm):
+    if not size_norm:
+        return False
+    return size_pattern(size_norm).search(option_norm) is not None
+
+def is_precise_color(color_norm, option_norm):
+    """옵션에 칼라가 포함되고, 핑크 vs 진핑크 처럼 접두어만 다른 경우는 제외"""
+    is_match = bool(color_norm) and color_norm in option_norm
+    precise = is_match
+    if is_match and color_norm != option_norm:
+        source_basic = not any(color_norm.startswith(p) for p in COLOR_PREFIXES)
+        target_extended = any((p + color_norm) in option_norm for p in COLOR_PREFIXES)
+
+        # 1. 소스는 단순(핑크)인데 타겟이 상세(진핑크)인 경우 방지
+        if source_basic and target_extended and len(color_norm) < len(option_norm):
+            precise = False
+        # 2. 소스는 상세(진핑크)인데 타겟이 단순(핑크)인 경우도 방지
+        if not source_basic and not option_norm.startswith(color_norm) and len(color_norm) > len(option_norm):
+            precise = False
+    return precise
+
+def _danger():
+    return {'product': None, 'status': 'danger', 'similarity': 0}
+
+def find_best_match_naive(source, db_list):
+    """app.js findBestMatch 를 그대로 옮긴 전체 순회 버전 (검증/벤치마크용)"""
+    wholesaler, name, color, first_size = source_fields(source)
+    s_name_norm = normalize(name.strip())
+    s_color_norm = normalize(color.strip())
+    s_wholesaler = wholesaler.strip()
+    s_size = normalize(first_size)
+
+    best = _danger()
+    for db in db_list:
+        # 1. 도매인 매칭 (100% 철자 일치 필수)
+        if db['wholesaler'] != s_wholesaler:
+            continue
+
+        db_full_name = db['productName'] or ''
+        db_pure_name = pure_name(db_full_name)
+        db_option_norm = normalize(db.get('option') or db.get('optionName') or '')
+
+        # 2. 완전 일치: 상품명 일치 + 옵션에 칼라/사이즈 포함
+        name_exact = normalize(db_full_name) == s_name_norm or normalize(db_pure_name) == s_name_norm
+        size_match = is_size_match(s_size, db_option_norm)
+        if name_exact and is_precise_color(s_color_norm, db_option_norm) and size_match:
+            return {'product': db, 'status': 'success', 'similarity': 100}
+
+        # 3. 부분 일치
+        pure_norm = normalize(db_pure_name)
+        if name_exact or pure_norm in s_name_norm or s_name_norm in pure_norm:
+            color_sim = calculate_similarity(s_color_norm, db_option_norm)
+            total_sim = color_sim * 0.7 + (30 if size_match else 0)
+            if total_sim > 60:
+                status = 'success' if color_sim > 80 and size_match else 'warning'
+                if total_sim > best['similarity']:
+                    best = {'product': db, 'status': status, 'similarity': total_sim}
+
+    return best
+
+def _grams2(text):
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+class _WholesalerBlock:
+    """도매인 하나의 상품명 색인"""
+
+    def __init__(self):
+        self.by_full = {}     # 정규화 전체 상품명 -> [행]
+        self.by_pure = {}     # 정규화 순수 상품명 -> [행]
+        self.pure_lengths = set()
+        self.pure_names = []  # 서로 다른 순수 상품명
+        self.pure_grams = {}  # 2-gram -> {pure_names 위치}
+
+    def add(self, row, full_norm, pure_norm):
+        self.by_full.setdefault(full_norm, []).append(row)
+        rows = self.by_pure.get(pure_norm)
+        if rows is None:
+            rows = self.by_pure[pure_norm] = []
+            name_id = len(self.pure_names)
+            self.pure_names.append(pure_norm)
+            self.pure_lengths.add(len(pure_norm))
+            for gram in _grams2(pure_norm):
+                self.pure_grams.setdefault(gram, set()).add(name_id)
+        rows.append(row)
+
+    def _names_containing(self, name_norm):
+        """name_norm 을 포함하는 순수 상품명들"""
+        if len(name_norm) < 2:
+            return [p for p in self.pure_names if name_norm in p]
+
+        ids = None
+        for gram in sorted(_grams2(name_norm), key=lambda g: len(self.pure_grams.get(g, ()))):
+            posting = self.pure_grams.get(gram)
+            if not posting:
+                return []
+            ids = set(posting) if ids is None else ids & posting
+            if not ids:
+                return []
+        return [self.pure_names[i] for i in ids if name_norm in self.pure_names[i]]
+
+    def candidates(self, name_norm):
+        """이름 조건(완전 일치 / 포함 / 포함됨)을 만족할 수 있는 행 (DB 순서)"""
+        rows = set(self.by_full.get(name_norm, ()))
+
+        # 순수 상품명이 검색어에 포함: 검색어의 부분 문자열 중 실제 순수명 길이만 조회
+        n = len(name_norm)
+        for length in self.pure_lengths:
+            if length > n:
+                continue
+            for start in range(n - length + 1):
+                hit = self.by_pure.get(name_norm[start:start + length])
+                if hit:
+                    rows.update(hit)
+
+        # 검색어가 순수 상품명에 포함
+        for pure_norm in self._names_containing(name_norm):
+            rows.update(self.by_pure[pure_norm])
+
+        return sorted(rows)
+
+class MatchingEngine:
+    """정규화/블록 색인을 한 번만 만들어 두고 여러 항목을 매칭"""
+
+    def __init__(self, products, color_memo=None, size_tokens=None, rows_by_wholesaler=None):
+        """size_tokens: {productCode: 사이즈 토큰} (database.sqlite 보조 테이블) - 없으면 여기서 토큰화
+        rows_by_wholesaler: {도매인: 행 범위} - 주면 도매인 블록을 처음 조회할 때 만든다 (카탈로그 스냅샷)
+        """
+        self.products = products
+        self.color_memo = color_memo
+        self.full_norms = {}
+        self.pure_norms = {}
+        self.option_norms = {}
+        self.option_ids = {}
+        self.size_tokens = {}
+        self.blocks = {}
+        self._size_tokens_by_code = size_tokens
+        self._tokenized = {}
+
+        if rows_by_wholesaler is None:
+            self._unindexed = {}
+            for row, db in enumerate(products):
+                self._index_row(row, db['wholesaler'], db['productName'], db.get('option') or db.get('optionName'),
+                                db['productCode'])
+        else:
+            self._unindexed = dict(rows_by_wholesaler)
+
+    def _index_row(self, row, wholesaler, full_name, option, product_code):
+        full_name = full_name or ''
+        full_norm = normalize(full_name)
+        pure_norm = normalize(pure_name(full_name))
+        self.full_norms[row] = full_norm
+        self.pure_norms[row] = pure_norm
+        option_norm = normalize(option or '')
+        self.option_norms[row] = option_norm
+        size_tokens = self._size_tokens_by_code
+        tokens = size_tokens.get(product_code) if size_tokens is not None else None
+        if tokens is None:
+            tokens = self._tokenized.get(option_norm)
+            if tokens is None:
+                tokens = self._tokenized[option_norm] = frozenset(tokenize(option_norm)[1])
+        self.size_tokens[row] = tokens
+        if self.color_memo is not None:
+            self.option_ids[row] = self.color_memo.option_id(option_norm)
+
+        block = self.blocks.get(wholesaler)
+        if block is None:
+            block = self.blocks[wholesaler] = _WholesalerBlock()
+        block.add(row, full_norm, pure_norm)
+
+    def _block(self, wholesaler):
+        """도매인 블록 (아직 색인하지 않았으면 지금 색인)"""
+        block = self.blocks.get(wholesaler)
+        if block is None:
+            rows = self._unindexed.pop(wholesaler, None)
+            if not rows:
+                return None
+            products = self.products
+            if hasattr(products, 'texts'):
+                # 스냅샷: 필요한 열만 범위째 읽음
+                start, end = rows.start, rows.stop
+                columns = zip(products.texts('productName', start, end), products.texts('option', start, end),
+                              products.texts('productCode', start, end))
+                for row, (full_name, option, code) in zip(rows, columns):
+                    self._index_row(row, wholesaler, full_name, option, code)
+            else:
+                for row in rows:
+                    db = products[row]
+                    self._index_row(row, wholesaler, db['productName'], db.get('option') or db.get('optionName'),
+                                    db['productCode'])
+            block = self.blocks.get(wholesaler)
+        return block
+
+    @classmethod
+    def from_sqlite(cls, db_path=DB_FILE, color_memo=None):
+        return cls(load_products(db_path), color_memo, load_size_tokens(db_path))
+
+    @classmethod
+    def from_snapshot(cls, snapshot, color_memo=None):
+        """카탈로그 스냅샷(catalog_snapshot.py) 위의 엔진 - 항목에 나온 도매인만 색인"""
+        return cls(snapshot, color_memo, rows_by_wholesaler=snapshot.rows_by_wholesaler())
+
+    def find_best_match(self, source):
+        """findBestMatch 와 같은 결과를 블록 후보만 보고 계산"""
+        row, status, similarity = self.find_best_row(source)
+        return {'product': self.products[row] if row is not None else None, 'status': status,
+                'similarity': similarity}
+
+    def find_best_row(self, source):
+        """find_best_match 와 같지만 제품 대신 행 번호 -> (행 | None, 상태, 유사도)"""
+        wholesaler, name, color, first_size = source_fields(source)
+        s_name_norm = normalize(name.strip())
+        s_color_norm = normalize(color.strip())
+        s_size = normalize(first_size)
+        use_tokens = can_use_tokens(s_size)
+
+        block = self._block(wholesaler.strip())
+        if block is None:
+            return None, 'danger', 0
+
+        memo = self.color_memo
+        if memo is not None:
+            color_id = memo.color_id(s_color_norm)
+        else:
+            scorer = SimilarityScorer(s_color_norm)
+        best_row, best_status, best_similarity = None, 'danger', 0
+        for row in block.candidates(s_name_norm):
+            option_norm = self.option_norms[row]
+            pure_norm = self.pure_norms[row]
+            name_exact = self.full_norms[row] == s_name_norm or pure_norm == s_name_norm
+            if use_tokens:
+                size_match = s_size in self.size_tokens[row]
+            else:
+                size_match = is_size_match(s_size, option_norm)
+            if name_exact and size_match:
+                if memo is not None:
+                    precise = memo.is_precise(color_id, self.option_ids[row])
+                else:
+                    precise = is_precise_color(s_color_norm, option_norm)
+                if precise:
+                    return row, 'success', 100
+
+            if name_exact or pure_norm in s_name_norm or s_name_norm in pure_norm:
+                bonus = 30 if size_match else 0
+                if memo is not None:
+                    color_sim = memo.similarity(color_id, self.option_ids[row])
+                else:
+                    # 60점과 현재 최고점을 넘을 수 없는 후보는 칼라 유사도 계산 도중 탈락
+                    needed = (max(60, best_similarity) - bonus) / 0.7 - 1e-9
+                    color_sim = scorer.score(option_norm, needed)
+                    if color_sim is None:
+                        continue
+                total_sim = color_sim * 0.7 + bonus
+                if total_sim > 60:
+                    status = 'success' if color_sim > 80 and size_match else 'warning'
+                    if total_sim > best_similarity:
+                        best_row, best_status, best_similarity = row, status, total_sim
+
+        return best_row, best_status, best_similarity
+
+    def match_all(self, items):
+        return [self.find_best_match(item) for item in items]
+
+def load_products(db_path=DB_FILE):
+    """database.sqlite 의 products 테이블 (삽입 순서 = 앱의 DB 목록 순서)"""
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        rows = conn.execute(
+            'SELECT productCode, wholesaler, productName, option, barcode, stock FROM products ORDER BY rowid'
+        ).fetchall()
+    finally:
+        conn.close()
+    return [dict(row) for row in rows]
+
+def make_synthetic_catalog(n_skus, n_wholesalers=20, seed=0):
+    """도매인 / '수식어-상품명' / '칼라:사이즈' 옵션을 가진 합성 제품 DB"""
+    rng = random.Random(seed)
+    bases = ['루비하트', '바다공주LED', '도로시리본', '플라이더', '스파클링', '메리제인', '리본샌들', '젤리슈즈',
+             '캔디', '별빛운동화', '마카롱', '구름슬리퍼', '오프너캐리어', '슬립온']
+    modifiers = ['', '', '젤리-', '키즈-', 'NEW-', '봄-']
+    colors = ['핑크', '진핑크', '연핑크', '블루', '연블루', '화이트', '블랙', '옐로우', '아이보리', '실버', '퍼플']
+    sizes = ['120', '130', '140', '150', '160', '170', '180', '190', '200', 'S', 'M', 'L', 'FREE']
+    wholesalers = [f'도매{i:02d}' for i in range(n_wholesalers)]
+
+    products = []
+    while len(products) < n_skus:
+        wholesaler = wholesalers[rng.randrange(n_wholesalers)]
+        name = f"{rng.choice(modifiers)}{rng.choice(bases)}{rng.randrange(n_skus // 200 + 10)}"
+        for color in rng.sample(colors, 3):
+            for size in rng.sample(sizes, 4):
+                products.append({
+                    'productCode': f'P{len(products):08d}',
+                    'wholesaler': wholesaler,
+                    'productName': name,
+                    'option': f'{color}:{size}' if rng.random() < 0.8 else f'{color}({size})',
+                    'barcode': '',
+                    'stock': 0,
+                })
+                if len(products) >= n_skus:
+                    return products
+    return products
+
+def make_synthetic_items(products, n_items, seed=1):
+    """DB 에서 뽑아 일부를 비튼 패킹리스트 항목 (칼라 변형, 없는 사이즈, 없는 제품)"""
+    rng = random.Random(seed)
+    items = []
+    for _ in range(n_items):
+        db = products[rng.randrange(len(products))]
+        color, _, size = db['option'].replace('(', ':').rstrip(')').partition(':')
+        name = pure_name(db['productName'])
+        roll = rng.random()
+        if roll < 0.1:
+            color = '진' + color
+        elif roll < 0.2:
+            size = '999'
+        elif roll < 0.25:
+            name = name + '없음'
+        items.append({'wholesaler': db['wholesaler'], 'productName': name, 'color': color,
+                      'quantities': {size: rng.randrange(1, 300)}})
+    return items
+
+def benchmark(sku_counts=(10000, 100000, 1000000), n_items=2000):
+    """합성 카탈로그에서 전체 순회 대비 블록 색인 매칭 속도 측정"""
+    print("=" * 80)
+    print(f"📈 매칭 엔진 벤치마크 (항목 {n_items:,}개)")
+    print("=" * 80)
+
+    for n_skus in sku_counts:
+        products = make_synthetic_catalog(n_skus)
+        items = make_synthetic_items(products, n_items)
+
+        start = time.perf_counter()
+        engine = MatchingEngine(products)
+        build_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = engine.match_all(items)
+        indexed_seconds = time.perf_counter() - start
+
+        # 전체 순회는 오래 걸리므로 표본만 측정해서 항목당 시간으로 환산
+        sample = max(3, min(n_items, 2000000 // n_skus))
+        start = time.perf_counter()
+        naive = [find_best_match_naive(item, products) for item in items[:sample]]
+        naive_per_item = (time.perf_counter() - start) / sample
+
+        same = all(a['product'] is b['product'] and a['status'] == b['status'] and a['similarity'] == b['similarity']
+                   for a, b in zip(naive, results[:sample]))
+        counts = {}
+        for r in results:
+            counts[r['status']] = counts.get(r['status'], 0) + 1
+
+        print(f"\n  SKU {n_skus:,}개 (색인 생성 {build_seconds:.2f}초)")
+        print(f"    전체 순회 : 항목당 {naive_per_item * 1000:9.2f}ms  (표본 {sample}개)")
+        print(f"    블록 색인 : 항목당 {indexed_seconds / n_items * 1000:9.3f}ms  "
+              f"({naive_per_item * n_items / indexed_seconds:,.0f}배)")
+        print(f"    결과 일치 : {'✅' if same else '❌'}   {counts}")
+
+def match_extracted(data_file=None, db_path=DB_FILE):
+    """추출 데이터를 제품 DB 와 매칭해서 상태별 건수 출력 (칼라 메모 사용 후 저장)"""
+    from product_store import read_products, find_data_file
+    from color_memo import ColorMemo
+    from catalog_snapshot import load_snapshot
+
+    items = read_products(data_file or find_data_file())
+    start = time.perf_counter()
+    memo = ColorMemo.load()
+    snapshot, mode = load_snapshot(db_path)
+    print(f"📦 카탈로그 스냅샷 {mode} ({(time.perf_counter() - start) * 1000:.1f}ms)")
+    engine = MatchingEngine.from_snapshot(snapshot, memo)
+    results = engine.match_all(items)
+    elapsed = time.perf_counter() - start
+    memo.save()
+
+    counts = {}
+    for r in results:
+        counts[r['status']] = counts.get(r['status'], 0) + 1
+    print(f"🔗 {len(items)}개 항목 / 제품 {len(engine.products):,}개 매칭 ({elapsed:.2f}초): {counts}")
+    memo.print_report()
+    return results
+
+if __name__ == '__main__':
+    command = sys.argv[1] if len(sys.argv) > 1 else 'match'
+    if command == 'bench':
+        counts = [int(a) for a in sys.argv[2:]] or [10000, 100000, 1000000]
+        benchmark(counts)
+    else:
+        args = sys.argv[2:]
+        match_extracted(args[0] if args else None, args[1] if len(args) > 1 else DB_FILE)
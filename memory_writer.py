@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+"""
+매핑 기억 지연 일괄 저장 (write-behind)
+
+자동 매칭에 성공할 때마다 saveMappingMemory 를 한 번씩 부르면
+3,000줄 입고 건 = 3,000번 왕복 + 한 줄짜리 트랜잭션 3,000개가 된다.
+MappingMemoryWriter 는 새 기억을 큐에 모아 두었다가
+- 모인 개수가 max_batch 이상이거나
+- 가장 오래된 항목이 max_delay 초 이상 기다렸거나
+- close() / 프로그램 종료(atexit) 시
+한 번에 upsert 한다. 같은 mappingKey 는 마지막 값 하나로 합친다.
+
+저장 대상 (sink)
+- SqliteMemorySink : database.sqlite 의 mappingMemory 테이블 (트랜잭션 하나에 executemany)
+- HttpMemorySink   : POST /api/mapping-memory/batch (server.js 또는 serve_stand_in 의 로컬 대체 API)
+
+사용법:
+    python memory_writer.py bench [행 수]   # 한 줄씩 저장 대비 일괄 저장 처리량
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import sqlite3
+import tempfile
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# UTF-8 출력 설정
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+DB_FILE = 'database.sqlite'
+DEFAULT_MAX_BATCH = 500
+DEFAULT_MAX_DELAY = 1.0  # 초
+RETRY_DELAY = 1.0        # 저장 실패 후 다시 시도할 때까지 (초)
+
+# server.js POST /api/mapping-memory 의 upsert 와 같음 (timestamp 는 처음 저장 시각 유지)
+UPSERT_SQL = '''
+    INSERT INTO mappingMemory (mappingKey, productCode, fileName) VALUES (?, ?, ?)
+    ON CONFLICT(mappingKey) DO UPDATE SET productCode = excluded.productCode, fileName = excluded.fileName
+'''
+
+class SqliteMemorySink:
+    """database.sqlite mappingMemory 테이블에 일괄 upsert"""
+
+    def __init__(self, db_path=DB_FILE):
+        self.db_path = db_path
+
+    def write(self, rows):
+        # 쓰기는 백그라운드 스레드에서 하므로 호출마다 연결
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                conn.executemany(UPSERT_SQL, rows)
+        finally:
+            conn.close()
+
+class HttpMemorySink:
+    """POST {base_url}/api/mapping-memory/batch 로 일괄 upsert"""
+
+    def __init__(self, base_url='http://localhost:3000', timeout=30):
+        self.url = base_url.rstrip('/') + '/api/mapping-memory/batch'
+        self.timeout = timeout
+
+    def write(self, rows):
+        body = json.dumps([{'mappingKey': k, 'productCode': c, 'fileName': f} for k, c, f in rows],
+                          ensure_ascii=False).encode('utf-8')
+        request = urllib.request.Request(self.url, data=body, headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+class MappingMemoryWriter:
+    """매핑 기억 지연 일괄 저장 큐"""
+
+    def __init__(self, sink, max_batch=DEFAULT_MAX_BATCH, max_delay=DEFAULT_MAX_DELAY):
+        self.sink = sink
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+
+        self.queued = 0          # put 호출 수
+        self.coalesced = 0       # 같은 키로 합쳐진 수
+        self.written = 0         # 저장된 행 수
+        self.flushes = 0
+        self.failures = 0
+        self.write_seconds = 0.0
+
+        self._pending = {}       # mappingKey -> (mappingKey, productCode, fileName)
+        self._oldest = None
+        self._retry_at = 0.0
+        self._flush_requested = False
+        self._closed = False
+        self._idle = True
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name='mapping-memory-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def put(self, mapping_key, product_code, file_name=''):
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("이미 닫힌 writer 입니다.")
+            if mapping_key in self._pending:
+                self.coalesced += 1
+            elif not self._pending:
+                self._oldest = time.monotonic()
+                self._cond.notify()
+            self._pending[mapping_key] = (mapping_key, product_code, file_name)
+            self.queued += 1
+            if len(self._pending) >= self.max_batch:
+                self._cond.notify()
+
+    def flush(self):
+        """대기 중인 기억을 지금 저장하고 끝날 때까지 대기 (저장 실패 시 다음 재시도로 넘기고 반환)"""
+        with self._cond:
+            if self._closed:
+                return
+            failures = self.failures
+            self._flush_requested = bool(self._pending)
+            self._cond.notify()
+            self._cond.wait_for(lambda: self._idle and (not self._pending or self.failures > failures))
+
+    def close(self):
+        """남은 기억을 모두 저장하고 백그라운드 스레드 종료 (여러 번 불러도 됨)"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        atexit.unregister(self.close)
+        if self._pending:
+            print(f"⚠️ 저장하지 못한 매핑 기억 {len(self._pending)}개")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _wait_time(self):
+        """다음 저장까지 남은 초 (0 = 지금, None = 새 항목이 들어올 때까지)"""
+        if self._closed:
+            return 0
+        if not self._pending:
+            return None
+        now = time.monotonic()
+        retry = self._retry_at - now
+        if self._flush_requested or len(self._pending) >= self.max_batch:
+            return max(0.0, retry)
+        return max(0.0, retry, self._oldest + self.max_delay - now)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    wait = self._wait_time()
+                    if wait == 0:
+                        break
+                    self._cond.wait(wait)
+                batch = list(self._pending.values())
+                self._pending = {}
+                self._oldest = None
+                self._flush_requested = False
+                closing = self._closed
+                self._idle = False
+
+            if batch:
+                self._write(batch)
+
+            with self._cond:
+                self._idle = True
+                self._cond.notify_all()
+                # 닫을 때는 마지막으로 한 번만 시도
+                if closing:
+                    return
+
+    def _write(self, batch):
+        start = time.perf_counter()
+        try:
+            self.sink.write(batch)
+        except Exception as e:
+            self.failures += 1
+            print(f"⚠️ 매핑 기억 {len(batch)}개 저장 실패: {e}")
+            with self._cond:
+                # 그 사이 새로 들어온 같은 키는 새 값을 유지
+                for row in batch:
+                    self._pending.setdefault(row[0], row)
+                if self._oldest is None:
+                    self._oldest = time.monotonic()
+                self._retry_at = time.monotonic() + RETRY_DELAY
+            return
+        finally:
+            self.write_seconds += time.perf_counter() - start
+        self.written += len(batch)
+        self.flushes += 1
+
+    def stats(self):
+        return {
+            'queued': self.queued,
+            'coalesced': self.coalesced,
+            'written': self.written,
+            'flushes': self.flushes,
+            'failures': self.failures,
+            'write_seconds': self.write_seconds,
+            'rows_per_second': self.written / self.write_seconds if self.write_seconds else 0,
+        }
+
+    def print_report(self):
+        s = self.stats()
+        print(f"💾 매핑 기억 저장: {s['written']:,}행 / {s['flushes']}회 일괄 저장 "
+              f"(합쳐짐 {s['coalesced']:,}, 실패 {s['failures']}), {s['rows_per_second']:,.0f}행/초")
+
+def _make_stand_in_handler(db_path):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'null')
+            if self.path == '/api/mapping-memory':
+                rows = [body]
+            elif self.path == '/api/mapping-memory/batch':
+                rows = body
+            else:
+                self.send_error(404)
+                return
+            if not isinstance(rows, list):
+                self.send_error(400, 'Invalid data format')
+                return
+            SqliteMemorySink(db_path).write([(r['mappingKey'], r['productCode'], r.get('fileName')) for r in rows])
+            payload = json.dumps({'success': True, 'count': len(rows)}).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    return Handler
+
+def serve_stand_in(db_path=DB_FILE, port=0):
+    """server.js 매핑 기억 저장 API 의 로컬 대체 서버 (백그라운드 스레드) - 반환: (서버, base_url)"""
+    server = ThreadingHTTPServer(('127.0.0.1', port), _make_stand_in_handler(db_path))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+def _bench_db(directory, name):
+    path = os.path.join(directory, name)
+    conn = sqlite3.connect(path)
+    conn.execute('''
+        CREATE TABLE mappingMemory (
+            mappingKey TEXT PRIMARY KEY,
+            productCode TEXT,
+            fileName TEXT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.commit()
+    conn.close()
+    return path
+
+def benchmark(n_rows=3000):
+    """한 줄씩 저장(현재 방식) 대비 지연 일괄 저장 처리량 - SQLite 직접 / 로컬 HTTP API"""
+    rows = [(f'도매{i % 20:02d}|상품{i}|핑크|{120 + i % 10 * 10}', f'P{i:08d}', '20260115-OH.xlsx')
+            for i in range(n_rows)]
+    directory = tempfile.mkdtemp()
+    results = []
+
+    def timed(label, func, db_path):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        count = sqlite3.connect(db_path).execute('SELECT COUNT(*) FROM mappingMemory').fetchone()[0]
+        results.append((label, elapsed, count))
+
+    def batched(sink):
+        with MappingMemoryWriter(sink) as writer:
+            for row in rows:
+                writer.put(*row)
+        return writer
+
+    db = _bench_db(directory, 'single.sqlite')
+    sink = SqliteMemorySink(db)
+    timed('SQLite 한 줄씩', lambda: [sink.write([row]) for row in rows], db)
+
+    db = _bench_db(directory, 'batch.sqlite')
+    timed('SQLite 일괄 (write-behind)', lambda: batched(SqliteMemorySink(db)), db)
+
+    db = _bench_db(directory, 'http_single.sqlite')
+    server, url = serve_stand_in(db)
+    single_url = url + '/api/mapping-memory'
+
+    def post_each():
+        for key, code, file_name in rows:
+            body = json.dumps({'mappingKey': key, 'productCode': code, 'fileName': file_name}).encode('utf-8')
+            request = urllib.request.Request(single_url, data=body, headers={'Content-Type': 'application/json'})
+            with urllib.request.urlopen(request) as response:
+                response.read()
+
+    timed('HTTP 한 줄씩', post_each, db)
+    server.shutdown()
+
+    db = _bench_db(directory, 'http_batch.sqlite')
+    server, url = serve_stand_in(db)
+    timed('HTTP 일괄 (write-behind)', lambda: batched(HttpMemorySink(url)), db)
+    server.shutdown()
+
+    print("=" * 80)
+    print(f"📈 매핑 기억 저장 벤치마크 ({n_rows:,}행)")
+    print("=" * 80)
+    for label, elapsed, count in results:
+        print(f"  {label:<28}: {elapsed:7.3f}초  {n_rows / elapsed:12,.0f}행/초  (저장 {count:,}행)")
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench':
+        benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 3000)
+    else:
+        print("사용법: python memory_writer.py bench [행 수]")
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+제품 옵션 토큰화 (products.option -> 칼라 / 사이즈 토큰)
+
+findBestMatch 는 패킹리스트 한 줄마다 사이즈 정규식을 새로 만들어
+DB 옵션 문자열 전체에 돌린다. 옵션은 제품 DB 에 들어올 때 한 번만
+정규화해서 구분자(: ( ) / ,) 기준 토큰으로 나눠 둔다.
+
+- 사이즈 토큰: 앞 구분자가 ')' 가 아니고 뒤 구분자가 '(' 가 아닌 조각
+  (기존 정규식 (^|[:\\(\\s,\\/])사이즈([:\\)\\s,\\/]|$) 이 잡는 위치와 같다)
+  -> 사이즈 일치는 집합 조회 한 번
+- 칼라 토큰: 숫자/표준 사이즈(S, M, FREE ...)가 아닌 조각
+
+패킹리스트 사이즈에 구분자나 정규식 특수문자가 있으면 기존 정규식으로 확인한다.
+
+토큰은 database.sqlite 의 보조 테이블에 저장한다.
+- optionTokens(productCode, optionHash, optionNorm, colorTokens, sizeTokens)
+- optionSizeTokens(token, productCode)  : 사이즈 -> 제품 색인
+optionHash 가 현재 옵션과 다른 행(새 제품 / 옵션 변경)만 다시 토큰화한다.
+
+사용법:
+    python option_tokenizer.py [database.sqlite]            # 변경된 행만 토큰화
+    python option_tokenizer.py size <사이즈> [database.sqlite]  # 사이즈로 제품 조회
+"""
+
+import re
+import sys
+import json
+import time
+import hashlib
+import sqlite3
+
+from layout_detector import COMMON_SIZES
+
+# UTF-8 출력 설정
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+DB_FILE = 'database.sqlite'
+
+# 토큰 규칙이 바뀌면 버전을 올려 모든 행을 다시 토큰화
+TOKENIZER_VERSION = 1
+
+DELIMITERS = ':()/,'
+_SPLIT = re.compile(r'([:()/,])')
+_WHITESPACE = re.compile(r'\s')
+_REGEX_SPECIAL = set('.^$*+?{}[]\\|()')
+_STANDARD_SIZES = {s.lower() for s in COMMON_SIZES}
+
+def normalize_option(option):
+    """matching_engine.normalize 와 같은 정규화 (공백 제거 + 옐러우 -> 옐로우 + 소문자)"""
+    return _WHITESPACE.sub('', str(option or '')).replace('옐러우', '옐로우').lower()
+
+def _segments(option_norm):
+    """(앞 구분자, 조각, 뒤 구분자) - 문자열 시작/끝은 ''"""
+    parts = _SPLIT.split(option_norm)
+    # parts = [조각, 구분자, 조각, 구분자, ..., 조각]
+    for i in range(0, len(parts), 2):
+        if parts[i]:
+            before = parts[i - 1] if i > 0 else ''
+            after = parts[i + 1] if i + 1 < len(parts) else ''
+            yield before, parts[i], after
+
+def tokenize(option_norm):
+    """정규화된 옵션 -> (칼라 토큰 목록, 사이즈 토큰 목록)"""
+    colors = []
+    sizes = []
+    for before, segment, after in _segments(option_norm):
+        if before != ')' and after != '(' and segment not in sizes:
+            sizes.append(segment)
+        if not segment.isdigit() and segment not in _STANDARD_SIZES and segment not in colors:
+            colors.append(segment)
+    return colors, sizes
+
+def can_use_tokens(size_norm):
+    """사이즈 토큰 조회로 정규식과 같은 결과를 낼 수 있는지 (구분자/특수문자 없는 사이즈)"""
+    return bool(size_norm) and not any(ch in DELIMITERS or ch in _REGEX_SPECIAL for ch in size_norm)
+
+def option_hash(option):
+    """원본 옵션 + 토큰화 버전 해시 (변경 감지용)"""
+    return hashlib.sha1(f'{TOKENIZER_VERSION}\0{option or ""}'.encode('utf-8')).hexdigest()[:16]
+
+def ensure_tables(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS optionTokens (
+            productCode TEXT PRIMARY KEY,
+            optionHash TEXT,
+            optionNorm TEXT,
+            colorTokens TEXT,
+            sizeTokens TEXT
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS optionSizeTokens (
+            token TEXT,
+            productCode TEXT,
+            PRIMARY KEY (token, productCode)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_optionSizeTokens_product ON optionSizeTokens(productCode)')
+
+def sync_option_tokens(conn):
+    """옵션이 바뀐 행만 다시 토큰화하고, 삭제된 제품의 토큰 제거
+
+    반환: {'total', 'tokenized', 'unchanged', 'removed'}
+    """
+    ensure_tables(conn)
+    rows = conn.execute('''
+        SELECT p.productCode, p.option, t.optionHash
+        FROM products p LEFT JOIN optionTokens t ON t.productCode = p.productCode
+    ''').fetchall()
+
+    token_rows = []
+    size_rows = []
+    retokenized = []  # 이전 토큰을 지워야 하는 행 (옵션 변경)
+    parsed = {}  # 같은 옵션 문자열은 한 번만 토큰화
+    for code, option, old_hash in rows:
+        entry = parsed.get(option)
+        if entry is None:
+            option_norm = normalize_option(option)
+            colors, sizes = tokenize(option_norm)
+            entry = parsed[option] = (option_hash(option), option_norm, json.dumps(colors, ensure_ascii=False),
+                                      json.dumps(sizes, ensure_ascii=False), sizes)
+        if entry[0] == old_hash:
+            continue
+        token_rows.append((code,) + entry[:4])
+        if old_hash is not None:
+            retokenized.append((code,))
+        size_rows.extend((size, code) for size in entry[4])
+
+    # 자동 커밋 연결(isolation_level=None)에서도 트랜잭션 하나로 처리
+    conn.execute('BEGIN')
+    try:
+        removed = conn.execute(
+            'DELETE FROM optionTokens WHERE productCode NOT IN (SELECT productCode FROM products)'
+        ).rowcount
+        conn.execute('DELETE FROM optionSizeTokens WHERE productCode NOT IN (SELECT productCode FROM products)')
+        conn.executemany('DELETE FROM optionSizeTokens WHERE productCode = ?', retokenized)
+        conn.executemany('INSERT OR REPLACE INTO optionTokens VALUES (?, ?, ?, ?, ?)', token_rows)
+        conn.executemany('INSERT OR IGNORE INTO optionSizeTokens VALUES (?, ?)', size_rows)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+    return {'total': len(rows), 'tokenized': len(token_rows),
+            'unchanged': len(rows) - len(token_rows), 'removed': removed}
+
+def load_size_tokens(db_path=DB_FILE):
+    """토큰 동기화 후 {productCode: 사이즈 토큰 frozenset}"""
+    conn = sqlite3.connect(db_path)
+    try:
+        sync_option_tokens(conn)
+        rows = conn.execute('SELECT productCode, sizeTokens FROM optionTokens').fetchall()
+    finally:
+        conn.close()
+
+    # 같은 토큰 목록은 frozenset 하나를 같이 쓴다
+    shared = {}
+    tokens = {}
+    for code, sizes in rows:
+        value = shared.get(sizes)
+        if value is None:
+            value = shared[sizes] = frozenset(json.loads(sizes))
+        tokens[code] = value
+    return tokens
+
+def products_with_size(conn, size):
+    """사이즈 토큰 색인으로 해당 사이즈 옵션을 가진 제품 코드 목록"""
+    size_norm = normalize_option(size)
+    return [row[0] for row in conn.execute(
+        'SELECT productCode FROM optionSizeTokens WHERE token = ? ORDER BY productCode', (size_norm,)
+    )]
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if args and args[0] == 'size':
+        if len(args) < 2:
+            print("사용법: python option_tokenizer.py size <사이즈> [database.sqlite]")
+            sys.exit(1)
+        conn = sqlite3.connect(args[2] if len(args) > 2 else DB_FILE)
+        sync_option_tokens(conn)
+        codes = products_with_size(conn, args[1])
+        conn.close()
+        print(f"🔍 사이즈 '{args[1]}': {len(codes)}개 제품")
+        for code in codes[:50]:
+            print(f"   - {code}")
+    else:
+        conn = sqlite3.connect(args[0] if args else DB_FILE)
+        start = time.perf_counter()
+        stats = sync_option_tokens(conn)
+        elapsed = time.perf_counter() - start
+        conn.close()
+        print(f"✅ 옵션 토큰화 ({elapsed:.2f}초): 전체 {stats['total']:,}개, 새로 토큰화 {stats['tokenized']:,}개, "
+              f"변경 없음 {stats['unchanged']:,}개, 삭제 {stats['removed']:,}개")
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+도매인별 병렬 자동 매핑
+
+findBestMatch 는 도매인이 정확히 같은 제품만 보므로 서로 다른 도매인의
+항목은 독립적이다. 입고 건을 도매인별 조각(shard)으로 나누고
+작업 프로세스 풀에서 동시에 매칭한 뒤 원래 순서대로 합친다.
+
+- 카탈로그는 복사하지 않는다: 작업 프로세스마다 카탈로그 스냅샷
+  (catalog_snapshot.py)을 메모리 맵으로 열어 같은 페이지 캐시를 공유하고,
+  자기가 받은 도매인 블록만 색인한다.
+- 조각 크기 = 항목 수 / 작업 수: 작은 도매인은 통째로 한 조각,
+  큰 도매인만 여러 조각으로 나눈다 (같은 도매인 블록 중복 색인 최소화).
+- 작업 프로세스는 (행 번호, 상태, 유사도)만 돌려주고
+  부모가 스냅샷에서 제품을 꺼내 붙인다.
+
+사용법:
+    python parallel_mapping.py match [추출 데이터] [database.sqlite] [--workers N]
+    python parallel_mapping.py bench [SKU 수] [항목 수] [작업 수 ...]   # 1~N 작업 확장성
+"""
+
+import os
+import sys
+import time
+import tempfile
+import multiprocessing
+
+from matching_engine import DB_FILE, MatchingEngine, source_fields
+from catalog_snapshot import SNAPSHOT_DIR, CatalogSnapshot, load_snapshot
+
+# UTF-8 출력 설정
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+MIN_SHARD_ITEMS = 50
+
+# 작업 프로세스 전역 (initializer 에서 설정)
+_engine = None
+
+def _init_worker(snapshot_path):
+    global _engine
+    _engine = MatchingEngine.from_snapshot(CatalogSnapshot(snapshot_path))
+
+def _map_shard(shard):
+    """[(원래 위치, 항목)] -> [(원래 위치, 행 | None, 상태, 유사도)]"""
+    return [(index, *_engine.find_best_row(item)) for index, item in shard]
+
+def make_shards(items, workers, known_wholesalers=None):
+    """항목을 도매인별 조각으로 나눔 (큰 조각부터)
+
+    반환: (조각 목록, 카탈로그에 없는 도매인 항목 위치 목록)
+    """
+    groups = {}
+    unknown = []
+    for index, item in enumerate(items):
+        wholesaler = source_fields(item)[0].strip()
+        if known_wholesalers is not None and wholesaler not in known_wholesalers:
+            unknown.append(index)
+        else:
+            groups.setdefault(wholesaler, []).append((index, item))
+
+    size = max(MIN_SHARD_ITEMS, -(-len(items) // max(1, workers)))
+    shards = []
+    for group in groups.values():
+        for start in range(0, len(group), size):
+            shards.append(group[start:start + size])
+    shards.sort(key=len, reverse=True)
+    return shards, unknown
+
+def map_parallel(items, snapshot, workers=None):
+    """입고 건 전체를 도매인별로 병렬 매칭 - 결과는 MatchingEngine.match_all 과 같은 순서/형식
+
+    snapshot: CatalogSnapshot (작업 프로세스는 snapshot.path 를 다시 연다)
+    """
+    workers = max(1, workers or os.cpu_count() or 1)
+    shards, unknown = make_shards(items, workers, snapshot.wholesaler_ranges)
+
+    results = [None] * len(items)
+    for index in unknown:
+        results[index] = {'product': None, 'status': 'danger', 'similarity': 0}
+
+    if workers == 1 or len(shards) <= 1:
+        # 조각이 하나면 프로세스를 띄우는 비용이 더 큼
+        engine = MatchingEngine.from_snapshot(snapshot)
+        rows = [(index, *engine.find_best_row(item)) for shard in shards for index, item in shard]
+    else:
+        ctx = multiprocessing.get_context()
+        with ctx.Pool(min(workers, len(shards)), initializer=_init_worker, initargs=(snapshot.path,)) as pool:
+            rows = [row for mapped in pool.imap_unordered(_map_shard, shards) for row in mapped]
+
+    for index, row, status, similarity in rows:
+        results[index] = {'product': snapshot[row] if row is not None else None, 'status': status,
+                          'similarity': similarity}
+    return results
+
+def benchmark(n_skus=300000, n_items=20000, worker_counts=None):
+    """합성 카탈로그에서 작업 수 1~N 매칭 시간 (풀 시작/스냅샷 열기 포함)"""
+    import sqlite3
+    from matching_engine import make_synthetic_catalog, make_synthetic_items
+    from product_loader import _empty_db
+
+    cpus = os.cpu_count() or 1
+    worker_counts = worker_counts or sorted({1, 2, 4, 8, cpus} & set(range(1, cpus + 1)))
+    products = make_synthetic_catalog(n_skus)
+    items = make_synthetic_items(products, n_items)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'catalog.sqlite')
+        _empty_db(db_path)
+        conn = sqlite3.connect(db_path)
+        with conn:
+            conn.executemany('INSERT INTO products VALUES (?, ?, ?, ?, ?, ?)',
+                             [tuple(p.values()) for p in products])
+        conn.close()
+        snapshot, _ = load_snapshot(db_path, os.path.join(tmp, 'snapshot'))
+
+        start = time.perf_counter()
+        expected = MatchingEngine.from_snapshot(snapshot).match_all(items)
+        sequential = time.perf_counter() - start
+
+        print("=" * 80)
+        print(f"📈 병렬 매핑 벤치마크 (제품 {n_skus:,}개, 항목 {n_items:,}개, CPU {cpus}개)")
+        print("=" * 80)
+        print(f"  순차 (match_all)  : {sequential:7.2f}초")
+        for workers in worker_counts:
+            start = time.perf_counter()
+            results = map_parallel(items, snapshot, workers)
+            elapsed = time.perf_counter() - start
+            same = all(a['product'] is b['product'] and a['status'] == b['status']
+                       and a['similarity'] == b['similarity'] for a, b in zip(expected, results))
+            shards, _ = make_shards(items, workers, snapshot.wholesaler_ranges)
+            print(f"  작업 {workers:2d}개 ({len(shards):3d}조각) : {elapsed:7.2f}초  "
+                  f"({sequential / elapsed:4.2f}배)  결과 일치 {'✅' if same else '❌'}")
+        if cpus == 1:
+            print("  (CPU 1개 환경: 작업 2개 이상은 확장성 대신 오버헤드만 보임)")
+
+def match_extracted(data_file=None, db_path=DB_FILE, workers=None):
+    """추출 데이터를 병렬 매칭해서 상태별 건수 출력"""
+    from product_store import read_products, find_data_file
+
+    items = read_products(data_file or find_data_file())
+    start = time.perf_counter()
+    snapshot, mode = load_snapshot(db_path, SNAPSHOT_DIR)
+    results = map_parallel(items, snapshot, workers)
+    elapsed = time.perf_counter() - start
+
+    counts = {}
+    for r in results:
+        counts[r['status']] = counts.get(r['status'], 0) + 1
+    print(f"🔗 {len(items)}개 항목 / 제품 {len(snapshot):,}개 병렬 매칭 (스냅샷 {mode}, {elapsed:.2f}초): {counts}")
+    return results
+
+if __name__ == '__main__':
+    command = sys.argv[1] if len(sys.argv) > 1 else 'match'
+    args = sys.argv[2:]
+    workers = None
+    if '--workers' in args:
+        i = args.index('--workers')
+        workers = int(args[i + 1])
+        args = args[:i] + args[i + 2:]
+    if command == 'bench':
+        numbers = [int(a) for a in args]
+        benchmark(numbers[0] if numbers else 300000, numbers[1] if len(numbers) > 1 else 20000,
+                  numbers[2:] or None)
+    else:
+        match_extracted(args[0] if args else None, args[1] if len(args) > 1 else DB_FILE, workers)
@@ -0,0 +1,398 @@
+# -*- coding: utf-8 -*-
+"""
+EzAdmin 상품 마스터 -> database.sqlite products 대량 적재
+
+handleDBUpload / /api/products/sync 는 상품 마스터 전체를 JSON 하나(최대 100MB)로 보낸다.
+여기서는 EzAdmin 상품 엑셀(.xlsx) 또는 CSV 를 한 줄씩 읽으면서
+- executemany 로 CHUNK_ROWS 행씩 upsert (청크마다 명시적 트랜잭션 하나)
+- WAL 저널 + synchronous=NORMAL 등 적재용 PRAGMA
+- 보조 색인(도매인/상품명)은 적재가 끝난 뒤 생성
+- 청크를 커밋할 때 같은 트랜잭션에서 진행 위치를 productLoadProgress 에 기록
+  -> 중간에 실패해도 같은 파일/도매인으로 다시 실행하면 이어서 적재
+메모리는 청크 하나 크기만 쓴다.
+
+열 규칙은 handleDBUpload 와 같다.
+- 첫 행에 '상품코드', '상품명' 이 있는 첫 시트 사용 (옵션, 바코드, 가용재고는 선택)
+- 상품코드가 비어 있는 행은 건너뜀, 옵션이 비어 있으면 '-', 재고는 정수 (실패 시 0)
+
+적재 후 옵션 토큰(option_tokenizer.py)도 바뀐 행만 갱신하고,
+변경분 동기화(delta_sync.py)에는 해당 도매인을 전체 재적재('resync')로 기록한다.
+
+사용법:
+    python product_loader.py <상품 파일.xlsx|.csv> <도매인> [database.sqlite]
+    python product_loader.py bench [SKU 수]
+"""
+
+import os
+import re
+import csv
+import sys
+import time
+import hashlib
+import sqlite3
+import tempfile
+import multiprocessing
+
+# UTF-8 출력 설정
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+DB_FILE = 'database.sqlite'
+CHUNK_ROWS = 50000
+
+REQUIRED_HEADERS = {'code': '상품코드', 'name': '상품명'}
+OPTIONAL_HEADERS = {'option': '옵션', 'barcode': '바코드', 'stock': '가용재고'}
+
+# 적재가 끝난 뒤 만드는 보조 색인
+INDEXES = {
+    'idx_products_wholesaler': 'CREATE INDEX IF NOT EXISTS idx_products_wholesaler ON products(wholesaler, productName)',
+}
+
+UPSERT_SQL = '''
+    INSERT INTO products (productCode, wholesaler, productName, option, barcode, stock) VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(productCode) DO UPDATE SET
+        wholesaler = excluded.wholesaler, productName = excluded.productName, option = excluded.option,
+        barcode = excluded.barcode, stock = excluded.stock
+'''
+
+LOAD_PRAGMAS = [
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-65536',  # 64MB
+]
+
+_LEADING_INT = re.compile(r'^\s*[+-]?\d+')
+
+def _text(value):
+    """엑셀 셀 값 -> 문자열 (12345.0 같은 정수형 실수는 '12345')"""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+def _parse_int(value):
+    """parseInt(value) || 0"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return int(value) if value == value else 0
+    match = _LEADING_INT.match(str(value or ''))
+    return int(match.group()) if match else 0
+
+def _column_map(header):
+    header = [_text(h) for h in header]
+    mapping = {}
+    for key, label in {**REQUIRED_HEADERS, **OPTIONAL_HEADERS}.items():
+        mapping[key] = header.index(label) if label in header else -1
+    if any(mapping[key] == -1 for key in REQUIRED_HEADERS):
+        return None
+    return mapping
+
+def _open_csv(path):
+    """UTF-8(BOM) 이 아니면 CP949 로 읽기"""
+    import codecs
+
+    with open(path, 'rb') as f:
+        head = f.read(64 * 1024)
+    try:
+        # 잘린 마지막 글자는 오류로 보지 않도록 증분 디코더 사용
+        codecs.getincrementaldecoder('utf-8-sig')().decode(head, final=False)
+        encoding = 'utf-8-sig'
+    except UnicodeDecodeError:
+        encoding = 'cp949'
+    return open(path, 'r', encoding=encoding, newline='')
+
+def _iter_sheets(path):
+    """(시트명, 행 iterator) - .xlsx 는 read_only 스트리밍, .csv 는 시트 하나"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.csv':
+        with _open_csv(path) as f:
+            yield os.path.basename(path), csv.reader(f)
+    elif ext in ('.xlsx', '.xlsm'):
+        from openpyxl import load_workbook
+
+        wb = load_workbook(path, read_only=True, data_only=True)
+        try:
+            for ws in wb.worksheets:
+                yield ws.title, ws.iter_rows(values_only=True)
+        finally:
+            wb.close()
+    else:
+        # .xls 는 스트리밍 읽기를 지원하지 않아 시트 단위로 읽음
+        import pandas as pd
+
+        for sheet_name, df in pd.read_excel(path, sheet_name=None, header=None, dtype=object).items():
+            yield sheet_name, (tuple(None if v != v else v for v in row) for row in df.itertuples(index=False))
+
+def iter_product_rows(path, wholesaler):
+    """상품 파일을 읽어 (원본 행 번호, products 행 튜플)을 하나씩 반환 (원본 행 번호는 헤더 다음 행이 1)"""
+    for sheet_name, rows in _iter_sheets(path):
+        header = next(rows, None)
+        if header is None:
+            continue
+        cols = _column_map(header)
+        if cols is None:
+            continue
+
+        def cell(row, key):
+            idx = cols[key]
+            return row[idx] if 0 <= idx < len(row) else None
+
+        for line, row in enumerate(rows, 1):
+            code = cell(row, 'code')
+            if code is None or code == '' or code == 0:
+                continue
+            option = cell(row, 'option')
+            barcode = cell(row, 'barcode')
+            yield line, (
+                _text(code),
+                wholesaler,
+                _text(cell(row, 'name')),
+                _text(option) if option not in (None, '', 0) else '-',
+                _text(barcode) if barcode not in (None, '', 0) else '',
+                _parse_int(cell(row, 'stock')),
+            )
+        return
+    raise ValueError("모든 시트에서 필수 컬럼(상품코드, 상품명)을 찾을 수 없습니다.")
+
+def _load_id(path, wholesaler):
+    """파일 내용 + 도매인 -> 적재 작업 ID (같은 파일을 다시 적재하면 이어서 진행)"""
+    from extraction_cache import file_content_hash
+
+    return hashlib.sha1(f'{file_content_hash(path)}|{wholesaler}'.encode('utf-8')).hexdigest()
+
+def ensure_progress_table(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS productLoadProgress (
+            loadId TEXT PRIMARY KEY,
+            sourcePath TEXT,
+            wholesaler TEXT,
+            rowsDone INTEGER,
+            productsLoaded INTEGER,
+            finished INTEGER DEFAULT 0,
+            updatedAt DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+def _commit_chunk(conn, load_id, path, wholesaler, chunk, last_line, loaded):
+    """청크 upsert + 진행 위치 기록을 트랜잭션 하나로 커밋"""
+    conn.execute('BEGIN')
+    try:
+        conn.executemany(UPSERT_SQL, chunk)
+        conn.execute('INSERT OR REPLACE INTO productLoadProgress '
+                     '(loadId, sourcePath, wholesaler, rowsDone, productsLoaded, finished, updatedAt) '
+                     'VALUES (?, ?, ?, ?, ?, 0, CURRENT_TIMESTAMP)',
+                     (load_id, os.path.abspath(path), wholesaler, last_line, loaded))
+        conn.execute('COMMIT')
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+
+def load_products_file(path, wholesaler, db_path=DB_FILE, chunk_rows=CHUNK_ROWS, tokenize=True):
+    """상품 파일을 products 테이블에 청크 단위로 upsert
+
+    반환: {'loaded', 'chunks', 'resumed_from', 'load_seconds', 'index_seconds', 'token_seconds'}
+    """
+    load_id = _load_id(path, wholesaler)
+    conn = sqlite3.connect(db_path, isolation_level=None, timeout=30)
+    try:
+        for pragma in LOAD_PRAGMAS:
+            conn.execute(pragma)
+        ensure_progress_table(conn)
+
+        row = conn.execute('SELECT rowsDone, productsLoaded, finished FROM productLoadProgress WHERE loadId = ?',
+                           (load_id,)).fetchone()
+        rows_done, loaded = (row[0], row[1]) if row and not row[2] else (0, 0)
+        resumed_from = rows_done
+
+        # 보조 색인은 적재 중 갱신 비용이 없도록 지웠다가 다시 생성
+        # (적재가 중간에 실패해도 다른 조회가 색인 없이 남지 않도록 finally 에서)
+        for name in INDEXES:
+            conn.execute(f'DROP INDEX IF EXISTS {name}')
+
+        try:
+            start = time.perf_counter()
+            chunks = 0
+            chunk = []
+            last_line = rows_done
+
+            for line, values in iter_product_rows(path, wholesaler):
+                if line <= rows_done:
+                    continue
+                chunk.append(values)
+                last_line = line
+                if len(chunk) >= chunk_rows:
+                    loaded += len(chunk)
+                    _commit_chunk(conn, load_id, path, wholesaler, chunk, last_line, loaded)
+                    chunk = []
+                    chunks += 1
+
+            if chunk:
+                loaded += len(chunk)
+                _commit_chunk(conn, load_id, path, wholesaler, chunk, last_line, loaded)
+                chunks += 1
+            load_seconds = time.perf_counter() - start
+        finally:
+            start = time.perf_counter()
+            for sql in INDEXES.values():
+                conn.execute(sql)
+            index_seconds = time.perf_counter() - start
+
+        conn.execute('UPDATE productLoadProgress SET finished = 1, updatedAt = CURRENT_TIMESTAMP WHERE loadId = ?',
+                     (load_id,))
+
+        from delta_sync import record_full_resync
+
+        record_full_resync(conn, wholesaler)
+
+        token_seconds = 0.0
+        if tokenize:
+            from option_tokenizer import sync_option_tokens
+
+            start = time.perf_counter()
+            sync_option_tokens(conn)
+            token_seconds = time.perf_counter() - start
+    finally:
+        conn.close()
+
+    return {'loaded': loaded, 'chunks': chunks, 'resumed_from': resumed_from,
+            'load_seconds': load_seconds, 'index_seconds': index_seconds, 'token_seconds': token_seconds}
+
+def write_synthetic_export(path, n_skus, seed=0):
+    """EzAdmin 상품 내보내기 형식의 합성 파일 (.csv 또는 .xlsx)"""
+    import random
+
+    rng = random.Random(seed)
+    header = ['상품코드', '상품명', '옵션', '바코드', '가용재고', '판매가']
+    colors = ['핑크', '진핑크', '블루', '화이트', '블랙', '옐로우', '아이보리']
+    sizes = ['120', '130', '140', '150', '160', 'S', 'M', 'L', 'FREE']
+
+    def rows():
+        for i in range(n_skus):
+            yield [f'[OH]P{i:08d}' if i % 3 == 0 else f'P{i:08d}', f'상품{i // 20}',
+                   f'{rng.choice(colors)}:{rng.choice(sizes)}', f'880{i:010d}', rng.randrange(0, 500), 12900]
+
+    if path.endswith('.csv'):
+        with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows())
+    else:
+        from openpyxl import Workbook
+
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet('상품')
+        ws.append(header)
+        for row in rows():
+            ws.append(row)
+        wb.save(path)
+
+def _empty_db(path):
+    conn = sqlite3.connect(path)
+    conn.execute('''
+        CREATE TABLE products (
+            productCode TEXT PRIMARY KEY,
+            wholesaler TEXT,
+            productName TEXT,
+            option TEXT,
+            barcode TEXT,
+            stock INTEGER
+        )
+    ''')
+    conn.commit()
+    conn.close()
+
+def _naive_load(path, wholesaler, db_path):
+    """비교용: 전체를 메모리에 읽은 뒤 한 줄씩 INSERT + 커밋 (기본 저널)"""
+    products = [values for _, values in iter_product_rows(path, wholesaler)]
+    conn = sqlite3.connect(db_path)
+    for values in products:
+        conn.execute('INSERT OR REPLACE INTO products VALUES (?, ?, ?, ?, ?, ?)', values)
+        conn.commit()
+    conn.close()
+    return len(products)
+
+def _bench_child(task, source, db_path, result_queue):
+    from convert_to_csv import _peak_rss_mb
+
+    start = time.perf_counter()
+    if task == 'naive':
+        count = _naive_load(source, 'OH', db_path)
+    else:
+        count = load_products_file(source, 'OH', db_path, tokenize=False)['loaded']
+    result_queue.put((count, time.perf_counter() - start, _peak_rss_mb()))
+
+def benchmark(n_skus=1000000, naive_skus=20000, xlsx_skus=100000):
+    """합성 상품 파일 적재 처리량(행/초) / 최대 메모리 - 작업마다 별도 프로세스"""
+    ctx = multiprocessing.get_context()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        big_csv = os.path.join(tmp, 'products.csv')
+        small_csv = os.path.join(tmp, 'products_small.csv')
+        xlsx = os.path.join(tmp, 'products.xlsx')
+        write_synthetic_export(big_csv, n_skus)
+        write_synthetic_export(small_csv, naive_skus)
+        write_synthetic_export(xlsx, xlsx_skus)
+
+        cases = [
+            (f'한 줄씩 INSERT+커밋 CSV ({naive_skus:,})', 'naive', small_csv),
+            (f'일괄 적재 CSV ({n_skus:,})', 'bulk', big_csv),
+            (f'일괄 적재 XLSX ({xlsx_skus:,})', 'bulk', xlsx),
+        ]
+
+        print("=" * 80)
+        print("📈 상품 마스터 적재 벤치마크")
+        print("=" * 80)
+        for label, task, source in cases:
+            db_path = os.path.join(tmp, f'{task}_{os.path.basename(source)}.sqlite')
+            _empty_db(db_path)
+            result_queue = ctx.Queue()
+            process = ctx.Process(target=_bench_child, args=(task, source, db_path, result_queue))
+            process.start()
+            count, seconds, peak = result_queue.get()
+            process.join()
+            peak_str = f"{peak:7.0f}MB" if peak is not None else '      -'
+            print(f"  {label:34} {seconds:7.2f}초  {count / seconds:10,.0f} 행/초  최대 RSS {peak_str}")
+
+        # 이어 적재: 청크 2개 후 실패 -> 다시 실행
+        db_path = os.path.join(tmp, 'resume.sqlite')
+        _empty_db(db_path)
+        global _commit_chunk
+        commit_chunk = _commit_chunk
+        committed = []
+
+        def failing_commit(*args):
+            commit_chunk(*args)
+            committed.append(1)
+            if len(committed) >= 2:
+                raise RuntimeError("청크 2개 적재 후 중단")
+
+        _commit_chunk = failing_commit
+        try:
+            load_products_file(big_csv, 'OH', db_path, tokenize=False)
+        except RuntimeError:
+            pass
+        finally:
+            _commit_chunk = commit_chunk
+        stats = load_products_file(big_csv, 'OH', db_path, tokenize=False)
+        count = sqlite3.connect(db_path).execute('SELECT COUNT(*) FROM products').fetchone()[0]
+        print(f"  이어 적재: {stats['resumed_from']:,}행 이후부터 재개, 최종 {count:,}행 "
+              f"{'✅' if count == n_skus else '❌'}")
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench':
+        benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 1000000)
+    elif len(sys.argv) >= 3:
+        source, wholesaler = sys.argv[1], sys.argv[2]
+        db_path = sys.argv[3] if len(sys.argv) > 3 else DB_FILE
+        stats = load_products_file(source, wholesaler, db_path)
+        resumed = f", {stats['resumed_from']:,}행 이후부터 이어서" if stats['resumed_from'] else ''
+        print(f"✅ {source} -> {db_path}: {stats['loaded']:,}개 제품 ({stats['chunks']}개 청크{resumed})")
+        print(f"   적재 {stats['load_seconds']:.2f}초, 색인 {stats['index_seconds']:.2f}초, "
+              f"옵션 토큰 {stats['token_seconds']:.2f}초")
+    else:
+        print("사용법: python product_loader.py <상품 파일.xlsx|.csv> <도매인> [database.sqlite]")
+        print("        python product_loader.py bench [SKU 수]")
+        sys.exit(1)
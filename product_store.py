@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""
+추출 제품 저장소 - JSON / JSON Lines / Parquet
+
+확장자로 형식을 정한다.
+- .json    : 기존 형식 (들여쓰기 JSON 배열) - 추가 시 전체 다시 쓰기
+- .jsonl   : 한 줄에 제품 하나 - 파일 끝에 이어 쓰기만 하면 추가 끝
+- .parquet : 사이즈 행 단위 열 저장 (pandas + pyarrow 필요) - 필요한 열만 읽기
+
+Parquet 물리 열: product_id, sheet, product_name, color, wholesaler, file_name, size, qty
+(제품 하나 = product_id 가 같은 사이즈 행들)
+
+읽을 때 columns 로 필요한 필드만 지정할 수 있다.
+    read_products('extracted_products.parquet', columns=['product_name', 'color'])
+
+사용법:
+    python product_store.py <입력> <출력>   # 형식 변환 (예: .json -> .parquet)
+"""
+
+import os
+import re
+import sys
+import json
+
+# UTF-8 출력 설정
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+DATA_BASE = 'extracted_products'
+EXTENSIONS = ['.json', '.jsonl', '.parquet']
+
+# 제품 레코드 필드 (읽기 columns 로 지정 가능한 값)
+FIELDS = ['sheet', 'product_name', 'color', 'wholesaler', 'file_name', 'quantities']
+TEXT_FIELDS = ['sheet', 'product_name', 'color', 'wholesaler', 'file_name']
+PARQUET_COLUMNS = ['product_id'] + TEXT_FIELDS + ['size', 'qty']
+
+READ_CHUNK = 64 * 1024
+# Parquet 읽기 배치 / 쓰기 행 그룹 크기 (사이즈 행 기준) - 읽을 때 메모리 상한
+PARQUET_BATCH_ROWS = 64 * 1024
+PARQUET_ROW_GROUP = 256 * 1024
+
+_SEPARATORS = re.compile(r'[\s,]*')
+
+def storage_format(path):
+    """확장자로 저장 형식 판단 ('json', 'jsonl', 'parquet')"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in EXTENSIONS:
+        raise ValueError(f"지원하지 않는 형식입니다: {path} ({', '.join(EXTENSIONS)})")
+    return ext[1:]
+
+def find_data_file(base=DATA_BASE):
+    """extracted_products.json/.jsonl/.parquet 중 가장 최근에 수정된 파일 (없으면 .json)"""
+    existing = [base + ext for ext in EXTENSIONS if os.path.exists(base + ext)]
+    if not existing:
+        return base + '.json'
+    return max(existing, key=os.path.getmtime)
+
+def _iter_json_array(f, chunk_size=READ_CHUNK):
+    """JSON 배열 파일에서 원소를 하나씩 읽기 (전체를 메모리에 올리지 않음)"""
+    decoder = json.JSONDecoder()
+    buffer = f.read(chunk_size).lstrip('\ufeff \t\r\n')
+    if not buffer:
+        return
+    if not buffer.startswith('['):
+        raise ValueError("JSON 배열 형식이 아닙니다.")
+
+    pos = 1
+    eof = False
+    while True:
+        pos = _SEPARATORS.match(buffer, pos).end()
+        if buffer.startswith(']', pos):
+            return
+        try:
+            item, pos = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # 원소가 잘려 있으면 다음 덩어리를 이어 붙여 다시 시도
+            if eof:
+                raise
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            continue
+        yield item
+
+def _project(product, columns):
+    if columns is None:
+        return product
+    return {key: product[key] for key in columns if key in product}
+
+def _parquet_columns(columns):
+    """제품 필드 -> Parquet 물리 열"""
+    if columns is None:
+        return PARQUET_COLUMNS
+    physical = ['product_id'] + [c for c in TEXT_FIELDS if c in columns]
+    if 'quantities' in columns:
+        physical += ['size', 'qty']
+    return physical
+
+def _iter_parquet(path, columns):
+    import pyarrow.parquet as pq
+
+    # 배치 단위로 읽으므로 메모리에는 배치 하나와 만들고 있는 제품 하나만 남는다.
+    # 제품 하나의 사이즈 행이 배치 경계에 걸칠 수 있어서, 다음 product_id 가 나올 때까지 내보내지 않음
+    parquet = pq.ParquetFile(path)
+    product = None
+    product_id = None
+    for batch in parquet.iter_batches(batch_size=PARQUET_BATCH_ROWS, columns=_parquet_columns(columns)):
+        names = batch.schema.names
+        text_cols = [c for c in TEXT_FIELDS if c in names]
+        with_qty = 'size' in names
+        ids = batch.column('product_id').to_pylist()
+        # 쓸 때 비어 있던 값은 None 으로 돌아옴
+        texts = {c: batch.column(c).to_pylist() for c in text_cols}
+        if with_qty:
+            sizes = batch.column('size').to_pylist()
+            qtys = batch.column('qty').to_pylist()
+
+        for i, row_id in enumerate(ids):
+            if row_id != product_id:
+                if product is not None:
+                    yield product
+                product_id = row_id
+                product = {c: texts[c][i] for c in text_cols if texts[c][i] is not None}
+                if with_qty:
+                    product['quantities'] = {}
+            # 수량 없는 제품의 빈 행 (size/qty 가 비어 있음)은 건너뜀
+            if with_qty and sizes[i] is not None and qtys[i] is not None:
+                product['quantities'][sizes[i]] = int(qtys[i])
+
+    if product is not None:
+        yield product
+
+def iter_products(path, columns=None):
+    """제품을 하나씩 읽기 (columns: 필요한 필드 목록, None 이면 전체)"""
+    fmt = storage_format(path)
+    if fmt == 'parquet':
+        yield from _iter_parquet(path, columns)
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        if fmt == 'jsonl':
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield _project(json.loads(line), columns)
+        else:
+            for product in _iter_json_array(f):
+                yield _project(product, columns)
+
+def read_products(path, columns=None):
+    """제품 목록 전체 읽기"""
+    return list(iter_products(path, columns))
+
+def _to_frame(products, start_id=0):
+    """제품 목록 -> Parquet 사이즈 행 DataFrame (수량 없는 제품은 size/qty 가 빈 행 하나)"""
+    import pandas as pd
+
+    rows = {c: [] for c in PARQUET_COLUMNS}
+    for offset, product in enumerate(products):
+        quantities = product.get('quantities') or {None: None}
+        for size, qty in quantities.items():
+            rows['product_id'].append(start_id + offset)
+            for c in TEXT_FIELDS:
+                rows[c].append(product.get(c))
+            rows['size'].append(size)
+            rows['qty'].append(qty)
+
+    df = pd.DataFrame(rows, columns=PARQUET_COLUMNS)
+    df['product_id'] = df['product_id'].astype('int64')
+    df['qty'] = pd.array(df['qty'], dtype='Int64')
+    for c in TEXT_FIELDS + ['size']:
+        df[c] = df[c].astype(object)
+    return df
+
+def write_products(path, products):
+    """제품 목록 저장 (기존 내용 덮어쓰기)"""
+    fmt = storage_format(path)
+    if fmt == 'parquet':
+        _to_frame(products).to_parquet(path, index=False, row_group_size=PARQUET_ROW_GROUP)
+    elif fmt == 'jsonl':
+        with open(path, 'w', encoding='utf-8') as f:
+            for product in products:
+                f.write(json.dumps(product, ensure_ascii=False) + '\n')
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(list(products), f, ensure_ascii=False, indent=2)
+
+def append_products(path, products):
+    """제품 목록 추가
+
+    .jsonl 은 파일 끝에 줄만 덧붙이고, .json/.parquet 은 기존 내용과 합쳐 다시 쓴다.
+    """
+    fmt = storage_format(path)
+    if not os.path.exists(path):
+        write_products(path, products)
+        return
+
+    if fmt == 'jsonl':
+        with open(path, 'a', encoding='utf-8') as f:
+            for product in products:
+                f.write(json.dumps(product, ensure_ascii=False) + '\n')
+    elif fmt == 'parquet':
+        import pandas as pd
+
+        existing = pd.read_parquet(path)
+        start_id = int(existing['product_id'].max()) + 1 if len(existing) else 0
+        pd.concat([existing, _to_frame(products, start_id)], ignore_index=True).to_parquet(
+            path, index=False, row_group_size=PARQUET_ROW_GROUP)
+    else:
+        write_products(path, read_products(path) + list(products))
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        print("사용법: python product_store.py <입력 파일> <출력 파일>")
+        sys.exit(1)
+
+    source, target = sys.argv[1], sys.argv[2]
+    products = read_products(source)
+    write_products(target, products)
+    print(f"✅ {source} -> {target}: {len(products)}개 제품 "
+          f"({os.path.getsize(source) / 1024:.1f}KB -> {os.path.getsize(target) / 1024:.1f}KB)")
@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+"""
+추출 데이터 검색 인덱스
+
+추출 데이터(product_store 의 .json/.jsonl/.parquet)를 한 번만 읽어 아래 인덱스를 만들고
+데이터 파일 옆에 저장한다 (extracted_products.json.search_index.pkl).
+데이터 파일의 경로/수정 시각/크기가 바뀌면 자동으로 다시 만든다.
+
+- 제품명 / 칼라 : 1글자, 2글자 n-gram 역색인 (부분 문자열 검색, 대소문자 무시)
+- 사이즈 / 도매인 : 값 그대로의 역색인 (정확히 일치)
+
+검색은 조건별 후보 목록(정렬된 제품 번호 배열)의 교집합으로 계산하고,
+3글자 이상 검색어만 후보에 대해 실제 부분 문자열을 확인한다.
+
+사용법:
+    python search_index.py                 # 인덱스 생성/현황
+    python search_index.py bench [제품 수]  # 합성 데이터 검색 속도 측정
+"""
+
+import os
+import sys
+import time
+import pickle
+import numpy as np
+
+from product_store import read_products, find_data_file
+
+# UTF-8 출력 설정
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+# 인덱스 구조가 바뀌면 버전을 올려 저장된 인덱스를 무효화
+INDEX_VERSION = 1
+
+# 같은 프로세스 안에서 다시 읽지 않도록 메모 (절대경로 -> 인덱스)
+_loaded = {}
+
+def index_path(data_file):
+    """데이터 파일 옆에 저장되는 인덱스 파일 경로
+
+    확장자까지 이름에 넣어서 같은 이름의 .json/.jsonl/.parquet 인덱스가 서로 덮어쓰지 않게 함
+    """
+    return data_file + '.search_index.pkl'
+
+def _source_key(data_file):
+    stat = os.stat(data_file)
+    return (INDEX_VERSION, os.path.abspath(data_file), stat.st_mtime_ns, stat.st_size)
+
+def _grams(text):
+    """1글자 + 2글자 n-gram 집합"""
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    return grams
+
+def _postings(lists):
+    return {key: np.asarray(ids, dtype=np.int32) for key, ids in lists.items()}
+
+class ProductSearchIndex:
+    """제품 목록 검색 인덱스 (제품 번호 = products 리스트 위치)"""
+
+    def __init__(self, products, source_key=None):
+        self.products = products
+        self.source_key = source_key
+
+        self.names = [p['product_name'].lower() for p in products]
+        self.colors = [p['color'].lower() for p in products]
+
+        name_grams, color_grams, sizes, wholesalers = {}, {}, {}, {}
+        for idx, p in enumerate(products):
+            for gram in _grams(self.names[idx]):
+                name_grams.setdefault(gram, []).append(idx)
+            for gram in _grams(self.colors[idx]):
+                color_grams.setdefault(gram, []).append(idx)
+            for size in p['quantities']:
+                sizes.setdefault(size, []).append(idx)
+            wholesalers.setdefault(p.get('wholesaler', '-'), []).append(idx)
+
+        self.name_grams = _postings(name_grams)
+        self.color_grams = _postings(color_grams)
+        self.sizes = _postings(sizes)
+        self.wholesalers = _postings(wholesalers)
+        self._name_colors = None
+
+    def _text_candidates(self, grams_index, texts, query):
+        """부분 문자열 검색 - n-gram 후보 교집합 후 3글자 이상만 실제 확인"""
+        query = query.lower()
+        grams = _grams(query)
+        candidates = None
+        for gram in sorted(grams, key=lambda g: len(grams_index.get(g, ()))):
+            ids = grams_index.get(gram)
+            if ids is None:
+                return np.empty(0, dtype=np.int32)
+            candidates = ids if candidates is None else np.intersect1d(candidates, ids, assume_unique=True)
+            if len(candidates) == 0:
+                return candidates
+
+        if len(query) > 2:
+            candidates = np.asarray([i for i in candidates if query in texts[i]], dtype=np.int32)
+        return candidates
+
+    def search(self, product_name=None, color=None, size=None, wholesaler=None):
+        """조건에 맞는 제품 번호 배열 (원래 순서)"""
+        conditions = []
+        if size:
+            conditions.append(self.sizes.get(size, np.empty(0, dtype=np.int32)))
+        if wholesaler:
+            conditions.append(self.wholesalers.get(wholesaler, np.empty(0, dtype=np.int32)))
+        if product_name:
+            conditions.append(self._text_candidates(self.name_grams, self.names, product_name))
+        if color:
+            conditions.append(self._text_candidates(self.color_grams, self.colors, color))
+
+        if not conditions:
+            return np.arange(len(self.products), dtype=np.int32)
+
+        conditions.sort(key=len)
+        result = conditions[0]
+        for ids in conditions[1:]:
+            if len(result) == 0:
+                break
+            result = np.intersect1d(result, ids, assume_unique=True)
+        return result
+
+    def name_colors(self):
+        """제품명 -> 칼라 목록 (정렬) - 한 번만 계산"""
+        if self._name_colors is None:
+            grouped = {}
+            for p in self.products:
+                grouped.setdefault(p['product_name'], set()).add(p['color'])
+            self._name_colors = {name: sorted(grouped[name]) for name in sorted(grouped)}
+        return self._name_colors
+
+    def save(self, path):
+        """인덱스 상태를 dict 로 저장 (실행 모듈 이름과 무관하게 다시 읽을 수 있도록)"""
+        state = {key: value for key, value in self.__dict__.items() if key != '_name_colors'}
+        with open(path, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        index = cls.__new__(cls)
+        index.__dict__.update(state)
+        index._name_colors = None
+        return index
+
+def build_index(data_file=None, save=True):
+    """데이터 파일을 읽어 인덱스 생성 (save=True 면 데이터 파일 옆에 저장)"""
+    data_file = data_file or find_data_file()
+    key = _source_key(data_file)
+    products = read_products(data_file)
+
+    index = ProductSearchIndex(products, key)
+    if save:
+        try:
+            index.save(index_path(data_file))
+        except OSError:
+            pass  # 읽기 전용 위치여도 검색은 가능
+    return index
+
+def load_index(data_file=None):
+    """검색 인덱스 로드 - 메모 → 저장된 인덱스 → 새로 생성 순서
+
+    data_file: 없으면 가장 최근 extracted_products.* 파일
+    데이터 파일의 수정 시각/크기가 인덱스와 다르면 다시 만든다.
+    """
+    data_file = data_file or find_data_file()
+    key = _source_key(data_file)
+    memo_key = os.path.abspath(data_file)
+
+    index = _loaded.get(memo_key)
+    if index is not None and index.source_key == key:
+        return index
+
+    index = None
+    path = index_path(data_file)
+    if os.path.exists(path):
+        try:
+            index = ProductSearchIndex.load(path)
+        except Exception:
+            index = None
+        if index is not None and index.source_key != key:
+            index = None
+
+    if index is None:
+        index = build_index(data_file)
+
+    _loaded[memo_key] = index
+    return index
+
+def make_synthetic_products(n_products, seed=0):
+    """도매인/파일/제품명/칼라/사이즈가 섞인 합성 추출 데이터"""
+    rng = np.random.default_rng(seed)
+    names = ['바다공주LED', '루비하트', '도로시리본', '플라이더', '스파클링', '오프너 캐리어', '메리제인', '리본샌들']
+    colors = ['핑크', '실버', '블루', '화이트', '옐로우', '블랙', '아이보리', '진핑크', '연블루']
+    sizes = ['120', '130', '140', '150', '160', '170', '180', '190', '200', '210', '220', 'L', 'FREE']
+    wholesalers = ['OH-오즈', 'OZ-오즈', '롤라루-OH', 'OZ-롤라루', 'OHP업체']
+
+    products = []
+    for i in range(n_products):
+        picked = rng.choice(len(sizes), size=int(rng.integers(1, 6)), replace=False)
+        products.append({
+            'sheet': wholesalers[i % len(wholesalers)],
+            'product_name': f"{names[i % len(names)]}{i % 997}",
+            'color': colors[int(rng.integers(0, len(colors)))],
+            'quantities': {sizes[j]: int(rng.integers(1, 400)) for j in sorted(picked)},
+            'wholesaler': wholesalers[i % len(wholesalers)],
+            'file_name': f"2026{i % 12 + 1:02d}15-packing.xls",
+        })
+    return products
+
+def linear_search(products, product_name=None, color=None, size=None, wholesaler=None):
+    """기존 방식 (전체 순회) - 벤치마크/검증용"""
+    ids = []
+    for idx, p in enumerate(products):
+        if product_name and product_name.lower() not in p['product_name'].lower():
+            continue
+        if color and color.lower() not in p['color'].lower():
+            continue
+        if size and size not in p['quantities']:
+            continue
+        if wholesaler and p.get('wholesaler', '-') != wholesaler:
+            continue
+        ids.append(idx)
+    return ids
+
+def benchmark(n_products=100000, repeat=5):
+    """합성 데이터로 전체 순회 대비 검색 시간 측정"""
+    products = make_synthetic_products(n_products)
+    size_rows = sum(len(p['quantities']) for p in products)
+
+    start = time.perf_counter()
+    index = ProductSearchIndex(products)
+    build_seconds = time.perf_counter() - start
+
+    queries = [
+        {'product_name': '루비'},
+        {'product_name': '바다공주LED12'},
+        {'color': '핑크'},
+        {'product_name': '리본', 'color': '블루', 'size': '150'},
+        {'size': 'FREE', 'wholesaler': 'OZ-롤라루'},
+    ]
+
+    print("=" * 80)
+    print(f"🔍 검색 인덱스 벤치마크 ({n_products:,}개 제품, 사이즈 행 {size_rows:,}개)")
+    print("=" * 80)
+    print(f"  인덱스 생성: {build_seconds:.2f}초\n")
+
+    for query in queries:
+        best_linear = best_index = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            expected = linear_search(products, **query)
+            elapsed = time.perf_counter() - start
+            best_linear = elapsed if best_linear is None else min(best_linear, elapsed)
+
+            start = time.perf_counter()
+            found = index.search(**query)
+            elapsed = time.perf_counter() - start
+            best_index = elapsed if best_index is None else min(best_index, elapsed)
+
+        same = '✅' if expected == found.tolist() else '❌'
+        print(f"  {str(query):60} {len(found):7,}건  순회 {best_linear * 1000:8.2f}ms  "
+              f"인덱스 {best_index * 1000:7.2f}ms  {same}")
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench':
+        benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 100000)
+    else:
+        start = time.perf_counter()
+        data_file = find_data_file()
+        index = load_index(data_file)
+        print(f"🔍 {index_path(data_file)}: 제품 {len(index.products):,}개, "
+              f"제품명 n-gram {len(index.name_grams):,}개, 사이즈 {len(index.sizes)}종, "
+              f"도매인 {len(index.wholesalers)}곳 ({time.perf_counter() - start:.3f}초)")
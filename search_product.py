@@ -1,10 +1,13 @@
 # -*- coding: utf-8 -*-
 """
-제품 검색 스크립트 - 제품명/칼라/사이즈로 수량 조회
+제품 검색 스크립트 - 제품명/칼라/사이즈/도매인으로 수량 조회
+
+검색은 search_index 의 인덱스를 사용한다 (JSON 이 바뀔 때만 다시 생성).
 """
 
 import sys
-import json
+
+from search_index import load_index
 
 # UTF-8 출력 설정
 if sys.platform == 'win32':
@@ -12,12 +15,10 @@ if sys.platform == 'win32':
     sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
     sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
 
-def search_product(product_name=None, color=None, size=None):
-    """제품 검색 및 수량 조회"""
+def search_product(product_name=None, color=None, size=None, wholesaler=None, data_file=None):
+    """제품 검색 및 수량 조회 (data_file: .json/.jsonl/.parquet, 없으면 가장 최근 추출 파일)"""
 
-    # JSON 파일 읽기
-    with open('extracted_products.json', 'r', encoding='utf-8') as f:
-        products = json.load(f)
+    index = load_index(data_file)
 
     print("=" * 80)
     print("🔍 제품 검색")
@@ -29,40 +30,25 @@ def search_product(product_name=None, color=None, size=None):
         print(f"칼라: {color}")
     if size:
         print(f"사이즈: {size}")
+    if wholesaler:
+        print(f"도매인: {wholesaler}")
     print()
 
-    # 검색
+    # 인덱스 검색
     results = []
-    for p in products:
-        match = True
-
-        if product_name and product_name.lower() not in p['product_name'].lower():
-            match = False
-
-        if color and color.lower() not in p['color'].lower():
-            match = False
-
-        if match:
-            if size:
-                # 특정 사이즈만
-                if size in p['quantities']:
-                    results.append({
-                        'product': p['product_name'],
-                        'color': p['color'],
-                        'size': size,
-                        'quantity': p['quantities'][size]
-                    })
-            else:
-                # 모든 사이즈
-                for s, qty in p['quantities'].items():
-                    results.append({
-                        'product': p['product_name'],
-                        'color': p['color'],
-                        'size': s,
-                        'quantity': qty,
-                        'wholesaler': p.get('wholesaler', '-'), # 도매인 추가
-                        'file_name': p.get('file_name', '-') # 파일명 추가
-                    })
+    for idx in index.search(product_name, color, size, wholesaler):
+        p = index.products[idx]
+        # 특정 사이즈만 또는 모든 사이즈
+        sizes = [size] if size else list(p['quantities'])
+        for s in sizes:
+            results.append({
+                'product': p['product_name'],
+                'color': p['color'],
+                'size': s,
+                'quantity': p['quantities'][s],
+                'wholesaler': p.get('wholesaler', '-'), # 도매인 추가
+                'file_name': p.get('file_name', '-') # 파일명 추가
+            })
 
     # 결과 출력
     if results:
@@ -90,11 +76,10 @@ def search_product(product_name=None, color=None, size=None):
 
     print()
 
-def show_all_products():
+def show_all_products(data_file=None):
     """전체 제품 목록 표시"""
 
-    with open('extracted_products.json', 'r', encoding='utf-8') as f:
-        products = json.load(f)
+    index = load_index(data_file)
 
     print("=" * 80)
     print("📋 전체 제품 목록")
@@ -102,10 +87,8 @@ def show_all_products():
     print()
 
     # 제품명 목록
-    product_names = sorted(set(p['product_name'] for p in products))
     print("🔹 제품명:")
-    for name in product_names:
-        colors = sorted(set(p['color'] for p in products if p['product_name'] == name))
+    for name, colors in index.name_colors().items():
         print(f"   - {name} ({', '.join(colors)})")
 
     print()
@@ -142,8 +125,9 @@ if __name__ == '__main__':
         product = sys.argv[1] if len(sys.argv) > 1 else None
         color = sys.argv[2] if len(sys.argv) > 2 else None
         size = sys.argv[3] if len(sys.argv) > 3 else None
+        wholesaler = sys.argv[4] if len(sys.argv) > 4 else None
 
-        search_product(product, color, size)
+        search_product(product or None, color or None, size or None, wholesaler or None)
     else:
         # 대화형 모드
         interactive_search()
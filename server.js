@@ -109,6 +109,22 @@ app.post('/api/mapping-memory', async (req, res) => {
 	res.json({ success: true });
 });
 
+// 매핑 기억 일괄 저장 (memory_writer.py write-behind 큐가 모아서 호출)
+app.post('/api/mapping-memory/batch', async (req, res) => {
+	const rows = req.body;
+	if (!Array.isArray(rows)) return res.status(400).json({ error: 'Invalid data format' });
+
+	const CHUNK_SIZE = 500;
+	for (let i = 0; i < rows.length; i += CHUNK_SIZE) {
+		const chunk = rows
+			.slice(i, i + CHUNK_SIZE)
+			.map(({ mappingKey, productCode, fileName }) => ({ mappingKey, productCode, fileName }));
+		const { error } = await supabase.from('mappingMemory').upsert(chunk);
+		if (error) return res.status(500).json({ error: error.message });
+	}
+	res.json({ success: true, count: rows.length });
+});
+
 app.delete('/api/mapping-memory', async (req, res) => {
 	const { mappingKey } = req.body;
 	const { error } = await supabase.from('mappingMemory').delete().eq('mappingKey', mappingKey);
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+칼라/옵션 유사도 계산 (레벤슈타인 거리 기반 0-100)
+
+app.js calculateSimilarity / editDistance 는 후보마다 전체 DP 표를 채운다.
+여기서는 원본 칼라 하나를 비트 마스크로 한 번만 만들어 두고
+(Myers / Hyyrö 비트 병렬 알고리즘) 여러 옵션 문자열과 한 줄씩 비교한다.
+
+- 결과 점수는 기존 calculateSimilarity 와 같다: (긴 길이 - 거리) / 긴 길이 * 100
+- min_similarity 를 주면 그 이하가 확실한 옵션은 길이 차이만 보고 건너뛰거나
+  계산 도중 멈추고 None 을 돌려준다.
+
+사용법:
+    python similarity.py [비교 횟수]   # 기존 방식 대비 초당 비교 횟수
+"""
+
+import sys
+import time
+import random
+
+# UTF-8 출력 설정
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+def edit_distance(s1, s2):
+    """레벤슈타인 거리 (app.js editDistance 와 같은 한 줄 DP)"""
+    costs = list(range(len(s2) + 1))
+    for i in range(1, len(s1) + 1):
+        last_value = i
+        c1 = s1[i - 1]
+        for j in range(1, len(s2) + 1):
+            new_value = costs[j - 1]
+            if c1 != s2[j - 1]:
+                new_value = min(new_value, last_value, costs[j]) + 1
+            costs[j - 1] = last_value
+            last_value = new_value
+        costs[len(s2)] = last_value
+    return costs[len(s2)]
+
+def calculate_similarity(s1, s2):
+    """레벤슈타인 거리 기반 유사도 (0-100) - app.js calculateSimilarity 그대로"""
+    longer, shorter = (s1, s2) if len(s1) > len(s2) else (s2, s1)
+    if len(longer) == 0:
+        return 100.0
+    return (len(longer) - edit_distance(longer, shorter)) / len(longer) * 100
+
+def _score(longest, distance):
+    return (longest - distance) / longest * 100
+
+def distance_limit(longest, min_similarity):
+    """유사도가 min_similarity 이하가 되는 가장 작은 거리 (이 거리 이상이면 탈락)"""
+    limit = max(0, int(longest * (1 - min_similarity / 100)))
+    # 부동소수점 경계는 실제 점수 식으로 맞춘다
+    while limit > 0 and _score(longest, limit - 1) <= min_similarity:
+        limit -= 1
+    while limit <= longest and _score(longest, limit) > min_similarity:
+        limit += 1
+    return limit
+
+class SimilarityScorer:
+    """원본 문자열 하나를 여러 옵션 문자열과 비교 (비트 마스크는 한 번만 생성)"""
+
+    def __init__(self, source, memo=True):
+        self.source = source
+        self.memo = memo
+        self.length = len(source)
+        self.full = (1 << self.length) - 1
+        self.high = 1 << (self.length - 1) if self.length else 0
+        self.peq = {}
+        for i, ch in enumerate(source):
+            self.peq[ch] = self.peq.get(ch, 0) | (1 << i)
+        self._memo = {}
+
+    def distance(self, text, limit=None):
+        """Myers/Hyyrö 비트 병렬 전역 편집 거리
+
+        limit: 거리가 limit 이상으로 확정되면 계산을 멈추고 limit 반환
+        """
+        m = self.length
+        n = len(text)
+        if m == 0:
+            return n if limit is None else min(n, limit)
+        if limit is not None and abs(m - n) >= limit:
+            return limit
+
+        full, high, peq = self.full, self.high, self.peq
+        pv, mv, score = full, 0, m
+        for j, ch in enumerate(text):
+            eq = peq.get(ch, 0)
+            xv = eq | mv
+            xh = (((eq & pv) + pv) ^ pv) | eq
+            ph = mv | (~(xh | pv) & full)
+            mh = pv & xh
+            if ph & high:
+                score += 1
+            elif mh & high:
+                score -= 1
+            # 남은 열마다 최대 1씩만 줄어들 수 있음
+            if limit is not None and score - (n - j - 1) >= limit:
+                return limit
+            ph = ((ph << 1) | 1) & full
+            mh = (mh << 1) & full
+            pv = mh | (~(xv | ph) & full)
+            mv = ph & xv
+        return score
+
+    def score(self, text, min_similarity=None):
+        """유사도 (0-100) - min_similarity 이하가 확실하면 None"""
+        key = (text, min_similarity)
+        if self.memo and key in self._memo:
+            return self._memo[key]
+
+        longest = max(self.length, len(text))
+        if longest == 0:
+            result = 100.0
+        elif min_similarity is None:
+            result = _score(longest, self.distance(text))
+        else:
+            limit = distance_limit(longest, min_similarity)
+            distance = self.distance(text, limit)
+            result = None if distance >= limit else _score(longest, distance)
+
+        if self.memo:
+            self._memo[key] = result
+        return result
+
+    def score_many(self, texts, min_similarity=None):
+        return [self.score(text, min_similarity) for text in texts]
+
+def similarity(s1, s2, min_similarity=None):
+    """calculate_similarity 와 같은 점수 (비트 병렬)"""
+    return SimilarityScorer(s1).score(s2, min_similarity)
+
+def _random_options(n, seed=0):
+    rng = random.Random(seed)
+    colors = ['핑크', '진핑크', '연핑크', '블루', '연블루', '화이트', '블랙', '옐로우', '아이보리', '실버', '퍼플',
+              '라이트그레이', '다크네이비', '형광그린', '배색핑크블루']
+    sizes = ['120', '130', '140', '150', '160', '170', '180', '190', '200', 's', 'm', 'l', 'free']
+    options = []
+    for _ in range(n):
+        color = rng.choice(colors)
+        size = rng.choice(sizes)
+        fmt = rng.random()
+        if fmt < 0.6:
+            options.append(f'{color}:{size}')
+        elif fmt < 0.8:
+            options.append(f'{color}({size})')
+        else:
+            options.append(f'{color}/{size},{rng.choice(colors)}')
+    return colors, options
+
+def benchmark(n_comparisons=200000):
+    """기존 DP 대비 초당 비교 횟수 (결과 일치 확인 포함)
+
+    일괄 비교는 중복 옵션 메모 없이 순수 계산 속도만 잰다.
+    """
+    colors, _ = _random_options(0)
+    sources = colors
+    _, options = _random_options(n_comparisons // len(sources) + 1)
+    total = len(options) * len(sources)
+
+    def run(func):
+        start = time.perf_counter()
+        results = func()
+        return time.perf_counter() - start, results
+
+    baseline_time, baseline = run(lambda: [[calculate_similarity(s, o) for o in options] for s in sources])
+    single_time, single = run(lambda: [[similarity(s, o) for o in options] for s in sources])
+    batch_time, batch = run(lambda: [SimilarityScorer(s, memo=False).score_many(options) for s in sources])
+
+    # 매칭 엔진과 같은 조건: 사이즈 일치 시 60 점을 넘으려면 칼라 유사도 > 42.857...
+    cutoff = (60 - 30) / 0.7
+    cutoff_time, cut = run(lambda: [SimilarityScorer(s, memo=False).score_many(options, cutoff) for s in sources])
+
+    same = baseline == single == batch
+    cut_same = all((b if b > cutoff else None) == c
+                   for row_b, row_c in zip(baseline, cut) for b, c in zip(row_b, row_c))
+
+    print("=" * 80)
+    print(f"📈 유사도 계산 벤치마크 ({total:,}회 비교, 원본 칼라 {len(sources)}개)")
+    print("=" * 80)
+    print(f"  기존 DP (calculateSimilarity) : {total / baseline_time:12,.0f} 회/초")
+    print(f"  비트 병렬 (1:1)               : {total / single_time:12,.0f} 회/초")
+    print(f"  비트 병렬 (1:N 일괄)          : {total / batch_time:12,.0f} 회/초")
+    print(f"  비트 병렬 + 컷오프 {cutoff:.1f}     : {total / cutoff_time:12,.0f} 회/초")
+    print(f"  결과 일치 : {'✅' if same and cut_same else '❌'}")
+
+if __name__ == '__main__':
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
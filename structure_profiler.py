@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""
+패킹리스트 구조 프로파일러 - 키워드 위치 / 열별 숫자 분포를 한 번에
+
+analyze_excel_structure / analyze_new_file 은 키워드마다 모든 셀을
+str(df.iloc[r, c]) 로 다시 훑고, 숫자 분포도 행 x 열 파이썬 루프로 셌다.
+여기서는
+- 검사 영역을 한 번만 문자열 배열로 바꾸고 (layout_detector.window_text)
+- 서로 다른 셀 문자열만 이어 붙여 다중 패턴 오토마톤(Aho-Corasick)으로
+  모든 키워드를 한 번에 찾고
+- 열별 숫자 개수는 시트 전체를 배열 연산으로 센다.
+결과는 콘솔 출력 대신 JSON 으로 저장할 수 있는 dict (프로파일)로 돌려준다.
+
+행/열 번호는 0부터 (layout_detector 블록과 같음).
+
+사용법:
+    python structure_profiler.py <엑셀 파일> ... [-o profile.json]   # 시트별 프로파일 JSON
+    python structure_profiler.py bench [시트 수] [행 수]              # 기존 셀 루프 대비
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+from collections import deque
+import numpy as np
+import pandas as pd
+
+from layout_detector import WINDOW_ROWS, WINDOW_COLS, window_text, classify
+from workbook_loader import open_workbook
+
+# UTF-8 출력 설정
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+# analyze_excel_structure / analyze_new_file 키워드 합집합
+DEFAULT_KEYWORDS = ['품명', '칼라', '색상', '사이즈', 'SIZE', '수량', 'QTY', '120', '130', '140', 'FREE', 'L']
+DEFAULT_SCAN_ROWS = 30
+
+# 셀 구분자 - 키워드에 들어가지 않으므로 매칭이 셀 경계를 넘지 않음
+_SEPARATOR = '\x00'
+
+class KeywordAutomaton:
+    """Aho-Corasick 다중 키워드 검색 (겹치는 키워드도 모두 찾음)"""
+
+    def __init__(self, keywords):
+        self.keywords = list(dict.fromkeys(keywords))
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        for index, keyword in enumerate(self.keywords):
+            state = 0
+            for ch in keyword:
+                following = self._goto[state].get(ch)
+                if following is None:
+                    following = self._goto[state][ch] = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = following
+            self._out[state] += (index,)
+
+        # 실패 링크 (너비 우선) - 출력은 실패 링크 쪽 키워드까지 합쳐 둠
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, following in self._goto[state].items():
+                queue.append(following)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[following] = self._goto[fail].get(ch, 0)
+                self._out[following] += self._out[self._fail[following]]
+
+    def finditer(self, text):
+        """(끝 위치, 키워드 번호) 를 순서대로"""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for pos, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for index in out[state]:
+                yield pos, index
+
+    def cell_hits(self, strings):
+        """문자열 목록을 한 번에 훑어서 [해당 문자열에 든 키워드 번호 집합]"""
+        hits = [set() for _ in strings]
+        if not strings:
+            return hits
+        joined = _SEPARATOR.join(strings)
+        ends = np.cumsum([len(s) + 1 for s in strings])  # 각 문자열 다음 구분자 위치 + 1
+        for pos, index in self.finditer(joined):
+            hits[int(np.searchsorted(ends, pos, side='right'))].add(index)
+        return hits
+
+def numeric_counts(df):
+    """열별 0보다 큰 숫자 셀 개수 (문자열로 적힌 숫자는 세지 않음)"""
+    if df.size == 0:
+        return np.zeros(df.shape[1], dtype=np.int64)
+    values = df.to_numpy(dtype=object)
+    is_text = np.frompyfunc(isinstance, 2, 1)(values, str).astype(bool)
+    numbers = pd.to_numeric(pd.Series(np.where(is_text, None, values).ravel()), errors='coerce')
+    with np.errstate(invalid='ignore'):
+        positive = (numbers.to_numpy(dtype=float) > 0).reshape(values.shape)
+    return positive.sum(axis=0)
+
+def profile_sheet(df, sheet_name=None, keywords=DEFAULT_KEYWORDS, scan_rows=DEFAULT_SCAN_ROWS, automaton=None):
+    """시트 하나의 구조 프로파일
+
+    keywords: 앞쪽 scan_rows 행 전체 열에서 찾을 키워드 (automaton 을 주면 그쪽 키워드)
+    반환: {'sheet', 'rows', 'cols', 'table_type',
+           'keywords': {키워드: [{'row', 'col', 'value'}]},   # 행 우선 순서
+           'numeric_columns': [{'col', 'count', 'density'}]}  # 숫자가 있는 열만
+    """
+    automaton = automaton or KeywordAutomaton(keywords)
+    # 키워드 영역과 표 형태 감지 영역을 한 번에 문자열로 바꾸고 잘라서 씀
+    window = window_text(df, max(scan_rows, WINDOW_ROWS), df.shape[1])
+    text = window[:scan_rows]
+
+    unique, inverse = np.unique(text.ravel(), return_inverse=True)
+    hits = automaton.cell_hits(unique.tolist())
+    found = {keyword: [] for keyword in automaton.keywords}
+    for cell in np.flatnonzero(np.fromiter((bool(h) for h in hits), dtype=bool, count=len(hits))[inverse]):
+        row, col = divmod(int(cell), text.shape[1])
+        for index in sorted(hits[inverse[cell]]):
+            found[automaton.keywords[index]].append({'row': row, 'col': col, 'value': str(text[row, col])})
+
+    counts = numeric_counts(df)
+    rows = df.shape[0]
+    numeric_columns = [{'col': int(col), 'count': int(counts[col]), 'density': round(counts[col] / rows, 4)}
+                       for col in np.flatnonzero(counts)]
+
+    return {
+        'sheet': sheet_name,
+        'rows': int(df.shape[0]),
+        'cols': int(df.shape[1]),
+        'table_type': classify(window[:WINDOW_ROWS, :WINDOW_COLS]),
+        'keywords': found,
+        'numeric_columns': numeric_columns,
+    }
+
+def profile_workbook(workbook, keywords=DEFAULT_KEYWORDS, scan_rows=DEFAULT_SCAN_ROWS, skip_first=True):
+    """워크북 전체 프로파일 (workbook: WorkbookReader)
+
+    반환: {'file', 'sheets': [시트 프로파일], 'skipped': [시트명], 'load_seconds', 'profile_seconds'}
+    첫 번째(통관용) 시트는 skip_first 면 디코딩하지 않는다.
+    """
+    automaton = KeywordAutomaton(keywords)
+    sheets = []
+    skipped = []
+    load_seconds = 0.0
+    profile_seconds = 0.0
+    for idx, sheet_name in enumerate(workbook.sheet_names):
+        if skip_first and idx == 0:
+            skipped.append(sheet_name)
+            continue
+        start = time.perf_counter()
+        df = workbook.sheet(sheet_name)
+        load_seconds += time.perf_counter() - start
+        start = time.perf_counter()
+        sheets.append(profile_sheet(df, sheet_name, scan_rows=scan_rows, automaton=automaton))
+        profile_seconds += time.perf_counter() - start
+    return {
+        'file': os.path.basename(workbook.file_path),
+        'sheets': sheets,
+        'skipped': skipped,
+        'load_seconds': round(load_seconds, 4),
+        'profile_seconds': round(profile_seconds, 4),
+    }
+
+def print_profile(profile, max_positions=None, value=True):
+    """시트 프로파일을 기존 분석 스크립트 형식으로 출력"""
+    print("\n\n📌 주요 패턴 분석:\n")
+    for keyword, positions in profile['keywords'].items():
+        if not positions:
+            print(f"  ✗ '{keyword}' 미발견")
+            continue
+        for p in positions[:max_positions]:
+            detail = f" (값: {p['value']})" if value else ''
+            print(f"  ✓ '{keyword}' 발견: 행 {p['row'] + 1}, 열 {p['col'] + 1}{detail}")
+
+    print("\n\n📊 숫자 데이터 분포:\n")
+    for column in profile['numeric_columns']:
+        print(f"  열 {column['col'] + 1}: {column['count']}개의 숫자 (밀도 {column['density']:.0%})")
+
+def _legacy_profile(df, keywords, scan_rows):
+    """비교용: 키워드마다 str(df.iloc[r, c]) 셀 루프 + 숫자 분포 행 x 열 루프 (기존 분석 스크립트 방식)"""
+    found = {}
+    for keyword in keywords:
+        found[keyword] = []
+        for row_idx in range(min(scan_rows, len(df))):
+            for col_idx in range(len(df.columns)):
+                if keyword in str(df.iloc[row_idx, col_idx]):
+                    found[keyword].append((row_idx, col_idx))
+    counts = {}
+    for col_idx in range(len(df.columns)):
+        numeric_count = 0
+        for row_idx in range(len(df)):
+            val = df.iloc[row_idx, col_idx]
+            if pd.notna(val) and isinstance(val, (int, float, np.number)) and val > 0:
+                numeric_count += 1
+        if numeric_count > 0:
+            counts[col_idx] = numeric_count
+    return found, counts
+
+def write_profile_workbook(path, n_sheets=50, rows=200):
+    """패킹 표 시트 n_sheets 개짜리 .xlsx (벤치마크용, 첫 시트는 통관용)"""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    customs = workbook.create_sheet('통관용')
+    customs.append(['INVOICE', 'QTY'])
+    for n in range(n_sheets):
+        sheet = workbook.create_sheet(f'도매{n:02d}')
+        sheet.append([f'PACKING LIST {n}'])
+        sheet.append([])
+        sheet.append(['NO', 'CTN', 'CBM', '', '', '', '', '품명', '칼라', '합계', 120, 130, 140, 150, 'FREE'])
+        for i in range(rows):
+            sheet.append([i + 1, i % 40, 0.12, '', '', '', '', f'상품{i} L', '블랙' if i % 2 else '핑크/L',
+                          100, 10, 20, 30, 40, None if i % 3 else 5])
+    workbook.save(path)
+
+def benchmark(n_sheets=50, rows=200):
+    """n_sheets 시트 워크북 - 기존 셀 루프 대비 프로파일러 (시트 디코딩 시간 제외)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'profile.xlsx')
+        write_profile_workbook(path, n_sheets, rows)
+        with open_workbook(path, track_memory=False) as workbook:
+            profile = profile_workbook(workbook)
+            frames = [(s['sheet'], workbook.sheet(s['sheet'])) for s in profile['sheets']]
+
+            start = time.perf_counter()
+            legacy = [_legacy_profile(df, DEFAULT_KEYWORDS, DEFAULT_SCAN_ROWS) for _, df in frames]
+            legacy_seconds = time.perf_counter() - start
+
+    same = all(
+        {k: [(p['row'], p['col']) for p in v] for k, v in sheet['keywords'].items()} == found
+        and {c['col']: c['count'] for c in sheet['numeric_columns']} == counts
+        for sheet, (found, counts) in zip(profile['sheets'], legacy)
+    )
+    print("=" * 80)
+    print(f"📈 구조 프로파일 벤치마크 ({n_sheets}개 시트 x {rows}행, 키워드 {len(DEFAULT_KEYWORDS)}개)")
+    print("=" * 80)
+    print(f"  시트 디코딩 (공통)    : {profile['load_seconds']:7.3f}초")
+    print(f"  기존 셀 루프          : {legacy_seconds:7.3f}초")
+    print(f"  프로파일러            : {profile['profile_seconds']:7.3f}초  "
+          f"({legacy_seconds / profile['profile_seconds']:.0f}배)")
+    print(f"  결과 일치: {'✅' if same else '❌'}")
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench':
+        numbers = [int(a) for a in sys.argv[2:]]
+        benchmark(numbers[0] if numbers else 50, numbers[1] if len(numbers) > 1 else 200)
+        sys.exit(0)
+
+    args = sys.argv[1:]
+    output = None
+    if '-o' in args:
+        i = args.index('-o')
+        output = args[i + 1]
+        args = args[:i] + args[i + 2:]
+    if not args:
+        print(__doc__)
+        sys.exit(1)
+
+    profiles = []
+    for file_path in args:
+        with open_workbook(file_path, track_memory=False) as workbook:
+            profiles.append(profile_workbook(workbook))
+
+    payload = json.dumps(profiles if len(profiles) > 1 else profiles[0], ensure_ascii=False, indent=2)
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        print(f"💾 구조 프로파일이 '{output}'에 저장되었습니다.")
+    else:
+        print(payload)
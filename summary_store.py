@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+추출 데이터 요약(집계) 저장소
+
+제품 데이터 파일 옆에 집계만 담은 작은 JSON 을 둔다
+(extracted_products.json.summary.json).
+
+- 전체: 제품 수, 총 수량
+- 제품별 / 제품×칼라별 / 사이즈별 / 도매인×파일별 수량 합계
+
+요약 파일에는 원본 파일의 크기/수정 시각을 함께 저장해서
+- 원본이 그대로면 요약 파일만 읽고 (데이터 크기와 무관)
+- .jsonl 이 뒤에 이어 쓰였으면 새 줄만 읽어 더하고
+- 그 외 변경은 전체를 다시 집계한다.
+append_with_summary 로 추가하면 추가한 제품만 더해 바로 갱신한다.
+
+사용법:
+    python summary_store.py [데이터 파일]   # 요약 출력 (없으면 생성)
+"""
+
+import os
+import sys
+import json
+import time
+
+from product_store import iter_products, append_products, storage_format, find_data_file
+
+# UTF-8 출력 설정
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+# 집계 구조가 바뀌면 버전을 올려 저장된 요약을 무효화
+SUMMARY_VERSION = 1
+
+SUMMARY_COLUMNS = ['product_name', 'color', 'wholesaler', 'file_name', 'quantities']
+
+def summary_path(data_file):
+    """데이터 파일 옆에 저장되는 요약 파일 경로 (형식별로 따로 - search_index.index_path 와 같음)"""
+    return data_file + '.summary.json'
+
+def _source_state(data_file):
+    stat = os.stat(data_file)
+    return {'path': os.path.abspath(data_file), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+class SummaryStore:
+    """제품 수량 집계"""
+
+    def __init__(self, data=None):
+        data = data or {}
+        self.source = data.get('source')
+        self.product_count = data.get('product_count', 0)
+        self.total_qty = data.get('total_qty', 0)
+        self.by_product = data.get('by_product', {})
+        self.by_product_color = data.get('by_product_color', {})
+        self.by_size = data.get('by_size', {})
+        self.by_wholesaler_file = data.get('by_wholesaler_file', {})
+
+    def add(self, products):
+        """제품 목록을 집계에 더하기 (제품마다 합계는 한 번만 계산)"""
+        for p in products:
+            total = 0
+            for size, qty in p['quantities'].items():
+                self.by_size[size] = self.by_size.get(size, 0) + qty
+                total += qty
+
+            name = p['product_name']
+            self.by_product[name] = self.by_product.get(name, 0) + total
+
+            colors = self.by_product_color.setdefault(name, {})
+            colors[p['color']] = colors.get(p['color'], 0) + total
+
+            files = self.by_wholesaler_file.setdefault(p.get('wholesaler', '-'), {})
+            file_name = p.get('file_name', '-')
+            files[file_name] = files.get(file_name, 0) + total
+
+            self.product_count += 1
+            self.total_qty += total
+
+    def to_dict(self):
+        return {
+            'version': SUMMARY_VERSION,
+            'source': self.source,
+            'product_count': self.product_count,
+            'total_qty': self.total_qty,
+            'by_product': self.by_product,
+            'by_product_color': self.by_product_color,
+            'by_size': self.by_size,
+            'by_wholesaler_file': self.by_wholesaler_file,
+        }
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+
+    def mark_synced(self, data_file):
+        """현재 원본 파일 상태까지 집계했다고 기록 (.jsonl 은 읽은 위치 = 파일 크기)"""
+        self.source = _source_state(data_file)
+
+def _read_summary(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get('version') != SUMMARY_VERSION:
+        return None
+    return SummaryStore(data)
+
+def _ends_line(data_file, offset):
+    """이전에 읽은 위치가 줄 끝인지 (이어 쓰기가 아니라 파일이 바뀐 경우 걸러냄)"""
+    if offset == 0:
+        return True
+    with open(data_file, 'rb') as f:
+        f.seek(offset - 1)
+        return f.read(1) == b'\n'
+
+def _iter_jsonl_from(data_file, offset):
+    """.jsonl 의 offset 바이트 이후 새 줄만 읽기"""
+    with open(data_file, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+def build_summary(data_file):
+    """데이터 파일 전체를 다시 집계"""
+    summary = SummaryStore()
+    summary.add(iter_products(data_file, columns=SUMMARY_COLUMNS))
+    summary.mark_synced(data_file)
+    return summary
+
+def load_summary(data_file=None, save=True):
+    """요약 로드 - 원본이 그대로면 요약 파일만, .jsonl 이 늘었으면 새 줄만 집계
+
+    반환: (SummaryStore, 갱신 방식 'cached' | 'incremental' | 'rebuilt')
+    """
+    data_file = data_file or find_data_file()
+    path = summary_path(data_file)
+    state = _source_state(data_file)
+    summary = _read_summary(path)
+
+    mode = 'rebuilt'
+    if summary is not None and summary.source and summary.source['path'] == state['path']:
+        old = summary.source
+        if old['size'] == state['size'] and old['mtime_ns'] == state['mtime_ns']:
+            return summary, 'cached'
+        appended = (storage_format(data_file) == 'jsonl' and old['size'] < state['size']
+                    and _ends_line(data_file, old['size']))
+        if appended:
+            summary.add(_iter_jsonl_from(data_file, old['size']))
+            summary.mark_synced(data_file)
+            mode = 'incremental'
+        else:
+            summary = None
+    else:
+        summary = None
+
+    if summary is None:
+        summary = build_summary(data_file)
+
+    if save:
+        summary.save(path)
+    return summary, mode
+
+def append_with_summary(data_file, products):
+    """제품 추가 + 요약에 추가분만 더하기"""
+    products = list(products)
+    summary = load_summary(data_file, save=False)[0] if os.path.exists(data_file) else SummaryStore()
+
+    append_products(data_file, products)
+    summary.add(products)
+    summary.mark_synced(data_file)
+    summary.save(summary_path(data_file))
+    return summary
+
+if __name__ == '__main__':
+    data_file = sys.argv[1] if len(sys.argv) > 1 else find_data_file()
+
+    start = time.perf_counter()
+    summary, mode = load_summary(data_file)
+    elapsed = time.perf_counter() - start
+
+    print("=" * 80)
+    print(f"📊 요약: {data_file} ({mode}, {elapsed * 1000:.1f}ms)")
+    print("=" * 80)
+    print(f"\n제품 {summary.product_count:,}개, 총 수량 {summary.total_qty:,}개")
+    print(f"\n사이즈별: {', '.join(f'{s}:{q:,}' for s, q in summary.by_size.items())}")
+    print("\n도매인/파일별:")
+    for wholesaler, files in summary.by_wholesaler_file.items():
+        for file_name, qty in files.items():
+            print(f"   - {wholesaler} / {file_name}: {qty:,}개")
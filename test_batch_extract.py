@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""batch_extract.run_batch 제한 시간 / 비정상 종료 처리"""
+
+import os
+import time
+import signal
+
+import batch_extract
+
+def _fake_worker(index, file_path, wholesaler, use_cache, result_conn):
+    """파일 이름으로 동작 선택: slow-* 는 SIGTERM 을 무시하고 늦게 결과를 보냄, crash-* 는 비정상 종료,
+    big-* 는 파이프 버퍼보다 큰 결과"""
+    name = os.path.basename(file_path)
+    if name.startswith('slow'):
+        # terminate() 가 듣지 않으므로 제한 시간 처리 뒤에 결과를 보내려 함 (파이프는 이미 닫힘)
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        time.sleep(1.0)
+    elif name.startswith('crash'):
+        os._exit(3)
+    products = [{'sheet': 'OH-오즈', 'product_name': name, 'color': '-', 'quantities': {'FREE': 1}}]
+    if name.startswith('big'):
+        products *= 50000
+    try:
+        result_conn.send((index, products, None, 0.0, 0, 0, None))
+    except BrokenPipeError:
+        pass
+
+def test_late_result_after_timeout_is_ignored(monkeypatch):
+    monkeypatch.setattr(batch_extract, '_worker', _fake_worker)
+    results = batch_extract.run_batch(['slow.xls', 'ok1.xls', 'ok2.xls'], workers=1, timeout=0.3)
+
+    assert [r['file'] for r in results] == ['slow.xls', 'ok1.xls', 'ok2.xls']
+    assert results[0]['error'] == '제한 시간 0.3초 초과'
+    assert results[0]['products'] == []
+    assert [r['error'] for r in results[1:]] == [None, None]
+    assert [r['products'][0]['product_name'] for r in results[1:]] == ['ok1.xls', 'ok2.xls']
+
+def test_abnormal_exit_is_recorded(monkeypatch):
+    monkeypatch.setattr(batch_extract, '_worker', _fake_worker)
+    results = batch_extract.run_batch(['crash.xls', 'ok.xls'], workers=2, timeout=30)
+
+    assert results[0]['error'] == '작업 프로세스 비정상 종료 (exit 3)'
+    assert results[1]['error'] is None
+    assert batch_extract.merge_results(results)[0]['product_name'] == 'ok.xls'
+
+def test_large_results_with_slow_neighbour(monkeypatch):
+    monkeypatch.setattr(batch_extract, '_worker', _fake_worker)
+    results = batch_extract.run_batch(['big1.xls', 'slow.xls', 'big2.xls'], workers=3, timeout=0.5)
+
+    assert results[1]['error'] == '제한 시간 0.5초 초과'
+    assert [len(r['products']) for r in results] == [50000, 0, 50000]
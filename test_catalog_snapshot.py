@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""catalog_snapshot 다시 만들기 - 열어 둔 스냅샷 유지, current 교체"""
+
+import os
+import sqlite3
+import threading
+
+import catalog_snapshot
+from catalog_snapshot import CatalogSnapshot, build_snapshot, current_build, load_snapshot
+from product_loader import _empty_db
+
+def _db(tmp_path, n):
+    db_path = os.path.join(tmp_path, 'database.sqlite')
+    if not os.path.exists(db_path):
+        _empty_db(db_path)
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.executemany('INSERT OR REPLACE INTO products VALUES (?, ?, ?, ?, ?, ?)',
+                         [(f'P{i}', 'OH', f'상품{i}', '블랙:120', '', i) for i in range(n)])
+    conn.close()
+    return db_path
+
+def _builds(path):
+    return sorted(name for name in os.listdir(path) if name.startswith(catalog_snapshot.BUILD_PREFIX))
+
+def test_rebuild_keeps_open_snapshot(tmp_path):
+    path = os.path.join(tmp_path, 'snapshot')
+    db_path = _db(tmp_path, 3)
+    first, mode = load_snapshot(db_path, path)
+    assert mode == 'rebuilt'
+    assert load_snapshot(db_path, path)[1] == 'cached'
+
+    _db(tmp_path, 5)
+    second, mode = load_snapshot(db_path, path)
+    assert mode == 'rebuilt'
+    assert current_build(path) == second.path != first.path
+    # 이미 연 스냅샷과 그 빌드 디렉터리는 그대로 (작업 프로세스가 다시 열 수 있음)
+    assert [p['productCode'] for p in first] == ['P0', 'P1', 'P2']
+    assert len(CatalogSnapshot(first.path)) == 3
+    assert len(CatalogSnapshot(path)) == 5
+
+def test_concurrent_rebuilds_and_cleanup(tmp_path, monkeypatch):
+    path = os.path.join(tmp_path, 'snapshot')
+    db_path = _db(tmp_path, 50)
+    threads = [threading.Thread(target=build_snapshot, args=(db_path, path)) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(_builds(path)) == 4
+    assert len(CatalogSnapshot(path)) == 50
+
+    # 대기 시간이 지나면 current 외 빌드는 다음 빌드 때 삭제
+    monkeypatch.setattr(catalog_snapshot, 'BUILD_GRACE', -1)
+    build = build_snapshot(db_path, path)
+    assert _builds(path) == [os.path.basename(build)]
+    assert sorted(os.listdir(path)) == [os.path.basename(build), catalog_snapshot.CURRENT_FILE]
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""delta_sync 도매인 사이 상품코드 이동"""
+
+import os
+import csv
+import sqlite3
+
+from product_loader import load_products_file, _empty_db
+from delta_sync import sync_products_file, changes_since
+
+def _export(path, rows):
+    """(상품코드, 상품명, 옵션, 가용재고) 목록 -> EzAdmin 상품 내보내기 CSV"""
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['상품코드', '상품명', '옵션', '바코드', '가용재고'])
+        for code, name, option, stock in rows:
+            writer.writerow([code, name, option, '', stock])
+    return path
+
+def _products(db_path):
+    conn = sqlite3.connect(db_path)
+    rows = dict(conn.execute('SELECT productCode, wholesaler FROM products'))
+    conn.close()
+    return rows
+
+def _db(tmp_path):
+    db_path = os.path.join(tmp_path, 'database.sqlite')
+    _empty_db(db_path)
+    return db_path
+
+def test_full_load_move_not_deleted_by_old_wholesaler(tmp_path):
+    db_path = _db(tmp_path)
+    sync_products_file(_export(os.path.join(tmp_path, 'a.csv'), [
+        ('C1', '티셔츠', '블랙:120', 5), ('C2', '바지', '화이트:130', 3)]), 'A', db_path)
+
+    # 전체 적재로 C2 가 B 로 넘어감
+    load_products_file(_export(os.path.join(tmp_path, 'b.csv'), [
+        ('C2', '바지', '화이트:130', 3), ('C3', '가방', '핑크:FREE', 1)]), 'B', db_path, tokenize=False)
+    assert _products(db_path) == {'C1': 'A', 'C2': 'B', 'C3': 'B'}
+
+    stats = sync_products_file(_export(os.path.join(tmp_path, 'a2.csv'), [('C1', '티셔츠', '블랙:120', 5)]),
+                               'A', db_path)
+    assert stats['deleted'] == 0
+    assert _products(db_path) == {'C1': 'A', 'C2': 'B', 'C3': 'B'}
+
+    # B 파일에서 빠지면 B 동기화가 지움
+    stats = sync_products_file(_export(os.path.join(tmp_path, 'b2.csv'), [('C3', '가방', '핑크:FREE', 1)]),
+                               'B', db_path)
+    assert stats['deleted'] == 1
+    assert _products(db_path) == {'C1': 'A', 'C3': 'B'}
+
+def test_sync_move_between_wholesalers(tmp_path):
+    db_path = _db(tmp_path)
+    sync_products_file(_export(os.path.join(tmp_path, 'a.csv'), [
+        ('C1', '티셔츠', '블랙:120', 5), ('C2', '바지', '화이트:130', 3)]), 'A', db_path)
+
+    conn = sqlite3.connect(db_path)
+    version = changes_since(conn, 0)['version']
+    conn.close()
+
+    # 동기화로 C2 가 B 로 넘어감 - 수정으로 기록되고 A 동기화에서 지워지지 않음
+    stats = sync_products_file(_export(os.path.join(tmp_path, 'b.csv'), [('C2', '바지', '화이트:130', 3)]),
+                               'B', db_path)
+    assert (stats['inserted'], stats['updated'], stats['deleted']) == (0, 1, 0)
+    stats = sync_products_file(_export(os.path.join(tmp_path, 'a2.csv'), [('C1', '티셔츠', '블랙:120', 5)]),
+                               'A', db_path)
+    assert stats['deleted'] == 0
+    assert _products(db_path) == {'C1': 'A', 'C2': 'B'}
+
+    conn = sqlite3.connect(db_path)
+    changes = changes_since(conn, version)
+    conn.close()
+    assert [(p['productCode'], p['wholesaler']) for p in changes['upserts']] == [('C2', 'B')]
+    assert changes['deletes'] == []
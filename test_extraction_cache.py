@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""extraction_cache 적중/미적중 집계"""
+
+import os
+
+from extraction_cache import ExtractionCache, SHEET_LIST_KEY
+
+def _cache(tmp_path):
+    return ExtractionCache(os.path.join(tmp_path, 'cache.sqlite'))
+
+def test_reserved_lookup_not_counted(tmp_path):
+    cache = _cache(tmp_path)
+    assert cache.get('h', SHEET_LIST_KEY, 'x:1', count=False) is None
+    cache.put('h', SHEET_LIST_KEY, 'x:1', ['OH-오즈'])
+    assert cache.get('h', SHEET_LIST_KEY, 'x:1', count=False) == ['OH-오즈']
+    assert (cache.hits, cache.misses) == (0, 0)
+
+    assert cache.get('h', 'OH-오즈', 'x:1') is None
+    cache.put('h', 'OH-오즈', 'x:1', [])
+    assert cache.get('h', 'OH-오즈', 'x:1') == []
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.close()
+
+def test_extract_cached_counts_sheet_results_only(tmp_path):
+    from workbook_loader import open_workbook, write_mixed_xlsx
+    from extraction_cache import extract_cached
+
+    path = os.path.join(tmp_path, 'mixed.xlsx')
+    write_mixed_xlsx(path, extra_sheets=2, rows=20)
+
+    def extract_one(workbook, sheet_name):
+        return [{'sheet': sheet_name, 'rows': int(workbook.sheet(sheet_name).shape[0])}]
+
+    # 첫 실행은 미적중 1회, 다시 열면 적중 1회 (카운터는 캐시 객체마다)
+    for expected in [(0, 1), (1, 0)]:
+        cache = _cache(tmp_path)
+        with open_workbook(path) as workbook:
+            results = extract_cached(cache, workbook, 'x:1', extract_one)
+        # 시트 목록 / 가지치기 판정 조회는 세지 않음 - 표 시트 1개만
+        assert [(idx, name) for idx, name, _, _ in results] == [(1, 'OH-오즈')]
+        assert (cache.hits, cache.misses) == expected
+        cache.close()
+
+def test_extract_cached_keeps_workbook_sheet_index(tmp_path):
+    from openpyxl import Workbook
+    from workbook_loader import open_workbook
+    from extraction_cache import extract_cached
+
+    path = os.path.join(tmp_path, 'pruned_first.xlsx')
+    workbook = Workbook()
+    workbook.active.title = '통관용'
+    workbook.create_sheet('메모').append(['NO', 'REMARK'])
+    workbook.create_sheet('OH-오즈').append(['품명', '칼라', '120'])
+    workbook.save(path)
+
+    cache = _cache(tmp_path)
+    with open_workbook(path) as reader:
+        assert reader.table_sheets() == [(2, 'OH-오즈')]
+        results = extract_cached(cache, reader, 'x:1', lambda wb, name: [])
+    assert [(idx, name) for idx, name, _, _ in results] == [(2, 'OH-오즈')]
+    cache.close()
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""ezadmin_export 도매인 파일명 / 도매인별 쓰기 실패"""
+
+import os
+import pytest
+from datetime import datetime
+
+import ezadmin_export
+from ezadmin_export import write_exports, read_export
+
+def _result(wholesaler, code, qty):
+    return {'source': {'wholesaler': wholesaler, 'fileName': 'a.xlsx', 'quantities': {'120': qty}},
+            'target': {'productCode': code}, 'status': 'success'}
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_unsafe_names_and_failed_wholesaler(tmp_path, monkeypatch, workers):
+    write_csv = ezadmin_export._write_csv
+
+    def flaky_write(path, rows):
+        if rows[0][0] == 'BAD':
+            raise OSError('디스크 가득 참')
+        write_csv(path, rows)
+
+    monkeypatch.setattr(ezadmin_export, '_write_csv', flaky_write)
+    results = [_result('A/B', 'P1', 1), _result('A_B', 'P2', 2), _result('x<>|:*?"', 'BAD', 3),
+               _result('../up', 'P3', 4)]
+    directory = os.path.join(tmp_path, 'exports')
+    exported = write_exports(results, 'csv', directory, datetime(2026, 1, 15, 9, 30), workers)
+
+    files = exported['files']
+    assert [f['wholesaler'] for f in files] == ['A/B', 'A_B', 'x<>|:*?"', '../up']
+    assert [f['error'] for f in files] == [None, None, 'OSError: 디스크 가득 참', None]
+    assert [f['rows'] for f in files] == [1, 1, 0, 1]
+    # 모든 파일이 directory 바로 아래, 서로 다른 이름 / 실패한 파일은 남지 않음
+    assert sorted(os.listdir(directory)) == sorted(os.path.basename(f['path']) for f in files if not f['error'])
+    assert len({f['path'] for f in files}) == 4
+    assert all(os.path.dirname(f['path']) == directory for f in files)
+    assert b'P1' in read_export('A/B', exported['timestamp'], 'csv', directory)
+    assert b'P2' in read_export('A_B', exported['timestamp'], 'csv', directory)
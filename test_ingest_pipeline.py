@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""ingest_pipeline 단계별 오류 처리"""
+
+import os
+import threading
+import pytest
+
+from ingest_pipeline import ingest
+from workbook_loader import write_mixed_xlsx
+
+class _Service:
+    """MappingMemory 대신 - 파일명이 bad 로 시작하면 자동 매칭 실패"""
+
+    def __init__(self, fail_resolve=False):
+        self.fail_resolve = fail_resolve
+
+    def auto_match(self, items, engine, mapping_cache=None):
+        if items and items[0]['file_name'].startswith('bad'):
+            raise RuntimeError('매칭 실패')
+        return {}
+
+    def resolve_all(self, products, engine=None, matched=None):
+        if self.fail_resolve:
+            raise RuntimeError('기억 적용 실패')
+        return []
+
+def _files(tmp_path, names):
+    paths = []
+    for name in names:
+        path = os.path.join(tmp_path, name)
+        write_mixed_xlsx(path, extra_sheets=1, rows=10)
+        paths.append(path)
+    return paths
+
+def _mapper_threads():
+    return [t for t in threading.enumerate() if t.name.startswith('ThreadPoolExecutor')]
+
+def test_match_failure_recorded_per_file(tmp_path):
+    files = _files(tmp_path, ['bad.xlsx', 'good.xlsx'])
+    run = ingest(files, _Service(), engine=object(), workers=1, fmt='csv',
+                 export_dir=os.path.join(tmp_path, 'exports'))
+
+    assert run['errors'] == {files[0]: 'RuntimeError: 매칭 실패'}
+    assert len(run['products']) == 500
+    assert {p['file_name'] for p in run['products']} == {'good.xlsx'}
+    assert _mapper_threads() == []
+
+def test_mapper_shut_down_on_export_failure(tmp_path):
+    files = _files(tmp_path, ['good.xlsx'])
+    with pytest.raises(RuntimeError, match='기억 적용 실패'):
+        ingest(files, _Service(fail_resolve=True), engine=object(), workers=1, fmt='csv',
+               export_dir=os.path.join(tmp_path, 'exports'))
+    assert _mapper_threads() == []
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""product_loader 중단 후 이어 적재"""
+
+import os
+import sqlite3
+import pytest
+
+import product_loader
+from product_loader import load_products_file, write_synthetic_export, _empty_db, INDEXES
+
+def _indexes(db_path):
+    conn = sqlite3.connect(db_path)
+    names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    conn.close()
+    return names
+
+def test_interrupted_load_keeps_index_and_resumes(tmp_path, monkeypatch):
+    source = os.path.join(tmp_path, 'products.csv')
+    write_synthetic_export(source, 250)
+    db_path = os.path.join(tmp_path, 'database.sqlite')
+    _empty_db(db_path)
+    load_products_file(source, 'OH', db_path, chunk_rows=100, tokenize=False)
+    assert set(INDEXES) <= _indexes(db_path)
+
+    # 다른 도매인으로 적재하다 두 번째 청크에서 실패
+    commit_chunk = product_loader._commit_chunk
+    committed = []
+
+    def failing_commit(*args):
+        if committed:
+            raise RuntimeError('디스크 오류')
+        commit_chunk(*args)
+        committed.append(1)
+
+    monkeypatch.setattr(product_loader, '_commit_chunk', failing_commit)
+    with pytest.raises(RuntimeError, match='디스크 오류'):
+        load_products_file(source, 'OZ', db_path, chunk_rows=100, tokenize=False)
+    assert set(INDEXES) <= _indexes(db_path)
+
+    monkeypatch.setattr(product_loader, '_commit_chunk', commit_chunk)
+    stats = load_products_file(source, 'OZ', db_path, chunk_rows=100, tokenize=False)
+    assert (stats['resumed_from'], stats['loaded'], stats['chunks']) == (100, 250, 2)
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT COUNT(*) FROM products WHERE wholesaler = 'OZ'").fetchone()[0] == 250
+    conn.close()
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""product_store 형식별 저장/읽기 왕복"""
+
+import os
+import pytest
+
+from product_store import read_products, write_products, append_products
+
+PRODUCTS = [
+    {'sheet': 'OH-오즈', 'product_name': '티셔츠', 'color': '블랙', 'wholesaler': 'OH-오즈',
+     'file_name': 'a.xls', 'quantities': {'120': 2, '130': 1}},
+    # 수량 없는 제품
+    {'sheet': 'OH-오즈', 'product_name': '앵글', 'color': '-', 'wholesaler': 'OH-오즈',
+     'file_name': 'a.xls', 'quantities': {}},
+    # 도매인/파일명 없는 제품 (add_wholesaler_filename 전)
+    {'sheet': 'OZ-오즈', 'product_name': '바지', 'color': '화이트', 'quantities': {'FREE': 30}},
+]
+
+@pytest.mark.parametrize('ext', ['.json', '.jsonl', '.parquet'])
+def test_round_trip(tmp_path, ext):
+    path = os.path.join(tmp_path, 'extracted_products' + ext)
+    write_products(path, PRODUCTS)
+    assert read_products(path) == PRODUCTS
+
+@pytest.mark.parametrize('ext', ['.json', '.jsonl', '.parquet'])
+def test_append(tmp_path, ext):
+    path = os.path.join(tmp_path, 'extracted_products' + ext)
+    write_products(path, PRODUCTS[:1])
+    append_products(path, PRODUCTS[1:])
+    assert read_products(path) == PRODUCTS
+
+def test_parquet_columns(tmp_path):
+    path = os.path.join(tmp_path, 'extracted_products.parquet')
+    write_products(path, PRODUCTS)
+    assert read_products(path, columns=['product_name', 'wholesaler']) == [
+        {'product_name': '티셔츠', 'wholesaler': 'OH-오즈'},
+        {'product_name': '앵글', 'wholesaler': 'OH-오즈'},
+        {'product_name': '바지'},
+    ]
+    assert [p['quantities'] for p in read_products(path, columns=['quantities'])] == [
+        {'120': 2, '130': 1}, {}, {'FREE': 30}]
+
+def test_parquet_product_split_across_batches(tmp_path, monkeypatch):
+    import product_store
+
+    # 배치 3행 - 첫 제품의 사이즈 행이 두 배치에 걸침
+    monkeypatch.setattr(product_store, 'PARQUET_BATCH_ROWS', 3)
+    monkeypatch.setattr(product_store, 'PARQUET_ROW_GROUP', 4)
+    big = dict(PRODUCTS[0], quantities={str(size): size for size in range(90, 150, 10)})
+    products = [big] + PRODUCTS + [big]
+    path = os.path.join(tmp_path, 'extracted_products.parquet')
+    write_products(path, products)
+    assert read_products(path) == products
+    assert [p['product_name'] for p in read_products(path, columns=['product_name'])] == [
+        p['product_name'] for p in products]
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""vectorized_extract 추출 경계 사례"""
+
+import json
+import numpy as np
+import pandas as pd
+
+from layout_detector import RIGHT_TABLE_MIN_COL, detect_layout
+from vectorized_extract import extract_layout, extract_size_block, extract_row_table, long_table_to_products
+
+def _size_sheet():
+    """품명 / 칼라 / 사이즈 블록 시트 (두 번째 제품 칼라 칸이 비어 있음)"""
+    return pd.DataFrame([
+        ['품명', '칼라', '120', '130', '140'],
+        ['티셔츠', '블랙', 2, None, 3],
+        ['앵글', None, None, 5, None],
+        ['바지', '', 1, 0, None],
+        [None, '화이트', 4, 4, 4],
+    ], dtype=object)
+
+def test_missing_color_is_dash():
+    products = extract_size_block(_size_sheet(), 0, 1, [2, 3, 4], ['120', '130', '140'], 1, '시트')
+    assert [p['product_name'] for p in products] == ['티셔츠', '앵글', '바지']
+    assert products[1]['color'] == '-'
+    # 빈 문자열 칼라도 기존 루프와 같이 '-'
+    assert products[2]['color'] == '-'
+    assert products[2]['quantities'] == {'120': 1}
+    # NaN 이 남으면 JSON 이 깨짐
+    json.dumps(products, allow_nan=False)
+
+def test_missing_color_detected_layout():
+    # 오른쪽 표 (list/20260124-OZ-LCL.xls 'OZ-오즈' 시트와 같은 형태)
+    sheet = _size_sheet()
+    df = pd.concat([pd.DataFrame(None, index=sheet.index, columns=range(RIGHT_TABLE_MIN_COL), dtype=object),
+                    sheet.set_axis(range(RIGHT_TABLE_MIN_COL, RIGHT_TABLE_MIN_COL + sheet.shape[1]), axis=1)], axis=1)
+    layout = detect_layout(df)
+    assert layout['table_type'] == 'right'
+    products = extract_layout(df, layout, '시트')
+    assert {p['product_name']: p['color'] for p in products} == {'티셔츠': '블랙', '앵글': '-', '바지': '-'}
+
+def test_nan_color_in_long_table():
+    # 문자열 dtype 으로 바뀐 롱 테이블(결측 = NaN)도 '-'
+    long_df = pd.DataFrame({
+        'row': [1, 2],
+        'product_name': ['앵글', '앵글'],
+        'color': [np.nan, '블루'],
+        'size': ['FREE', 'FREE'],
+        'qty': [2, 3],
+    })
+    products = long_table_to_products(long_df, '시트')
+    assert [p['color'] for p in products] == ['-', '블루']
+
+def test_row_table_missing_color_fills_down():
+    df = pd.DataFrame([
+        ['품명', '칼라', '사이즈', '수량'],
+        ['가방', None, 'FREE', 2],
+        [None, None, 'L', 1],
+        ['합계', None, None, 3],
+    ], dtype=object)
+    products = long_table_to_products(extract_row_table(df, 0, 1, 2, 3, 1), '시트')
+    assert [(p['color'], p['quantities']) for p in products] == [('-', {'FREE': 2}), ('-', {'L': 1})]
+
+def test_product_col_out_of_range():
+    assert extract_size_block(_size_sheet(), 9, 1, [2, 3, 4], ['120', '130', '140'], 1, '시트') == []
+
+def test_matches_loop_on_unusual_numbers():
+    import warnings
+    from extract_real_packing import extract_rows_loop
+
+    # 전각 숫자, int64 범위를 넘는 수량, 공백이 붙은 문자열 숫자, 문자열 메모
+    df = pd.DataFrame([
+        ['품명', '칼라', '120', '130', '140'],
+        ['티셔츠', '블랙', '１２', 1e30, ' 7 '],
+        ['바지', '화이트', 'BOX', 3.9, None],
+    ], dtype=object)
+    sizes, size_cols = ['120', '130', '140'], [2, 3, 4]
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        products = extract_size_block(df, 0, 1, size_cols, sizes, 1, '시트')
+    assert products == extract_rows_loop(df, '시트', 0, 1, sizes, size_cols, start_row=1)
+    assert products[0]['quantities'] == {'120': 12, '130': int(1e30), '140': 7}
+    assert products[1]['quantities'] == {'130': 3}
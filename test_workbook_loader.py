@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""workbook_loader 시트 가지치기 판정 / 절약 시간 추정"""
+
+import os
+import pytest
+
+from workbook_loader import WorkbookReader, open_workbook, write_mixed_xlsx, describe_pruning
+
+def _probe(sheet, table, cells, seconds, decoded):
+    return {'sheet': sheet, 'table': table, 'cells': cells, 'seconds': seconds, 'decoded': decoded}
+
+def _stat(sheet, seconds, rows, cols):
+    return {'sheet': sheet, 'seconds': seconds, 'peak_bytes': None, 'rows': rows, 'cols': cols}
+
+def test_nothing_pruned_has_no_saving():
+    reader = WorkbookReader('a.xls')
+    reader.probes = {'OH-오즈': _probe('OH-오즈', True, 1000, 0.002, True)}
+    reader.stats = [_stat('OH-오즈', 0.01, 100, 10)]
+    summary = reader.pruning_summary()
+    assert summary['saved_seconds'] is None
+    assert summary['probe_seconds'] == pytest.approx(0.002)
+    assert describe_pruning(summary).endswith('판정 2.0ms, 예상 절약 -')
+
+def test_xls_saving_counts_sheet_decode():
+    # .xls: 판정 때 시트 레코드를 디코딩하므로 표 시트의 판정 시간도 셀당 파싱 시간에 들어가고,
+    # 건너뛴 시트는 DataFrame 변환 시간만 절약
+    reader = WorkbookReader('a.xls')
+    reader.probes = {'OH-오즈': _probe('OH-오즈', True, 1000, 0.03, True),
+                     '메모': _probe('메모', False, 2000, 0.03, True)}
+    reader.stats = [_stat('OH-오즈', 0.01, 100, 10)]
+    summary = reader.pruning_summary()
+    assert summary['pruned'] == ['메모']
+    assert summary['probe_seconds'] == pytest.approx(0.06)
+    assert summary['saved_seconds'] == pytest.approx((0.01 + 0.03) / 1000 * 2000 - 0.03)
+
+def test_xlsx_saving_excludes_table_probe():
+    reader = WorkbookReader('a.xlsx')
+    reader.probes = {'OH-오즈': _probe('OH-오즈', True, 1000, 0.001, False),
+                     '메모': _probe('메모', False, 2000, 0.001, False)}
+    reader.stats = [_stat('OH-오즈', 0.01, 100, 10)]
+    assert reader.pruning_summary()['saved_seconds'] == pytest.approx(0.01 / 1000 * 2000 - 0.001)
+
+def test_mixed_workbook_skips_non_table_sheets(tmp_path):
+    path = os.path.join(tmp_path, 'mixed.xlsx')
+    write_mixed_xlsx(path, extra_sheets=2, rows=20)
+    with open_workbook(path) as workbook:
+        assert workbook.table_sheets() == [(1, 'OH-오즈')]
+        workbook.sheet('OH-오즈')
+        summary = workbook.pruning_summary()
+    assert summary['pruned'] == ['메모1', '메모2']
+    assert summary['saved_seconds'] is not None
+
+def test_streaming_keeps_later_table_and_counts_dropped(tmp_path, capsys):
+    import pandas as pd
+    from openpyxl import Workbook
+
+    path = os.path.join(tmp_path, 'stacked.xlsx')
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = 'OH-오즈'
+    sheet.append(['품명', '칼라', 120, 130])
+    sheet.append(['티셔츠', '핑크', 1, 2])
+    sheet.cell(row=2, column=150, value='창 밖')
+    sheet.cell(row=30, column=1, value='비고')  # 빈 행 뒤 표가 아닌 행
+    sheet.append([])
+    sheet.cell(row=40, column=1, value='품명')  # 빈 행 뒤 쌓인 다음 표
+    sheet.cell(row=40, column=2, value='칼라')
+    sheet.cell(row=41, column=1, value='바지')
+    sheet.cell(row=41, column=2, value='블랙')
+    workbook.save(path)
+
+    full = pd.read_excel(path, sheet_name='OH-오즈', header=None)
+    reader = WorkbookReader(path, blank_streak=10)
+    df = reader.sheet('OH-오즈')
+    assert df.shape == (41, 4)
+
+    def cells(frame):
+        return frame.astype(object).fillna('').values.tolist()
+
+    assert cells(df.iloc[39:]) == cells(full.iloc[39:, :4])
+    assert cells(df.iloc[:2]) == cells(full.iloc[:2, :4])
+    assert df.iloc[2:39].isna().all().all()
+    stat = reader.stats[0]
+    assert (stat['dropped_rows'], stat['dropped_cells']) == (1, 1)
+    assert '100열 밖 값 1개, 빈 행 10줄 뒤 표가 아닌 행 1개' in capsys.readouterr().out
+    reader.close()
@@ -1,10 +1,15 @@
 # -*- coding: utf-8 -*-
 """
 추출된 데이터를 보기 좋게 표시하는 스크립트
+
+합계/제품별 요약은 summary_store 의 집계를 사용한다.
+--summary 로 실행하면 제품 목록은 읽지 않고 요약만 출력한다 (데이터 크기와 무관).
 """
 
 import sys
-import json
+
+from product_store import iter_products, find_data_file
+from summary_store import load_summary
 
 # UTF-8 출력 설정
 if sys.platform == 'win32':
@@ -12,61 +17,59 @@ if sys.platform == 'win32':
     sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
     sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
 
-def display_products():
-    """추출된 제품 데이터를 표 형식으로 출력"""
-
-    # JSON 파일 읽기
-    with open('extracted_products.json', 'r', encoding='utf-8') as f:
-        products = json.load(f)
-
+def display_summary(summary):
+    """제품별 / 칼라별 요약 출력"""
     print("=" * 100)
-    print("📊 패킹리스트 분석 결과")
+    print("📋 제품별 요약")
     print("=" * 100)
-    print(f"\n총 제품 수: {len(products)}개\n")
-
-    # 전체 수량 계산
-    total_qty = sum(sum(p['quantities'].values()) for p in products)
-    print(f"총 수량: {total_qty:,}개\n")
 
-    print("-" * 100)
-    print(f"{'No':^4} | {'제품명':^20} | {'칼라':^10} | {'사이즈별 수량'}")
-    print("-" * 100)
+    for product_name, colors in summary.by_product_color.items():
+        print(f"\n🔹 {product_name}")
+        for color, qty in colors.items():
+            print(f"   - {color}: {qty:,}개")
+        print(f"   ✓ 소계: {summary.by_product[product_name]:,}개")
 
-    for idx, product in enumerate(products, 1):
-        product_name = product['product_name']
-        color = product['color']
-        quantities = product['quantities']
+    print("\n" + "=" * 100)
 
-        # 사이즈별 수량을 문자열로 변환
-        qty_str = ', '.join([f"{size}:{qty}" for size, qty in quantities.items()])
-        item_total = sum(quantities.values())
+def display_products(data_file=None, summary_only=False):
+    """추출된 제품 데이터를 표 형식으로 출력
 
-        print(f"{idx:^4} | {product_name:^20} | {color:^10} | {qty_str}")
-        print(f"     |  {'':^20} | {'':^10} | 소계: {item_total}개")
-        print("-" * 100)
+    data_file: .json/.jsonl/.parquet (없으면 가장 최근 추출 파일)
+    summary_only: 제품 목록 없이 요약만 출력
+    """
+    data_file = data_file or find_data_file()
+    summary, _ = load_summary(data_file)
 
-    print("\n")
     print("=" * 100)
-    print("📋 제품별 요약")
+    print("📊 패킹리스트 분석 결과")
     print("=" * 100)
+    print(f"\n총 제품 수: {summary.product_count}개\n")
+    print(f"총 수량: {summary.total_qty:,}개\n")
+
+    if not summary_only:
+        print("-" * 100)
+        print(f"{'No':^4} | {'제품명':^20} | {'칼라':^10} | {'사이즈별 수량'}")
+        print("-" * 100)
 
-    # 제품별로 그룹화
-    product_summary = {}
-    for p in products:
-        key = p['product_name']
-        if key not in product_summary:
-            product_summary[key] = {'colors': {}, 'total': 0}
+        # 필요한 열만 하나씩 읽기
+        products = iter_products(data_file, columns=['product_name', 'color', 'quantities'])
+        for idx, product in enumerate(products, 1):
+            product_name = product['product_name']
+            color = product['color']
+            quantities = product['quantities']
 
-        product_summary[key]['colors'][p['color']] = sum(p['quantities'].values())
-        product_summary[key]['total'] += sum(p['quantities'].values())
+            # 사이즈별 수량을 문자열로 변환
+            qty_str = ', '.join([f"{size}:{qty}" for size, qty in quantities.items()])
+            item_total = sum(quantities.values())
 
-    for product_name, data in product_summary.items():
-        print(f"\n🔹 {product_name}")
-        for color, qty in data['colors'].items():
-            print(f"   - {color}: {qty:,}개")
-        print(f"   ✓ 소계: {data['total']:,}개")
+            print(f"{idx:^4} | {product_name:^20} | {color:^10} | {qty_str}")
+            print(f"     |  {'':^20} | {'':^10} | 소계: {item_total}개")
+            print("-" * 100)
 
-    print("\n" + "=" * 100)
+        print("\n")
+
+    display_summary(summary)
 
 if __name__ == '__main__':
-    display_products()
+    args = [a for a in sys.argv[1:] if a != '--summary']
+    display_products(args[0] if args else None, summary_only='--summary' in sys.argv)
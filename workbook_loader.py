@@ -0,0 +1,617 @@
+# -*- coding: utf-8 -*-
+"""
+공용 워크북 로더 - 엑셀 파일을 한 번만 열고 시트는 필요할 때 꺼내기
+
+기존 스크립트는 pd.ExcelFile 로 파일을 연 뒤에도 시트마다
+pd.read_excel(file_path, sheet_name=...) 을 다시 호출해서
+.xls(BIFF) 파일 전체를 시트 수만큼 반복 디코딩했다.
+WorkbookReader 는 열린 핸들에서 시트를 지연 파싱하고,
+시트별 파싱 시간과 최대 메모리를 기록한다.
+
+.xlsx 는 스트리밍 모드로 읽는다 (streaming=True, 기본값).
+pd.read_excel 은 서식만 있는 빈 행/열까지 모두 리스트로 만든 뒤 잘라내지만,
+여기서는 openpyxl read-only 로 행을 하나씩 읽으면서
+- 앞쪽 max_cols 열(기본: layout_detector 판정 영역과 같은 100열)만 꺼내고
+- 표가 시작된 뒤 빈 행이 blank_streak 줄 연속되면 남은 시트 XML 에 값이 있는지만 바이트로 훑어서
+  없으면 멈춘다. 있으면 행을 훑다가 '품명' 헤더 행(아래에 쌓인 다음 표)이 나온 자리부터 다시 돌려준다.
+나머지 변환(셀 값 변환, TextParser)은 pandas 와 같으므로 보통 시트는 결과가 같다.
+열 창 밖의 값이나 빈 행 뒤 표가 아닌 행처럼 버린 값이 있으면 시트 통계
+(dropped_rows / dropped_cells)에 남기고 경고를 출력한다.
+
+시트 가지치기: 시트 전체를 디코딩하기 전에 앞쪽 PROBE_ROWS 행만 읽어서
+'품명' 헤더가 있는지 본다 (layout_detector 가 표 형태를 판정하는 영역과 같음).
+없으면 레이아웃이 'unknown' 이라 추출 결과가 빈 시트이므로 디코딩하지 않는다.
+.xlsx 는 앞쪽 행만 읽지만, .xls 는 xlrd 가 시트 레코드를 통째로 읽어야 값을 볼 수 있어서
+시트 디코딩은 그대로 하고 DataFrame 변환만 건너뛴다.
+판정 결과는 추출 캐시에 워크북 단위로 저장된다 (extraction_cache.extract_cached).
+
+사용법:
+    python workbook_loader.py <파일 또는 폴더> ...   # 시트별 파싱 리포트 + 재파싱 방식과 비교
+    python workbook_loader.py bench [빈 행 수] [서식 열 수]   # 빈 서식 행/열이 많은 .xlsx 읽기 시간/최대 메모리
+    python workbook_loader.py bench-prune [표 없는 시트 수] [행 수]   # 시트 가지치기 유무 추출 시간
+"""
+
+import io
+import os
+import re
+import sys
+import time
+import itertools
+import tempfile
+import tracemalloc
+import multiprocessing
+import numpy as np
+import pandas as pd
+
+# UTF-8 출력 설정
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+
+EXCEL_EXTENSIONS = ('.xls', '.xlsx')
+
+# 스트리밍 모드 기본값 - 열 창은 layout_detector.WINDOW_COLS 와 같음 (창 밖 값은 세기만 함)
+DEFAULT_MAX_COLS = 100
+DEFAULT_BLANK_STREAK = 200
+
+# 시트 가지치기 - layout_detector.WINDOW_ROWS / WINDOW_COLS 와 같은 영역, 같은 기준('품명')
+PROBE_ROWS = 50
+PROBE_COLS = 100
+TABLE_KEYWORD = '품명'
+
+# 시트 XML 바이트 훑기 (빈 행 뒤에 값이 남았는지) - 셀 객체를 만들지 않음
+_ROW_TAG = re.compile(rb'<(?:\w+:)?row\b([^>]*)>')
+_ROW_NUMBER = re.compile(rb'\br="(\d+)"')
+_VALUE_TAG = re.compile(rb'<(?:\w+:)?(?:v|is|f)\b')
+_SHEET_DATA_END = re.compile(rb'</(?:\w+:)?sheetData>')
+_SCAN_CHUNK = 1024 * 1024
+
+# 판정 기준이 바뀌면 버전을 올려 캐시된 판정을 무효화
+PROBE_VERSION = 1
+PRUNER = f'sheet_probe:{PROBE_VERSION}'
+
+def _convert_cell(cell):
+    """openpyxl 셀 -> pandas 와 같은 값 (빈 셀 '', 오류 NaN, 정수로 떨어지는 숫자는 int)"""
+    value = cell.value
+    if value is None:
+        return ''
+    if cell.data_type == 'e':
+        return np.nan
+    if cell.data_type == 'n':
+        as_int = int(value)
+        return as_int if as_int == value else float(value)
+    return value
+
+def _values_after(worksheet, row_number):
+    """row_number 행 뒤에 값(또는 수식)이 있는 셀이 있는지 - 시트 XML 을 바이트로만 훑음
+
+    서식만 있는 빈 행은 여기서 바로 끝나고, 판단할 수 없으면(행 번호 없는 XML 등) True.
+    """
+    if not hasattr(worksheet, '_get_source'):
+        return True
+    buffer = b''
+    started = False
+    with worksheet._get_source() as src:
+        while True:
+            chunk = src.read(_SCAN_CHUNK)
+            buffer += chunk
+            if not started:
+                for match in _ROW_TAG.finditer(buffer):
+                    number = _ROW_NUMBER.search(match.group(1))
+                    if number is None:
+                        return True
+                    if int(number.group(1)) > row_number:
+                        buffer = buffer[match.start():]
+                        started = True
+                        break
+                else:
+                    if not chunk:
+                        return False
+                    buffer = buffer[-256:]
+                    continue
+            end = _SHEET_DATA_END.search(buffer)
+            if _VALUE_TAG.search(buffer, 0, end.start() if end else len(buffer)):
+                return True
+            if end or not chunk:
+                return False
+            buffer = buffer[-256:]
+
+def iter_sheet_rows(worksheet, max_cols=DEFAULT_MAX_COLS, blank_streak=DEFAULT_BLANK_STREAK, dropped=None):
+    """openpyxl read-only 시트에서 행을 하나씩 (끝의 빈 셀은 잘라냄)
+
+    max_cols: 앞쪽 몇 열만 돌려줄지 (None = 전체)
+    blank_streak: 값이 있는 행이 나온 뒤 빈 행이 이만큼 연속되면, 뒤에 값이 남았는지 XML 만 훑어 보고
+                  없으면 중단 (None/0 = 끝까지). 남았으면 행을 돌려주지 않고 훑다가 TABLE_KEYWORD 가 있는
+                  행이 나오면 그동안의 행 수만큼 빈 행을 채워 행 번호를 맞춘 뒤 다시 돌려준다.
+    dropped: dict 를 주면 버린 양을 더함 - 'cells': 열 창 밖 값, 'rows': 빈 행 뒤 표가 아닌 값 있는 행
+    """
+    if dropped is None:
+        dropped = {}
+    dropped.setdefault('rows', 0)
+    dropped.setdefault('cells', 0)
+    # 선언된 시트 크기(dimension)는 무시 - 실제 있는 행만 읽음
+    worksheet.reset_dimensions()
+    blank = 0
+    started = False
+    gap = None  # 훑는 중이면 돌려주지 않은 행 수
+    for number, row in enumerate(worksheet.iter_rows(), 1):
+        converted = [_convert_cell(cell) for cell in (row[:max_cols] if max_cols else row)]
+        while converted and converted[-1] == '':
+            converted.pop()
+        outside = sum(1 for cell in row[max_cols:] if cell.value is not None) if max_cols else 0
+
+        if gap is not None:
+            if converted and any(isinstance(v, str) and TABLE_KEYWORD in v for v in converted):
+                for _ in range(gap):
+                    yield []
+                gap = None
+            else:
+                if converted:
+                    dropped['rows'] += 1
+                dropped['cells'] += outside
+                gap += 1
+                continue
+
+        dropped['cells'] += outside
+        if converted:
+            started = True
+            blank = 0
+        elif started:
+            blank += 1
+            if blank_streak and blank >= blank_streak:
+                if not _values_after(worksheet, number):
+                    return
+                gap = 1
+                continue
+        yield converted
+
+def frame_from_rows(rows):
+    """iter_sheet_rows 결과 -> pd.read_excel(header=None) 과 같은 DataFrame"""
+    from pandas.errors import EmptyDataError
+    from pandas.io.parsers import TextParser
+
+    data = []
+    last = -1
+    for row in rows:
+        if row:
+            last = len(data)
+        data.append(row)
+    data = data[:last + 1]
+    if not data:
+        return pd.DataFrame()
+    width = max(len(row) for row in data)
+    data = [row + [''] * (width - len(row)) for row in data]
+    try:
+        return TextParser(data, header=None, skip_blank_lines=False).read()
+    except EmptyDataError:
+        return pd.DataFrame()
+
+def stream_xlsx_rows(file_path, sheet_name, max_cols=DEFAULT_MAX_COLS, blank_streak=DEFAULT_BLANK_STREAK,
+                     dropped=None):
+    """.xlsx 시트 하나를 행 단위로 (파일을 직접 열고 닫음)"""
+    from openpyxl import load_workbook
+
+    book = load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+    try:
+        yield from iter_sheet_rows(book[sheet_name], max_cols, blank_streak, dropped)
+    finally:
+        book.close()
+
+class WorkbookReader:
+    """엑셀 파일 1회 오픈 + 시트 지연 파싱 리더
+
+    파일은 처음 필요할 때 열고, .xls 는 xlrd on_demand 모드로 열어서
+    실제로 요청된 시트만 디코딩한다.
+    파싱된 시트는 DataFrame 으로 보관하므로 같은 시트를 다시 요청해도
+    재디코딩하지 않는다.
+    """
+
+    def __init__(self, file_path, track_memory=False, streaming=True, max_cols=DEFAULT_MAX_COLS,
+                 blank_streak=DEFAULT_BLANK_STREAK, data=None):
+        """track_memory: 시트 파싱마다 tracemalloc 으로 최대 메모리 측정 (느려지므로 리포트용으로만)
+        streaming: .xlsx 를 행 단위로 읽음 (max_cols 열 창, blank_streak 빈 행 뒤에 값이 없으면 중단)
+        data: 이미 읽어 둔 파일 내용 (bytes) - 주면 디스크에서 다시 읽지 않음 (file_path 는 이름/형식용)
+        """
+        self.file_path = file_path
+        self.data = data
+        self.track_memory = track_memory
+        self.streaming = streaming and file_path.lower().endswith('.xlsx')
+        self.max_cols = max_cols
+        self.blank_streak = blank_streak
+        self.stats = []
+        self.probes = {}  # 시트명 -> {'sheet', 'table', 'cells', 'seconds', 'decoded'}
+        self.open_seconds = 0.0
+        self._frames = {}
+        self._excel_file = None
+
+    @property
+    def excel_file(self):
+        """실제 파일 핸들 (처음 필요할 때 연다 - 캐시 적중 시에는 열지 않음)"""
+        if self._excel_file is None:
+            start = time.perf_counter()
+            engine_kwargs = {'on_demand': True} if self.file_path.lower().endswith('.xls') else None
+            source = io.BytesIO(self.data) if self.data is not None else self.file_path
+            self._excel_file = pd.ExcelFile(source, engine_kwargs=engine_kwargs)
+            self.open_seconds = time.perf_counter() - start
+        return self._excel_file
+
+    @property
+    def is_open(self):
+        return self._excel_file is not None
+
+    @property
+    def sheet_names(self):
+        return self.excel_file.sheet_names
+
+    def sheet(self, sheet_name, header=None):
+        """시트를 DataFrame 으로 반환 (첫 요청 시에만 파싱)"""
+        key = (sheet_name, header)
+        if key in self._frames:
+            return self._frames[key]
+
+        tracing = self.track_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        start = time.perf_counter()
+        dropped = {'rows': 0, 'cells': 0}
+        try:
+            if self.streaming and header is None:
+                # pd.ExcelFile 이 열어 둔 read-only 워크북을 그대로 사용
+                df = frame_from_rows(iter_sheet_rows(self.excel_file.book[sheet_name], self.max_cols,
+                                                     self.blank_streak, dropped))
+            else:
+                df = self.excel_file.parse(sheet_name, header=header)
+        finally:
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] if tracing else None
+            if tracing:
+                tracemalloc.stop()
+
+        self._unload(sheet_name)
+        self._frames[key] = df
+        self.stats.append({
+            'sheet': sheet_name,
+            'seconds': elapsed,
+            'peak_bytes': peak,
+            'rows': df.shape[0],
+            'cols': df.shape[1],
+            'dropped_rows': dropped['rows'],
+            'dropped_cells': dropped['cells'],
+        })
+        if dropped['rows'] or dropped['cells']:
+            parts = ([f"{self.max_cols}열 밖 값 {dropped['cells']}개"] if dropped['cells'] else []) + \
+                    ([f"빈 행 {self.blank_streak}줄 뒤 표가 아닌 행 {dropped['rows']}개"] if dropped['rows'] else [])
+            print(f"⚠️ {os.path.basename(self.file_path)} 시트 '{sheet_name}': {', '.join(parts)}를 "
+                  f"읽지 않았습니다 (streaming=False 로 전체 읽기)")
+        return df
+
+    def release(self, sheet_name):
+        """보관 중인 시트 DataFrame 을 놓음 (넘겨준 뒤 리더가 계속 들고 있지 않도록)"""
+        for key in [k for k in self._frames if k[0] == sheet_name]:
+            del self._frames[key]
+        self._unload(sheet_name)
+
+    def sheets(self, skip_first=False):
+        """(시트 번호, 시트명, DataFrame) 을 순서대로 지연 생성
+
+        skip_first: 첫 번째 시트(통관용)를 디코딩하지 않고 건너뜀
+        """
+        for idx, sheet_name in enumerate(self.sheet_names):
+            if skip_first and idx == 0:
+                continue
+            yield idx, sheet_name, self.sheet(sheet_name)
+
+    def _probe_rows(self, sheet_name, rows, cols):
+        """시트 앞쪽 rows 행 x cols 열의 값, 시트 전체 셀 수, 시트 전체를 디코딩했는지
+
+        .xlsx 스트리밍은 앞쪽 행만 읽는다. .xls (xlrd on_demand) 는 sheet_by_name 이
+        시트 레코드 전체를 디코딩하므로 DataFrame 변환만 건너뛴다.
+        """
+        if (sheet_name, None) in self._frames:
+            df = self._frames[(sheet_name, None)]
+            return df.iloc[:rows, :cols].to_numpy(dtype=object).tolist(), df.size, False
+        book = self.excel_file.book
+        if self.streaming:
+            worksheet = book[sheet_name]
+            # 선언된 크기 (iter_sheet_rows 가 지우기 전에) - 없으면 알 수 없음
+            width = worksheet.max_column or 0
+            cells = (worksheet.max_row or 0) * (min(width, self.max_cols) if self.max_cols else width)
+            cols = min(cols, self.max_cols) if self.max_cols else cols
+            values = list(itertools.islice(iter_sheet_rows(worksheet, cols, None), rows))
+            return values, cells, False
+        if hasattr(book, 'sheet_by_name'):
+            # xlrd: 시트 레코드 전체를 디코딩함 - DataFrame 변환만 하지 않음 (통과하면 parse 가 그대로 재사용)
+            sheet = book.sheet_by_name(sheet_name)
+            values = [sheet.row_values(r, 0, min(cols, sheet.ncols)) for r in range(min(rows, sheet.nrows))]
+            return values, sheet.nrows * sheet.ncols, True
+        df = self.sheet(sheet_name)
+        return df.iloc[:rows, :cols].to_numpy(dtype=object).tolist(), df.size, True
+
+    def probe(self, sheet_name):
+        """앞쪽 PROBE_ROWS 행만 보고 추출할 표('품명' 헤더)가 있는지 판정"""
+        if sheet_name in self.probes:
+            return self.probes[sheet_name]
+        start = time.perf_counter()
+        values, cells, decoded = self._probe_rows(sheet_name, PROBE_ROWS, PROBE_COLS)
+        table = any(isinstance(v, str) and TABLE_KEYWORD in v for row in values for v in row)
+        if not table:
+            self._unload(sheet_name)
+        self.probes[sheet_name] = {'sheet': sheet_name, 'table': table, 'cells': int(cells),
+                                   'seconds': time.perf_counter() - start, 'decoded': decoded}
+        return self.probes[sheet_name]
+
+    def probe_sheets(self, sheet_names):
+        """시트별 판정 목록 (추출 캐시에 저장하는 형태)"""
+        return [self.probe(name) for name in sheet_names]
+
+    def restore_probes(self, verdicts):
+        """캐시에 저장해 둔 판정 사용 (파일을 열지 않음, 판정 시간 0)"""
+        for verdict in verdicts:
+            self.probes.setdefault(verdict['sheet'], dict(verdict, seconds=0.0))
+
+    def table_sheets(self, skip_first=True):
+        """추출할 (시트 번호, 시트명) 목록 - 첫 번째(통관용) 시트와 표가 없는 시트는 디코딩하지 않음"""
+        return [(idx, name) for idx, name in enumerate(self.sheet_names)
+                if not (skip_first and idx == 0) and self.probe(name)['table']]
+
+    def pruning_summary(self):
+        """건너뛴 시트와 절약한 시간
+
+        probe_seconds: 판정에 쓴 시간 (.xls 는 시트 레코드 디코딩 포함)
+        saved_seconds: 건너뛴 시트를 디코딩했다면 걸렸을 시간 - 그 시트들의 판정 시간
+                       셀당 시간은 이 파일에서 실제로 파싱한 시트 기준이고, 판정 때 시트를 디코딩했으면(.xls)
+                       그 판정 시간도 파싱 시간에 넣는다 (건너뛴 시트가 없거나 파싱한 시트가 없으면 None)
+        """
+        pruned = [p for p in self.probes.values() if not p['table']]
+        probe_seconds = sum(p['seconds'] for p in self.probes.values())
+        parsed_cells = sum(s['rows'] * s['cols'] for s in self.stats)
+        saved = None
+        if pruned and parsed_cells:
+            parsed = {s['sheet'] for s in self.stats}
+            decode_seconds = sum(p['seconds'] for p in self.probes.values()
+                                 if p['table'] and p.get('decoded') and p['sheet'] in parsed)
+            per_cell = (sum(s['seconds'] for s in self.stats) + decode_seconds) / parsed_cells
+            saved = per_cell * sum(p['cells'] for p in pruned) - sum(p['seconds'] for p in pruned)
+        return {'pruned': [p['sheet'] for p in pruned], 'probed': len(self.probes),
+                'probe_seconds': probe_seconds, 'saved_seconds': saved}
+
+    def _unload(self, sheet_name):
+        """xlrd on_demand 모드에서 DataFrame 변환이 끝난 시트 원본을 해제"""
+        book = getattr(self._excel_file, 'book', None)
+        if book is not None and hasattr(book, 'unload_sheet'):
+            try:
+                book.unload_sheet(sheet_name)
+            except Exception:
+                pass
+
+    def total_parse_seconds(self):
+        return self.open_seconds + sum(s['seconds'] for s in self.stats)
+
+    def print_report(self):
+        """시트별 파싱 시간 / 최대 메모리 출력"""
+        print(f"\n⏱️  워크북 로딩 리포트: {os.path.basename(self.file_path)}")
+        if not self.is_open:
+            print("  파일을 열지 않았습니다 (캐시 사용)")
+            return
+        print(f"  파일 열기: {self.open_seconds * 1000:8.1f}ms")
+        for s in self.stats:
+            peak = f"{s['peak_bytes'] / 1024 / 1024:7.2f}MB" if s['peak_bytes'] is not None else '      -'
+            print(f"  시트 '{s['sheet']}': {s['seconds'] * 1000:8.1f}ms, 최대 메모리 {peak} "
+                  f"({s['rows']}행 x {s['cols']}열)")
+        print(f"  합계: {self.total_parse_seconds() * 1000:8.1f}ms")
+        if self.probes:
+            print(f"  {describe_pruning(self.pruning_summary())}")
+
+    def close(self):
+        self._frames.clear()
+        if self._excel_file is not None:
+            self._excel_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def describe_pruning(summary):
+    """pruning_summary() 한 줄 요약"""
+    saved = f"{summary['saved_seconds'] * 1000:.1f}ms" if summary['saved_seconds'] is not None else '-'
+    names = summary['pruned'][:5] + ([f"외 {len(summary['pruned']) - 5}개"] if len(summary['pruned']) > 5 else [])
+    skipped = f" ({', '.join(names)})" if names else ''
+    return (f"시트 가지치기: {summary['probed']}개 판정, 표 없음 {len(summary['pruned'])}개 건너뜀{skipped}, "
+            f"판정 {summary['probe_seconds'] * 1000:.1f}ms, 예상 절약 {saved}")
+
+def open_workbook(file_path, track_memory=False, streaming=True, data=None):
+    """WorkbookReader 생성 (with 문과 함께 사용)"""
+    return WorkbookReader(file_path, track_memory=track_memory, streaming=streaming, data=data)
+
+def find_excel_files(paths):
+    """파일/폴더 목록에서 엑셀 파일 경로만 모으기 (폴더는 하위까지 탐색)"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                for name in sorted(names):
+                    if name.lower().endswith(EXCEL_EXTENSIONS):
+                        files.append(os.path.join(root, name))
+        elif path.lower().endswith(EXCEL_EXTENSIONS):
+            files.append(path)
+    return files
+
+def compare_reread(file_path):
+    """기존 방식(시트마다 read_excel 재호출)과 공용 로더의 소요 시간 비교"""
+    start = time.perf_counter()
+    excel_file = pd.ExcelFile(file_path)
+    for sheet_name in excel_file.sheet_names:
+        pd.read_excel(file_path, sheet_name=sheet_name, header=None)
+    reread_seconds = time.perf_counter() - start
+
+    # 시간 비교는 메모리 추적 없이, 리포트용 최대 메모리는 별도 패스에서 측정
+    with open_workbook(file_path, track_memory=False) as reader:
+        for _ in reader.sheets():
+            pass
+        shared_seconds = reader.total_parse_seconds()
+
+    with open_workbook(file_path, track_memory=True) as reader:
+        for _ in reader.sheets():
+            pass
+        reader.print_report()
+
+    print(f"  시트별 재파싱 방식: {reread_seconds * 1000:8.1f}ms → 공용 로더: {shared_seconds * 1000:8.1f}ms")
+    return reread_seconds, shared_seconds
+
+def write_padded_xlsx(path, table_rows=500, blank_rows=20000, styled_cols=200):
+    """표 뒤에 서식만 있는 빈 행 blank_rows 줄, 각 행은 styled_cols 열까지 서식이 있는 .xlsx (벤치마크용)"""
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+    from openpyxl.utils import get_column_letter
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('OH-오즈')
+    font = Font(name='맑은 고딕')
+
+    def padded(values):
+        cells = []
+        for value in values + [None] * (styled_cols - len(values)):
+            cell = WriteOnlyCell(sheet, value=value)
+            cell.font = font
+            cells.append(cell)
+        return cells
+
+    sheet.append(padded(['품명', '칼라', '120', '130', '140', '150', '합계']))
+    for i in range(table_rows):
+        sheet.append(padded([f'상품{i}', '핑크', 10, 20, 30, 40, 100]))
+    for _ in range(blank_rows):
+        sheet.append(padded([]))
+    workbook.save(path)
+    _declare_dimension(path, f'A1:{get_column_letter(styled_cols)}{table_rows + blank_rows + 1}')
+
+def _declare_dimension(path, ref):
+    """write-only 로 만든 파일에 엑셀 저장 파일처럼 <dimension> 선언 추가 (시트 XML 은 조각 단위로 복사)
+
+    ref: 모든 시트에 같은 범위 문자열, 또는 시트 순서대로 범위 목록
+    """
+    import shutil
+    import zipfile
+
+    tmp = path + '.tmp'
+    with zipfile.ZipFile(path) as source, zipfile.ZipFile(tmp, 'w', zipfile.ZIP_DEFLATED) as target:
+        for info in source.infolist():
+            with source.open(info) as src, target.open(info.filename, 'w', force_zip64=True) as dst:
+                first = src.read(64 * 1024)
+                if info.filename.startswith('xl/worksheets/'):
+                    number = int(info.filename[len('xl/worksheets/sheet'):-len('.xml')])
+                    sheet_ref = ref if isinstance(ref, str) else ref[number - 1]
+                    first = first.replace(b'<sheetViews>', f'<dimension ref="{sheet_ref}" /><sheetViews>'.encode(), 1)
+                dst.write(first)
+                shutil.copyfileobj(src, dst)
+    os.replace(tmp, path)
+
+def _bench_child(task, path, result_queue):
+    from convert_to_csv import _peak_rss_mb
+
+    start = time.perf_counter()
+    if task == 'read_excel':
+        df = pd.read_excel(path, sheet_name='OH-오즈', header=None)
+    else:
+        df = frame_from_rows(stream_xlsx_rows(path, 'OH-오즈'))
+    result_queue.put((time.perf_counter() - start, _peak_rss_mb(), df.shape, df.to_json()))
+
+def benchmark(blank_rows=20000, styled_cols=200):
+    """서식만 있는 빈 행/열이 많은 .xlsx - pd.read_excel 대비 스트리밍 읽기 (작업마다 별도 프로세스)"""
+    ctx = multiprocessing.get_context()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'padded.xlsx')
+        write_padded_xlsx(path, blank_rows=blank_rows, styled_cols=styled_cols)
+
+        print("=" * 80)
+        print(f"📈 .xlsx 스트리밍 읽기 벤치마크 (표 500행 + 빈 서식 행 {blank_rows:,}줄 x {styled_cols}열, "
+              f"{os.path.getsize(path) / 1024 / 1024:.1f}MB)")
+        print("=" * 80)
+        results = {}
+        for label, task in (('pd.read_excel', 'read_excel'), ('스트리밍 (열 창 + 빈 행 중단)', 'stream')):
+            result_queue = ctx.Queue()
+            process = ctx.Process(target=_bench_child, args=(task, path, result_queue))
+            process.start()
+            seconds, peak, shape, payload = result_queue.get()
+            process.join()
+            results[task] = payload
+            peak_str = f"{peak:7.0f}MB" if peak is not None else '      -'
+            print(f"  {label:<30} {seconds:7.2f}초  최대 RSS {peak_str}  ({shape[0]}행 x {shape[1]}열)")
+        print(f"  결과 일치: {'✅' if results['read_excel'] == results['stream'] else '❌'}")
+
+def write_mixed_xlsx(path, extra_sheets=6, rows=5000):
+    """통관용 시트 + 패킹 표 시트 1개 + 표 없는 시트(인보이스/메모 형태) extra_sheets 개 (벤치마크용)"""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    customs = workbook.create_sheet('통관용')
+    customs.append(['INVOICE', 'DESCRIPTION', 'QTY', 'AMOUNT'])
+    for i in range(rows):
+        customs.append([f'INV{i:06d}', 'CHILDREN GARMENT', 10, 12.5])
+    packing = workbook.create_sheet('OH-오즈')
+    packing.append(['품명', '칼라', '120', '130', '140', '150', '합계'])
+    for i in range(500):
+        packing.append([f'상품{i}', '핑크', 10, 20, 30, 40, 100])
+    for n in range(extra_sheets):
+        sheet = workbook.create_sheet(f'메모{n + 1}')
+        sheet.append(['NO', 'DATE', 'CARTON', 'CBM', 'WEIGHT', 'REMARK'])
+        for i in range(rows):
+            sheet.append([i, '2026-01-15', i % 40, 0.12, 8.5, f'BOX {i}'])
+    workbook.save(path)
+    _declare_dimension(path, [f'A1:D{rows + 1}', 'A1:G501'] + [f'A1:F{rows + 1}'] * extra_sheets)
+
+def benchmark_pruning(extra_sheets=6, rows=5000):
+    """표 없는 시트가 섞인 워크북 - 시트 전체 디코딩 대비 가지치기 후 추출"""
+    from extract_real_packing import extract_sheet
+
+    def run(prune):
+        with open_workbook(path, track_memory=False) as workbook:
+            start = time.perf_counter()
+            names = [name for _, name in workbook.table_sheets()] if prune else workbook.sheet_names[1:]
+            products = [extract_sheet(workbook.sheet(name), name) for name in names]
+            return time.perf_counter() - start, products, workbook.pruning_summary()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'mixed.xlsx')
+        write_mixed_xlsx(path, extra_sheets, rows)
+        full_seconds, full, _ = run(False)
+        pruned_seconds, pruned, summary = run(True)
+
+    print("=" * 80)
+    print(f"📈 시트 가지치기 벤치마크 (표 시트 1개 + 표 없는 시트 {extra_sheets}개 x {rows:,}행)")
+    print("=" * 80)
+    print(f"  모든 시트 디코딩   : {full_seconds * 1000:8.1f}ms")
+    print(f"  가지치기 후 디코딩 : {pruned_seconds * 1000:8.1f}ms  ({full_seconds / pruned_seconds:.1f}배)")
+    print(f"  {describe_pruning(summary)}")
+    same = [p for p in full if p] == [p for p in pruned if p]
+    print(f"  결과 일치: {'✅' if same else '❌'}")
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench-prune':
+        args = [int(a) for a in sys.argv[2:]]
+        benchmark_pruning(args[0] if args else 6, args[1] if len(args) > 1 else 5000)
+        sys.exit(0)
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench':
+        args = [int(a) for a in sys.argv[2:]]
+        benchmark(args[0] if args else 20000, args[1] if len(args) > 1 else 200)
+        sys.exit(0)
+
+    targets = find_excel_files(sys.argv[1:] or ['list'])
+    if not targets:
+        print("❌ 엑셀 파일을 찾을 수 없습니다.")
+        sys.exit(1)
+
+    total_reread = 0.0
+    total_shared = 0.0
+    for target in targets:
+        reread, shared = compare_reread(target)
+        total_reread += reread
+        total_shared += shared
+
+    print("\n" + "=" * 80)
+    print(f"📊 {len(targets)}개 파일: 재파싱 {total_reread:.2f}초 → 공용 로더 {total_shared:.2f}초")
+    print("=" * 80)